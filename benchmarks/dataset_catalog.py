@@ -0,0 +1,96 @@
+"""
+Benchmarks the construction of a catalog of datasets, such as the one a service defines at startup, measuring the time
+it takes and the memory the datasets hold.
+
+Usage:
+
+.. code-block:: bash
+
+    python benchmarks/dataset_catalog.py --datasets 300 --fields 800
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+from pypika import Tables, functions as fn
+
+from fireant import DataSet, DataType, Field, Join
+from fireant.database import Database
+
+MIB = 1024 * 1024
+
+
+def make_dataset_arguments(index, n_fields):
+    """
+    Makes the arguments of a dataset with a joined table, where half of the fields are dimensions and the other half
+    are metrics.
+    """
+    table, joined_table = Tables("table_{}".format(index), "joined_table_{}".format(index))
+
+    fields = []
+    for field_index in range(n_fields):
+        column_table = joined_table if field_index % 10 == 0 else table
+        if field_index % 2:
+            definition = fn.Sum(column_table.field("metric_{}".format(field_index)))
+            data_type = DataType.number
+        else:
+            definition = column_table.field("dimension_{}".format(field_index))
+            data_type = DataType.text
+
+        fields.append(Field("field_{}".format(field_index), definition=definition, data_type=data_type))
+
+    return dict(
+        table=table,
+        database=Database(),
+        joins=[Join(joined_table, table.id == joined_table.id)],
+        fields=fields,
+    )
+
+
+def measure(function):
+    """
+    Calls a function and returns its result, the time it took in seconds and the memory allocated by it, that is still
+    held afterwards, in bytes.
+    """
+    gc.collect()
+    tracemalloc.start()
+    start_memory, _ = tracemalloc.get_traced_memory()
+    start = time.perf_counter()
+
+    result = function()
+
+    elapsed = time.perf_counter() - start
+    end_memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, end_memory - start_memory
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--datasets", type=int, default=300, help="The number of datasets in the catalog.")
+    parser.add_argument("--fields", type=int, default=800, help="The number of fields in each dataset.")
+    args = parser.parse_args()
+
+    arguments = [make_dataset_arguments(index, args.fields) for index in range(args.datasets)]
+    catalog, elapsed, memory = measure(lambda: [DataSet(**dataset_arguments) for dataset_arguments in arguments])
+    print(
+        "Constructed {} datasets with {} fields each in {:.3f}s, holding {:.1f} MiB".format(
+            args.datasets, args.fields, elapsed, memory / MIB
+        )
+    )
+
+    _, elapsed, memory = measure(lambda: [dataset.query for dataset in catalog])
+    print("Created the query builders of all datasets in {:.3f}s, holding {:.1f} MiB".format(elapsed, memory / MIB))
+
+    _, elapsed, memory = measure(lambda: [field.choices for field in catalog[0].fields if not field.is_aggregate])
+    print(
+        "Created the choices of all dimensions of one dataset in {:.3f}s, holding {:.1f} MiB".format(
+            elapsed, memory / MIB
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmarks the time it takes to import fireant in a new interpreter. Exits with an error when the import takes longer
+than the given budget, so that it can guard against regressions in import time.
+
+Usage:
+
+.. code-block:: bash
+
+    python benchmarks/import_time.py --statement "import fireant" --budget-ms 100
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+
+def measure_import_time(statement):
+    """
+    Executes an import statement in a new interpreter and returns the time the imports took in milliseconds, as
+    reported by `python -X importtime`.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+
+    # Each line is shaped as "import time: <self us> | <cumulative us> | <module>", where top level imports are not
+    # indented
+    total_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+
+        _, cumulative_us, module = line[len("import time:") :].split("|")
+        if cumulative_us.strip().isdigit() and not module.startswith("  "):
+            total_us += int(cumulative_us)
+
+    return total_us / 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--statement", default="import fireant", help="The import statement to measure.")
+    parser.add_argument("--repeat", type=int, default=5, help="The number of times to measure the import.")
+    parser.add_argument("--budget-ms", type=float, help="The maximum median import time in milliseconds.")
+    args = parser.parse_args()
+
+    timings = [measure_import_time(args.statement) for _ in range(args.repeat)]
+    median = statistics.median(timings)
+    print("`{}` took {:.1f}ms (median of {} runs)".format(args.statement, median, args.repeat))
+
+    if args.budget_ms is not None and median > args.budget_ms:
+        sys.exit("Import time exceeds the budget of {:.1f}ms".format(args.budget_ms))
+
+
+if __name__ == "__main__":
+    main()
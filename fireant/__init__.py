@@ -1,42 +1,95 @@
-from .database import *
-from .dataset.data_blending import DataSetBlender
-from .dataset.fields import (
-    DataSetFilterException,
-    DataType,
-    Field,
-)
-from .dataset.intervals import (
-    NumericInterval,
-    day,
-    hour,
-    month,
-    quarter,
-    week,
-    year,
-)
-from .dataset.joins import Join
-from .dataset.klass import DataSet
-from .dataset.modifiers import (
-    OmitFromRollup,
-    Rollup,
-    ResultSet,
-)
-from .dataset.operations import (
-    CumMean,
-    CumProd,
-    CumSum,
-    Operation,
-    RollingMean,
-    Share,
-)
-from .dataset.references import (
-    DayOverDay,
-    MonthOverMonth,
-    QuarterOverQuarter,
-    WeekOverWeek,
-    YearOverYear,
-)
-from .exceptions import DataSetException
-from .widgets import *
+import sys
+from importlib import import_module
 
 __version__ = "7.7.1"
+
+# The attributes of the package, mapped to the modules they are imported from. They are imported on first access, so
+# that importing fireant does not import pandas, the widgets or the database drivers until they are used.
+_LAZY_ATTRIBUTES = {
+    # Databases
+    "Column": ".database",
+    "ColumnsTransformer": ".database",
+    "Database": ".database",
+    "MSSQLDatabase": ".database",
+    "MySQLDatabase": ".database",
+    "MySQLTypeEngine": ".database",
+    "PostgreSQLDatabase": ".database",
+    "RedshiftDatabase": ".database",
+    "SnowflakeDatabase": ".database",
+    "TypeEngine": ".database",
+    "VerticaDatabase": ".database",
+    "VerticaTypeEngine": ".database",
+    "make_columns": ".database",
+    # Datasets
+    "Aggregation": ".dataset.fields",
+    "DataSet": ".dataset.klass",
+    "DataSetBlender": ".dataset.data_blending",
+    "DataSetFilterException": ".dataset.fields",
+    "DataType": ".dataset.fields",
+    "Field": ".dataset.fields",
+    "Join": ".dataset.joins",
+    # Intervals
+    "NumericInterval": ".dataset.intervals",
+    "day": ".dataset.intervals",
+    "hour": ".dataset.intervals",
+    "month": ".dataset.intervals",
+    "quarter": ".dataset.intervals",
+    "week": ".dataset.intervals",
+    "year": ".dataset.intervals",
+    # Modifiers
+    "OmitFromRollup": ".dataset.modifiers",
+    "ResultSet": ".dataset.modifiers",
+    "Rollup": ".dataset.modifiers",
+    # Operations
+    "CumMean": ".dataset.operations",
+    "CumProd": ".dataset.operations",
+    "CumSum": ".dataset.operations",
+    "Operation": ".dataset.operations",
+    "RollingMean": ".dataset.operations",
+    "Share": ".dataset.operations",
+    # References
+    "DayOverDay": ".dataset.references",
+    "MonthOverMonth": ".dataset.references",
+    "QuarterOverQuarter": ".dataset.references",
+    "WeekOverWeek": ".dataset.references",
+    "YearOverYear": ".dataset.references",
+    # Exceptions
+    "DataSetException": ".exceptions",
+    # Widgets
+    "Arrow": ".widgets",
+    "CSV": ".widgets",
+    "HighCharts": ".widgets",
+    "Matplotlib": ".widgets",
+    "Pandas": ".widgets",
+    "ReactTable": ".widgets",
+    "Widget": ".widgets",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+if sys.version_info < (3, 7):
+    # Module __getattr__ (PEP 562) requires Python 3.7, so the attributes are imported eagerly instead
+    for _name, _module in _LAZY_ATTRIBUTES.items():
+        globals()[_name] = getattr(import_module(_module, __name__), _name)
+
+
+def __getattr__(name):
+    """
+    Imports the attributes of the package and its submodules on first access.
+    """
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    else:
+        try:
+            value = import_module("." + name, __name__)
+        except ModuleNotFoundError as e:
+            if e.name != "{}.{}".format(__name__, name):
+                raise
+            raise AttributeError("module '{}' has no attribute '{}'".format(__name__, name)) from None
+
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *_LAZY_ATTRIBUTES})
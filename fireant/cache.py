@@ -0,0 +1,138 @@
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    A thread-safe in-memory cache of values which expire `ttl` seconds after they were stored.
+
+    Caches are attached to long lived objects such as datasets, annotations and databases. Query builders deep copy
+    those objects, so copying a cache returns the cache itself, which keeps it shared by all of the copies. When pickled,
+    only the settings of the cache are kept and not the cached values.
+    """
+
+    def __init__(self, ttl, max_size=None, clock=time.monotonic, stale_ttl=0):
+        """
+        :param ttl:
+            The number of seconds that a value stays in the cache.
+        :param max_size:
+            (Optional) The maximum number of values in the cache. When full, the least recently used value is evicted.
+        :param clock:
+            A function returning the current time in seconds.
+        :param stale_ttl:
+            The number of seconds that a value is kept after it has expired, during which it is still returned by
+            `get_stale`.
+        """
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_size = max_size
+        self.clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+
+    def get(self, key, default=None):
+        """
+        :return:
+            The value stored for `key` or `default` if there is none or it has expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+
+            expires_at, value = entry
+            now = self.clock()
+            if expires_at <= now:
+                if expires_at + self.stale_ttl <= now:
+                    del self._entries[key]
+                return default
+
+            self._entries.move_to_end(key)
+            return value
+
+    def get_stale(self, key, default=None):
+        """
+        :return:
+            The value stored for `key`, even if it has expired less than `stale_ttl` seconds ago, or `default` if there
+            is none.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+
+            expires_at, value = entry
+            if expires_at + self.stale_ttl <= self.clock():
+                del self._entries[key]
+                return default
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (self.clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+
+            if self.max_size is not None:
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+
+    def replace(self, key, value):
+        """
+        Replaces the value stored for `key` without changing when it expires. Nothing is stored if there is no value
+        stored for `key` or it has expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.clock() < entry[0]:
+                self._entries[key] = (entry[0], value)
+
+    def get_or_set(self, key, func):
+        """
+        Returns the value stored for `key`. If there is none, `func` is called to create the value, which is then stored
+        for `key`. The lock is not held while calling `func`, so concurrent misses for the same key can call it more
+        than once.
+
+        :param key:
+            The cache key.
+        :param func:
+            A function without arguments which returns the value.
+        :return:
+            The cached or created value.
+        """
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = func()
+            self.set(key, value)
+
+        return value
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memodict={}):
+        return self
+
+    def __getstate__(self):
+        return {"ttl": self.ttl, "max_size": self.max_size, "clock": self.clock, "stale_ttl": self.stale_ttl}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
@@ -1,19 +1,43 @@
-from .base import Database
-from .column import (
-    Column,
-    ColumnsTransformer,
-    make_columns,
-)
-from .mssql import MSSQLDatabase
-from .mysql import (
-    MySQLDatabase,
-    MySQLTypeEngine,
-)
-from .postgresql import PostgreSQLDatabase
-from .redshift import RedshiftDatabase
-from .snowflake import SnowflakeDatabase
-from .type_engine import TypeEngine
-from .vertica import (
-    VerticaDatabase,
-    VerticaTypeEngine,
-)
+import sys
+from importlib import import_module
+
+# The databases, mapped to the modules they are imported from. They are imported on first access, so that only the
+# modules of the databases that are used are imported.
+_LAZY_ATTRIBUTES = {
+    "Column": ".column",
+    "ColumnsTransformer": ".column",
+    "Database": ".base",
+    "MSSQLDatabase": ".mssql",
+    "MySQLDatabase": ".mysql",
+    "MySQLTypeEngine": ".mysql",
+    "PostgreSQLDatabase": ".postgresql",
+    "RedshiftDatabase": ".redshift",
+    "SnowflakeDatabase": ".snowflake",
+    "TypeEngine": ".type_engine",
+    "VerticaDatabase": ".vertica",
+    "VerticaTypeEngine": ".vertica",
+    "make_columns": ".column",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+if sys.version_info < (3, 7):
+    # Module __getattr__ (PEP 562) requires Python 3.7, so the attributes are imported eagerly instead
+    for _name, _module in _LAZY_ATTRIBUTES.items():
+        globals()[_name] = getattr(import_module(_module, __name__), _name)
+
+
+def __getattr__(name):
+    """
+    Imports the databases on first access.
+    """
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError("module '{}' has no attribute '{}'".format(__name__, name))
+
+    value = getattr(import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *_LAZY_ATTRIBUTES})
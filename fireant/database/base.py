@@ -1,16 +1,24 @@
 from datetime import datetime
-from typing import Collection, Dict, Union
+from typing import Collection, Dict, Iterable, List, Tuple, Union
 
-import pandas as pd
 from pypika import (
     Query,
     enums,
     functions as fn,
     terms,
 )
-from pypika.terms import Function
+from pypika.terms import (
+    Criterion,
+    Function,
+    Parameter,
+)
+
+from fireant.cache import TTLCache
+from fireant.middleware.decorators import CancelableConnection, apply_middlewares, connection_middleware
 
-from fireant.middleware.decorators import apply_middlewares, connection_middleware
+# The frequencies of the pandas periods of datetime intervals, which start at the truncated datetimes. Weeks ending on
+# Sunday start on Monday.
+PANDAS_PERIOD_FREQUENCIES = {'week': 'W-SUN', 'month': 'M', 'quarter': 'Q', 'year': 'Y'}
 
 
 class Database(object):
@@ -23,6 +31,9 @@ class Database(object):
 
     slow_query_log_min_seconds = 15
 
+    # The format of named parameters in queries, which depends on the database driver
+    parameter_format = '%({})s'
+
     def __init__(
         self,
         host=None,
@@ -30,12 +41,15 @@ class Database(object):
         database=None,
         max_result_set_size=200000,
         middlewares=[],
+        schema_cache_ttl=None,
     ):
         self.host = host
         self.port = port
         self.database = database
         self.max_result_set_size = max_result_set_size
         self.middlewares = middlewares + [connection_middleware]
+        # Caches the column definitions of tables, keyed by (schema, table) name pairs
+        self.schema_cache = TTLCache(schema_cache_ttl) if schema_cache_ttl else None
 
     def connect(self):
         """
@@ -50,16 +64,110 @@ class Database(object):
         if hasattr(connection, "cancel"):
             connection.cancel()
 
+    def make_column_definitions_query(self, tables: List[Tuple[str, str]]):
+        """
+        Returns a query selecting the schema name, table name, column name and column data type of the columns of a
+        list of tables. The query uses the parameters returned by `make_tables_parameters`.
+
+        :param tables: A list of (schema, table) name pairs.
+        :return: A pypika query.
+        """
+        raise NotImplementedError
+
+    def make_tables_criterion(self, schema_term, table_term, tables: List[Tuple[str, str]]):
+        """
+        Returns a criterion matching any of a list of tables, using a pair of parameters for each table.
+        """
+        return Criterion.any(
+            (schema_term == Parameter(self.parameter_format.format('schema_{}'.format(i))))
+            & (table_term == Parameter(self.parameter_format.format('table_{}'.format(i))))
+            for i in range(len(tables))
+        )
+
+    @staticmethod
+    def make_tables_parameters(tables: List[Tuple[str, str]]) -> dict:
+        parameters = {}
+        for i, (schema, table) in enumerate(tables):
+            parameters['schema_{}'.format(i)] = schema
+            parameters['table_{}'.format(i)] = table
+        return parameters
+
+    def fetch_column_definitions(self, tables: Iterable[Tuple[str, str]], connection=None) -> Dict[Tuple, List]:
+        """
+        Fetches the column definitions of several tables with a single query on the catalog of the database. This
+        bypasses the schema cache.
+
+        :param tables: A list of (schema, table) name pairs.
+        :param connection: (Optional) The connection to execute this query with.
+        :return: A dict mapping each (schema, table) pair to a list of column name, column data type pairs.
+        """
+        tables = list(dict.fromkeys(tables))
+        query = self.make_column_definitions_query(tables)
+        rows = self.fetch(str(query), parameters=self.make_tables_parameters(tables), connection=connection)
+
+        # Some catalogs match names case-insensitively and return them in their own casing, so returned rows are
+        # mapped back to the requested tables case-insensitively
+        requested_tables = {(schema.casefold(), table.casefold()): (schema, table) for schema, table in tables}
+        column_definitions = {table: [] for table in tables}
+        for schema_name, table_name, column_name, column_type in rows:
+            table = requested_tables.get((schema_name.casefold(), table_name.casefold()))
+            if table is not None:
+                column_definitions[table].append((column_name, column_type))
+
+        return column_definitions
+
+    def prefetch_column_definitions(self, tables: Iterable[Tuple[str, str]], connection=None) -> Dict[Tuple, List]:
+        """
+        Loads the column definitions of several tables into the schema cache. Only the tables which are not cached
+        already are fetched, with a single query.
+
+        :param tables: A list of (schema, table) name pairs.
+        :param connection: (Optional) The connection to execute this query with.
+        :return: A dict mapping each (schema, table) pair to a list of column name, column data type pairs.
+        """
+        column_definitions, missing_tables = {}, []
+        for table in dict.fromkeys(tables):
+            cached = self.schema_cache.get(table) if self.schema_cache is not None else None
+            if cached is None:
+                missing_tables.append(table)
+            else:
+                column_definitions[table] = cached
+
+        if missing_tables:
+            fetched = self.fetch_column_definitions(missing_tables, connection=connection)
+            for table, definitions in fetched.items():
+                if self.schema_cache is not None:
+                    self.schema_cache.set(table, definitions)
+                column_definitions[table] = definitions
+
+        return column_definitions
+
     def get_column_definitions(self, schema, table, connection=None):
         """
-        Return a list of column name, column data type pairs.
+        Return a list of column name, column data type pairs. When the database has a schema cache, the column
+        definitions are returned from the cache if present.
 
         :param schema: The name of the table schema.
         :param table: The name of the table to get columns from.
         :param connection: (Optional) The connection to execute this query with.
         :return: A list of columns.
         """
-        raise NotImplementedError
+        return self.prefetch_column_definitions([(schema, table)], connection=connection)[(schema, table)]
+
+    def invalidate_column_definitions(self, schema=None, table=None):
+        """
+        Removes column definitions from the schema cache, e.g. after a table has been altered.
+
+        :param schema: (Optional) The name of the table schema. If not set, the whole schema cache is cleared.
+        :param table: (Optional) The name of the table.
+        """
+        if self.schema_cache is None:
+            return
+
+        if schema is None:
+            self.schema_cache.clear()
+        else:
+            self.schema_cache.invalidate((schema, table))
 
     def trunc_date(self, field, interval):
         """
@@ -67,6 +175,28 @@ class Database(object):
         """
         raise NotImplementedError
 
+    def trunc_date_values(self, dates, interval):
+        """
+        The counterpart of `trunc_date` in pandas, which truncates a series of datetimes to a specific interval the same
+        way as the database does. Weeks start on Monday, as in ISO 8601. Override when the database truncates dates
+        differently.
+
+        :param dates:
+            A series of datetimes.
+        :param interval:
+            The key of a datetime interval, see `fireant.dataset.intervals.DATETIME_INTERVALS`.
+        :return:
+            A series of the truncated datetimes.
+        """
+        if interval == 'hour':
+            return dates.dt.floor('H')
+        elif interval == 'day':
+            return dates.dt.floor('D')
+        elif interval in PANDAS_PERIOD_FREQUENCIES:
+            return dates.dt.to_period(PANDAS_PERIOD_FREQUENCIES[interval]).dt.start_time
+
+        raise ValueError(f'Invalid interval provided to trunc_date_values method: {interval}')
+
     def date_add(self, field: terms.Term, date_part: str, interval: int):
         """
         This function must add/subtract a Date or Date/Time object.
@@ -110,6 +240,9 @@ class Database(object):
 
     @apply_middlewares
     def fetch_dataframes(self, *queries, parse_dates=None, **kwargs):
+        # Nesting inside a function so that importing the databases does not import pandas
+        import pandas as pd
+
         connection = kwargs.get("connection")
         dataframes = []
         for query in queries:
@@ -119,5 +252,87 @@ class Database(object):
     def fetch_dataframe(self, query, **kwargs):
         return self.fetch_dataframes(query, **kwargs)[0]
 
+    def streaming_cursor(self, connection):
+        """
+        Returns a cursor used for reading a result set incrementally. Override this for platforms where the default
+        cursor buffers the whole result set on the client and a server-side cursor has to be requested instead.
+
+        :param connection: The connection to create the cursor with.
+        :return: A DB-API cursor.
+        """
+        return connection.cursor()
+
+    @apply_middlewares
+    def execute_streaming(self, *queries, connection=None):
+        """
+        Executes queries on streaming cursors, see `streaming_cursor`. The queries pass through the middlewares of this
+        database like any other query, so they are logged by `log_middleware`. A connection must be given, since it has
+        to stay open while the result sets are read.
+
+        :param queries: The queries to execute.
+        :param connection: The connection to execute the queries with.
+        :return: A list with a cursor for each query, which the caller has to close.
+        """
+        cursors = []
+        for query in queries:
+            cursor = self.streaming_cursor(connection)
+            try:
+                cursor.execute(str(query))
+            except Exception:
+                cursor.close()
+                raise
+
+            cursors.append(cursor)
+
+        return cursors
+
+    def fetch_dataframe_chunks(self, query, chunksize, parse_dates=None, connection=None):
+        """
+        Executes a query and yields its result set as data frames of at most `chunksize` rows, so that the result set
+        never has to be held in memory at once. Unlike `fetch_dataframes`, the result set is not limited to
+        `max_result_set_size`. The connection is held open until the generator is exhausted or closed.
+
+        :param query: The query to execute.
+        :param chunksize: The maximum number of rows in each data frame.
+        :param parse_dates: A dict of column names to parse as dates, see `pd.read_sql`.
+        :param connection: (Optional) The connection to execute this query with.
+        :return: A generator of data frames.
+        """
+        if connection is None:
+            with CancelableConnection(self) as connection:
+                yield from self.fetch_dataframe_chunks(query, chunksize, parse_dates=parse_dates, connection=connection)
+            return
+
+        import pandas as pd
+
+        (cursor,) = self.execute_streaming(query, connection=connection)
+        columns = None
+        is_empty = True
+
+        # The cursor is also closed when the consumer stops reading early, which releases server-side cursors
+        try:
+            while True:
+                rows = cursor.fetchmany(chunksize)
+                # The description of server-side cursors is only available once the first rows are fetched
+                columns = columns or [column[0] for column in cursor.description]
+                if not rows:
+                    break
+
+                is_empty = False
+
+                chunk = pd.DataFrame.from_records(rows, columns=columns, coerce_float=True)
+                for column, date_format in (parse_dates or {}).items():
+                    if column in chunk:
+                        # The same conversion `pd.read_sql` does for parse_dates
+                        chunk[column] = pd.to_datetime(chunk[column], errors="ignore", **date_format)
+
+                yield chunk
+
+            if is_empty:
+                # Always yield at least one data frame so consumers still receive the columns of the result set
+                yield pd.DataFrame(columns=columns)
+        finally:
+            cursor.close()
+
     def __str__(self):
         return f'Database|{self.__class__.__name__}|{self.host}'
@@ -78,6 +78,20 @@ class ColumnsTransformer:
         """
         return make_columns(db_columns, db.type_engine)
 
+    @staticmethod
+    def table_to_ansi(schema, table, db, connection=None):
+        """
+        Transforms the columns of a database table to a list of Column instances. The column definitions are read
+        through the schema cache of the database, if it has one.
+
+        :param schema: The name of the table schema.
+        :param table: The name of the table.
+        :param db: The database instance.
+        :param connection: (Optional) The connection to fetch the column definitions with.
+        :return: The columns of the table as a list of Column instances.
+        """
+        return make_columns(db.get_column_definitions(schema, table, connection=connection), db.type_engine)
+
     @staticmethod
     def ansi_to_database(columns, db):
         """
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from pypika import CustomFunction, MSSQLQuery, Parameter, Table
+from pypika import CustomFunction, MSSQLQuery, Table
 from pypika.functions import Cast, DateDiff
 from pypika.terms import Function, PseudoColumn
 
@@ -38,22 +38,29 @@ class MSSQLDatabase(Database):
         # Useful docs on this here: http://www.silota.com/docs/recipes/sql-server-date-parts-truncation.html
         return self.date_add(0, interval, DateDiff(PseudoColumn(interval), 0, field))
 
+    def trunc_date_values(self, dates, interval):
+        if interval == 'week':
+            # DATEDIFF counts the Sundays between two dates, so weeks run from Sunday to Saturday and are truncated to
+            # the Monday after their Sunday
+            import pandas as pd
+
+            return super().trunc_date_values(dates + pd.Timedelta(days=1), interval)
+
+        return super().trunc_date_values(dates, interval)
+
     def date_add(self, field, date_part, interval):
         return _MSSQLDateAdd(PseudoColumn(date_part), interval, field)
 
     def convert_date(self, dt: datetime) -> Function:
         return Cast(dt, 'datetimeoffset')
 
-    def get_column_definitions(self, schema, table, connection=None):
+    def make_column_definitions_query(self, tables):
         columns = Table('COLUMNS', schema='INFORMATION_SCHEMA')
 
-        columns_query = (
+        return (
             MSSQLQuery.from_(columns, immutable=False)
-            .select(columns.COLUMN_NAME, columns.DATA_TYPE)
-            .where(columns.TABLE_SCHEMA == Parameter('%(schema)s'))
-            .where(columns.field('TABLE_NAME') == Parameter('%(table)s'))
+            .select(columns.TABLE_SCHEMA, columns.field('TABLE_NAME'), columns.COLUMN_NAME, columns.DATA_TYPE)
+            .where(self.make_tables_criterion(columns.TABLE_SCHEMA, columns.field('TABLE_NAME'), tables))
             .distinct()
             .orderby(columns.column_name)
         )
-
-        return self.fetch(str(columns_query), connection=connection, parameters=dict(schema=schema, table=table))
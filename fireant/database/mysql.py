@@ -6,7 +6,7 @@ from pypika import (
     functions as fn,
     terms,
 )
-from pypika.terms import CustomFunction, Interval, Parameter
+from pypika.terms import CustomFunction, Interval
 
 from . import sql_types
 from .base import Database
@@ -108,6 +108,12 @@ class MySQLDatabase(Database):
             cursorclass=pymysql.cursors.Cursor,
         )
 
+    def streaming_cursor(self, connection):
+        import pymysql
+
+        # The default pymysql cursor buffers the whole result set, SSCursor reads rows from the server as needed
+        return connection.cursor(pymysql.cursors.SSCursor)
+
     def trunc_date(self, field, interval):
         if interval == 'hour':
             return _DateFormat(field, '%Y-%m-%d %H:00:00')
@@ -136,20 +142,17 @@ class MySQLDatabase(Database):
         interval_term = terms.Interval(**{'{}s'.format(str(date_part)): interval, 'dialect': Dialects.MYSQL})
         return DateAdd(field, interval_term)
 
-    def get_column_definitions(self, schema, table, connection=None):
+    def make_column_definitions_query(self, tables):
         columns = Table('columns', schema='INFORMATION_SCHEMA')
 
-        columns_query = (
+        return (
             MySQLQuery.from_(columns)
-            .select(columns.column_name, columns.column_type)
-            .where(columns.table_schema == Parameter('%(schema)s'))
-            .where(columns.field('table_name') == Parameter('%(table)s'))
+            .select(columns.table_schema, columns.field('table_name'), columns.column_name, columns.column_type)
+            .where(self.make_tables_criterion(columns.table_schema, columns.field('table_name'), tables))
             .distinct()
             .orderby(columns.column_name)
         )
 
-        return self.fetch(str(columns_query), parameters=dict(schema=schema, table=table), connection=connection)
-
     def import_csv(self, table, file_path, connection=None):
         """
         Execute a query to import a file into a table using the provided connection.
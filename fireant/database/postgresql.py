@@ -1,5 +1,6 @@
+from uuid import uuid4
+
 from pypika import (
-    Parameter,
     PostgreSQLQuery,
     Table,
     functions as fn,
@@ -42,22 +43,23 @@ class PostgreSQLDatabase(Database):
             password=self.password,
         )
 
+    def streaming_cursor(self, connection):
+        # Named cursors are server-side cursors in psycopg2
+        return connection.cursor(name="fireant_{}".format(uuid4().hex))
+
     def trunc_date(self, field, interval):
         return DateTrunc(field, str(interval))
 
     def date_add(self, field, date_part, interval):
         return fn.DateAdd(str(date_part), interval, field)
 
-    def get_column_definitions(self, schema, table, connection=None):
+    def make_column_definitions_query(self, tables):
         columns = Table("columns", schema="information_schema")
 
-        columns_query = (
+        return (
             PostgreSQLQuery.from_(columns, immutable=False)
-            .select(columns.column_name, columns.data_type)
-            .where(columns.table_schema == Parameter('%(schema)s'))
-            .where(columns.field("table_name") == Parameter('%(table)s'))
+            .select(columns.table_schema, columns.field("table_name"), columns.column_name, columns.data_type)
+            .where(self.make_tables_criterion(columns.table_schema, columns.field("table_name"), tables))
             .distinct()
             .orderby(columns.column_name)
         )
-
-        return self.fetch(str(columns_query), parameters=dict(schema=schema, table=table), connection=connection)
@@ -1,7 +1,4 @@
-from cryptography.hazmat.backends import default_backend
-from cryptography.hazmat.primitives import serialization
 from pypika import (
-    Parameter,
     Table,
     functions as fn,
     terms,
@@ -10,11 +7,6 @@ from pypika.dialects import SnowflakeQuery
 
 from .base import Database
 
-try:
-    from snowflake import connector as snowflake
-except:
-    pass
-
 IGNORED_SCHEMAS = {'INFORMATION_SCHEMA'}
 
 
@@ -60,9 +52,9 @@ class SnowflakeDatabase(Database):
         self.warehouse = warehouse
 
     def connect(self):
-        import snowflake
+        from snowflake import connector
 
-        return snowflake.connector.connect(
+        return connector.connect(
             database=self.database,
             account=self.account,
             user=self.user,
@@ -89,6 +81,10 @@ class SnowflakeDatabase(Database):
         if self.private_key_data is None:
             return None
 
+        # Nesting inside a function so that cryptography is only imported when connecting with a private key
+        from cryptography.hazmat.backends import default_backend
+        from cryptography.hazmat.primitives import serialization
+
         private_key_password = None if self.private_key_password is None else self.private_key_password.encode()
 
         pkey = serialization.load_pem_private_key(
@@ -101,16 +97,13 @@ class SnowflakeDatabase(Database):
             encryption_algorithm=serialization.NoEncryption(),
         )
 
-    def get_column_definitions(self, schema, table, connection=None):
+    def make_column_definitions_query(self, tables):
         columns = Table('COLUMNS', schema='INFORMATION_SCHEMA')
 
-        columns_query = (
+        return (
             SnowflakeQuery.from_(columns, immutable=False)
-            .select(columns.COLUMN_NAME, columns.DATA_TYPE)
-            .where(columns.TABLE_SCHEMA == Parameter('%(schema)s'))
-            .where(columns.field('TABLE_NAME') == Parameter('%(table)s'))
+            .select(columns.TABLE_SCHEMA, columns.field('TABLE_NAME'), columns.COLUMN_NAME, columns.DATA_TYPE)
+            .where(self.make_tables_criterion(columns.TABLE_SCHEMA, columns.field('TABLE_NAME'), tables))
             .distinct()
             .orderby(columns.column_name)
         )
-
-        return self.fetch(str(columns_query), connection=connection, parameters=dict(schema=schema, table=table))
@@ -1,5 +1,4 @@
 from pypika import (
-    Parameter,
     Tables,
     VerticaQuery,
     functions as fn,
@@ -45,6 +44,8 @@ class VerticaDatabase(Database):
     # The pypika query class to use for constructing queries
     query_cls = VerticaQuery
 
+    parameter_format = ':{}'
+
     DATETIME_INTERVALS = {
         "hour": "HH",
         "day": "DD",
@@ -100,32 +101,34 @@ class VerticaDatabase(Database):
     def date_add(self, field, date_part, interval):
         return fn.TimestampAdd(str(date_part), interval, field)
 
-    def get_column_definitions(self, schema, table, connection=None):
+    def make_column_definitions_query(self, tables):
         view_columns, table_columns = Tables('view_columns', 'columns')
 
         view_query = (
             VerticaQuery.from_(view_columns)
-            .select(view_columns.column_name, view_columns.data_type)
-            .where(
-                (view_columns.table_schema == Parameter(':schema'))
-                & (view_columns.field('table_name') == Parameter(':table'))
+            .select(
+                view_columns.table_schema,
+                view_columns.field('table_name'),
+                view_columns.column_name,
+                view_columns.data_type,
             )
+            .where(self.make_tables_criterion(view_columns.table_schema, view_columns.field('table_name'), tables))
             .distinct()
         )
 
         table_query = (
             VerticaQuery.from_(table_columns, immutable=False)
-            .select(table_columns.column_name, table_columns.data_type)
-            .where(
-                (table_columns.table_schema == Parameter(':schema'))
-                & (table_columns.field("table_name") == Parameter(':table'))
+            .select(
+                table_columns.table_schema,
+                table_columns.field("table_name"),
+                table_columns.column_name,
+                table_columns.data_type,
             )
+            .where(self.make_tables_criterion(table_columns.table_schema, table_columns.field("table_name"), tables))
             .distinct()
         )
 
-        return self.fetch(
-            str(view_query + table_query), parameters=dict(schema=schema, table=table), connection=connection
-        )
+        return view_query + table_query
 
     def import_csv(self, table, file_path, connection=None):
         """
@@ -1,5 +1,8 @@
+from fireant.cache import TTLCache
+
+
 class Annotation(object):
-    def __init__(self, table, field, alignment_field, dataset_alignment_field_alias):
+    def __init__(self, table, field, alignment_field, dataset_alignment_field_alias, cache_ttl=None):
         """
         :param table:
             A Pypika instance of the annotation table.
@@ -9,8 +12,12 @@ class Annotation(object):
             An additional field in the annotation table for aligning the annotation data with the dataset.
         :param dataset_alignment_field_alias:
             An alias of the alignment dimension in the associated dataset.
+        :param cache_ttl:
+            (Optional) The number of seconds to cache fetched annotation data for. Annotation tables rarely change, so
+            caching them saves a query for every annotated chart. By default annotation data is not cached.
         """
         self.table = table
         self.field = field
         self.alignment_field = alignment_field
         self.dataset_alignment_field_alias = dataset_alignment_field_alias
+        self.cache = TTLCache(cache_ttl) if cache_ttl else None
@@ -1,3 +1,6 @@
+import copy
+from functools import partial
+
 from fireant.dataset.fields import Field
 from fireant.dataset.klass import DataSet
 from fireant.queries.builder import (
@@ -6,7 +9,6 @@ from fireant.queries.builder import (
 )
 from fireant.utils import (
     deepcopy,
-    immutable,
     ordered_distinct_list_by_attr,
 )
 
@@ -15,16 +17,21 @@ def _wrap_dataset_fields(dataset):
     if isinstance(dataset, DataSetBlender):
         return dataset.fields
 
+    make_choices = partial(_make_blender_choices, dataset)
     wrapped_fields = []
     for field in dataset.fields:
-        wrapped_field = _wrap_field(dataset, field)
+        wrapped_field = _wrap_field(field, make_choices)
 
         wrapped_fields.append(wrapped_field)
 
     return wrapped_fields
 
 
-def _wrap_field(dataset, field):
+def _make_blender_choices(dataset, wrapped_field):
+    return DimensionChoicesBlenderQueryBuilder(dataset, wrapped_field.definition)
+
+
+def _wrap_field(field, make_choices):
     wrapped_field = Field(
         alias=field.alias,
         definition=field,
@@ -38,8 +45,7 @@ def _wrap_field(dataset, field):
         hyperlink_template=field.hyperlink_template,
     )
 
-    if not field.definition.is_aggregate:
-        wrapped_field.choices = DimensionChoicesBlenderQueryBuilder(dataset, field)
+    wrapped_field.set_choices_factory(make_choices)
 
     return wrapped_field
 
@@ -50,7 +56,7 @@ class DataSetBlender:
     instances.
     """
 
-    def __init__(self, primary_dataset, secondary_dataset, dimension_map):
+    def __init__(self, primary_dataset, secondary_dataset, dimension_map, client_side_blending=False):
         """
         Constructor for a blended dataset.  Contains all the fields to initialize the dataset.
 
@@ -64,10 +70,16 @@ class DataSetBlender:
         :param dimension_map:
             A dict mapping up fields from the primary to the secondary dataset. This tells the Blender which fields
             can be used as dimensions in the Blender queries.
+        :param client_side_blending: (Default: False)
+            When true, the query of each dataset is executed on the database of that dataset, concurrently, and the
+            result sets are joined in memory instead of in a single SQL query. This allows blending datasets from
+            different databases. Complex blender fields are evaluated in memory, which supports arithmetic, COALESCE and
+            NULLIF.
         """
         self.primary_dataset = primary_dataset
         self.secondary_dataset = secondary_dataset
         self.dimension_map = dimension_map
+        self.client_side_blending = client_side_blending
 
         # Wrap all dataset fields with another field on top so that:
         #   1. DataSetBlender doesn't share a reference to a field with a DataSet (__hash__ is used to find out which
@@ -80,22 +92,42 @@ class DataSetBlender:
             )
         )
 
-        # add query builder entry points
-        self.query = DataSetBlenderQueryBuilder(self)
-        self.latest = self.primary_dataset.latest
+        # The query builder entry point is created on first access
+        self._query = None
         self.annotation = None
 
     @property
-    def return_additional_metadata(self) -> bool:
+    def query(self) -> DataSetBlenderQueryBuilder:
+        """
+        The entry point for building queries on this blended dataset. It is created on first access.
+        """
+        if self._query is None:
+            self._query = DataSetBlenderQueryBuilder(self)
+
+        return self._query
+
+    @property
+    def latest(self):
+        return self.primary_dataset.latest
+
+    @property
+    def root_dataset(self) -> DataSet:
         # When using data blending, datasets are nested inside DataSetBlender objects. Additionally,
         # the primary_dataset can be a combination of datasets depending on how many datasets are being blended.
-        # This helper property walks the tree to return the return_additional_metadata value from the original
-        # primary dataset.
+        # This helper property walks the tree to return the original primary dataset.
         dataset = self.primary_dataset
         while not isinstance(dataset, DataSet):
             dataset = dataset.primary_dataset
 
-        return dataset.return_additional_metadata
+        return dataset
+
+    @property
+    def return_additional_metadata(self) -> bool:
+        return self.root_dataset.return_additional_metadata
+
+    @property
+    def concurrent_widget_transforms(self) -> bool:
+        return self.root_dataset.concurrent_widget_transforms
 
     def __eq__(self, other):
         return isinstance(other, DataSetBlender) and self.fields == other.fields
@@ -119,10 +151,18 @@ class DataSetBlender:
     def database(self):
         return self.primary_dataset.database
 
-    @immutable
     def extra_fields(self, *fields):
-        for field in fields:
-            self.fields.add(field)
+        """
+        Returns a copy of this blended dataset with extra fields. The fields and datasets of this blended dataset are
+        shared with the copy instead of being copied.
+
+        :param fields:
+            The fields to add to the copy.
+        """
+        blender = copy.copy(self)
+        blender.fields = DataSet.Fields([*self.fields, *fields])
+        blender._query = None
+        return blender
 
     def blend(self, other):
         """
@@ -136,10 +176,12 @@ class DataSetBlenderBuilder:
         self.primary_dataset = primary
         self.secondary_dataset = secondary
 
-    def on(self, dimension_map):
-        return DataSetBlender(self.primary_dataset, self.secondary_dataset, dimension_map)
+    def on(self, dimension_map, client_side_blending=False):
+        return DataSetBlender(
+            self.primary_dataset, self.secondary_dataset, dimension_map, client_side_blending=client_side_blending
+        )
 
-    def on_dimensions(self):
+    def on_dimensions(self, client_side_blending=False):
         """
         This function doesn't work when blending more than 2 datasets. It won't select dimensions in the 3rd dataset
         and further. self.primary_dataset might be a DataSetBlender object itself. We would want to dig deeper until
@@ -156,7 +198,7 @@ class DataSetBlenderBuilder:
             primary_ds_field = self.primary_dataset.fields[secondary_ds_field.alias]
             dimension_map[primary_ds_field] = secondary_ds_field
 
-        return self.on(dimension_map)
+        return self.on(dimension_map, client_side_blending=client_side_blending)
 
 
 class DimensionChoicesBlenderQueryBuilder(DimensionChoicesQueryBuilder):
@@ -4,7 +4,7 @@ from functools import wraps
 from numbers import Number
 from typing import Type, Union
 
-from pypika import Field as PyPikaField
+from pypika import Field as PyPikaField, functions as fn
 from pypika.enums import Arithmetic
 from pypika.terms import (
     ArithmeticExpression,
@@ -38,6 +38,58 @@ class DataType(Enum):
         return self.name
 
 
+class Aggregation(Enum):
+    """
+    The aggregation of a metric. The values of metrics with one of these aggregations can be aggregated again, e.g. to
+    compute totals from the values of finer groups.
+    """
+
+    sum = 1
+    count = 2
+    min = 3
+    max = 4
+
+    def __repr__(self):
+        return self.name
+
+    @property
+    def reaggregation(self):
+        """
+        The aggregation that computes the value of this aggregation for a group from its values for finer groups.
+        """
+        return Aggregation.sum if self is Aggregation.count else self
+
+
+AGGREGATION_FUNCTIONS = [
+    (fn.Sum, Aggregation.sum),
+    (fn.Count, Aggregation.count),
+    (fn.Min, Aggregation.min),
+    (fn.Max, Aggregation.max),
+]
+
+
+def infer_aggregation(definition):
+    """
+    Infers the aggregation of a metric from its definition.
+
+    :param definition:
+        The definition of a metric.
+    :return:
+        An Aggregation or None when the definition is not a SUM, COUNT, MIN or MAX aggregation, or is distinct.
+    """
+    if isinstance(definition, Field):
+        return definition.aggregation
+
+    if getattr(definition, "_distinct", False):
+        return None
+
+    for function_class, aggregation in AGGREGATION_FUNCTIONS:
+        if isinstance(definition, function_class):
+            return aggregation
+
+    return None
+
+
 CONTINUOUS_TYPES = [DataType.number, DataType.date]
 DISCRETE_TYPES = [DataType.text, DataType.boolean]
 
@@ -107,6 +159,10 @@ class Field(Node):
         Whether the field data should be ignored in widgets. This is useful for not displaying hyperlink
         dependencies, which might be necessary only for the purpose of generating a hyperlink and have no
         effect on the dimension grouping.
+
+    :param aggregation: (optional)
+        The aggregation of a metric, which allows aggregating its values again, e.g. for computing totals without
+        querying the database. If not set, it is inferred from the definition for SUM, COUNT, MIN and MAX.
     """
 
     def __init__(
@@ -122,6 +178,7 @@ class Field(Node):
         precision: int = None,
         hyperlink_template: str = None,
         fetch_only: bool = False,
+        aggregation: Aggregation = None,
     ):
         self.alias = alias
         self.data_type = data_type
@@ -134,6 +191,7 @@ class Field(Node):
         self.precision = precision
         self.hyperlink_template = hyperlink_template
         self.fetch_only = fetch_only
+        self._aggregation = aggregation
 
         # An artificial field is created dynamically as the query is mounted, instead of being defined during
         # instantiation. That's the case for set dimensions, for instance. The only practical aspect of this
@@ -141,10 +199,56 @@ class Field(Node):
         # memory reference, artificial dimensions use a set of its fields.
         self.is_artificial = False
 
+    # The query builder for the choices of this field and the factory it is created with on first access. The factory
+    # is set when the field is added to a dataset.
+    _choices = None
+    _choices_factory = None
+
     @property
     def is_aggregate(self):
         return self.definition.is_aggregate
 
+    @property
+    def aggregation(self):
+        """
+        The aggregation of this field, when it is a metric that can be aggregated again. Either the declared
+        aggregation or the aggregation inferred from the definition.
+        """
+        if self._aggregation is not None:
+            return self._aggregation
+
+        return infer_aggregation(self.definition)
+
+    @property
+    def choices(self):
+        """
+        The query builder for fetching the choices of this field, when it is a dimension of a dataset. The query builder
+        is created on first access, so that datasets with many fields are cheap to construct.
+        """
+        if self._choices is None:
+            if self._choices_factory is None or self.is_aggregate:
+                raise AttributeError("Field '{}' has no choices.".format(self.alias))
+
+            self._choices = self._choices_factory(self)
+
+        return self._choices
+
+    @choices.setter
+    def choices(self, choices):
+        self._choices = choices
+
+    def set_choices_factory(self, factory):
+        """
+        Sets the factory that the query builder for the choices of this field is created with on first access. This
+        replaces a query builder that was already created for another dataset.
+
+        :param factory:
+            A callable, which returns a query builder for the choices of the field it is called with. The fields of a
+            dataset share the same factory.
+        """
+        self.__dict__.pop("_choices", None)
+        self._choices_factory = factory
+
     @property
     def groupable(self):
         """
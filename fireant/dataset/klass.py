@@ -1,14 +1,22 @@
+import copy
 import itertools
+from datetime import timedelta
+from functools import partial
 
+from fireant.cache import TTLCache
+from fireant.exceptions import DataSetException
 from fireant.queries.builder import (
     DataSetQueryBuilder,
     DimensionChoicesQueryBuilder,
     DimensionLatestQueryBuilder,
+    fetch_choices_for_dimensions,
 )
-from fireant.utils import (
-    deepcopy,
-    immutable,
-)
+from fireant.queries.cache_warmer import QueryLog, warm_result_cache
+from fireant.queries.schema import DataSetSchema
+from fireant.utils import deepcopy
+
+CHOICES_CACHE_MAX_SIZE = 1024
+RESULT_CACHE_MAX_SIZE = 256
 
 
 class _Container(object):
@@ -85,13 +93,23 @@ class _Container(object):
             ]
         )
 
+    @classmethod
+    def _reserved_names(cls):
+        """
+        Returns the names of the attributes of the container class, which can not be used as keys. They are computed
+        once per class, since `dir` is slow.
+        """
+        if "_reserved_names_cache" not in cls.__dict__:
+            cls._reserved_names_cache = frozenset(dir(cls))
+
+        return cls._reserved_names_cache
+
     def add(self, item):
         key = getattr(item, self._key_attribute)
         if key in self._items:
             raise ValueError(f"Item with key {key} already exists.")
 
-        # A very effective way to not allow reserved words but maybe not too great for performance
-        if key in dir(self):
+        if key in self._reserved_names() or key in self.__dict__:
             raise ValueError(f"Reserved name {key} can not be used.")
 
         self._items[key] = item
@@ -115,6 +133,16 @@ class DataSet:
         fields=(),
         always_query_all_metrics: bool = False,
         return_additional_metadata: bool = False,
+        concurrent_widget_transforms: bool = False,
+        choices_cache_ttl: int = None,
+        client_side_totals: bool = False,
+        result_cache_ttl: int = None,
+        incremental_refresh_ttl: int = None,
+        incremental_refresh_window: timedelta = timedelta(0),
+        update_columns: dict = None,
+        watermark_cache_ttl: int = 10,
+        result_cache_stale_ttl: int = None,
+        query_log_size: int = None,
     ):
         """
         Constructor for a dataset.  Contains all the fields to initialize the dataset.
@@ -132,10 +160,55 @@ class DataSet:
         :param annotation:  (Optional)
             Annotation for fetching additional data for a dataset.
         :param always_query_all_metrics: (Default: False)
-            When true, all metrics will be included in database queries in order to increase cache hits.
+            When true, all metrics will be included in database queries in order to increase cache hits. Only the
+            metrics that do not need any additional joins are included, since joins can change the result set. This
+            requires a result cache, see `result_cache_ttl`.
         :param return_additional_metadata: (Default: False)
             When true, widget data will be enveloped so extra metadata can be added to the response
             as follows: {'data': <widget data>, 'metadata': {...}}
+        :param concurrent_widget_transforms: (Default: False)
+            When true, the widgets of a query are transformed concurrently on a shared thread pool. This speeds up
+            queries with several widgets.
+        :param choices_cache_ttl: (Optional)
+            The number of seconds that the fetched choices of dimensions are cached for. The choices are cached per
+            dimension and set of filters, and cached choices can be searched by prefix without querying the database.
+        :param client_side_totals: (Default: False)
+            When true, the totals of queries are computed from the result set of the base query instead of with totals
+            queries, if every selected metric is a SUM, COUNT, MIN or MAX aggregation (see `Field.aggregation`) and the
+            totals are filtered the same way as the base query.
+        :param result_cache_ttl: (Optional)
+            The number of seconds that the result sets of queries are cached for. Result sets are cached per query
+            without its metrics, so a query is answered from the cache when a cached result set of a query which only
+            differs in its metrics contains all of its metrics. Queries with a datetime dimension are also answered
+            from cached result sets with a finer interval of that dimension when their metrics can be aggregated
+            again, e.g. weeks from days.
+        :param incremental_refresh_ttl: (Optional)
+            The number of seconds after which cached result sets are refreshed incrementally, which requires a result
+            cache. This applies to queries whose first dimension is a datetime dimension with a range filter on it.
+            Only the partitions of the datetime dimension from the watermark on are fetched again, by narrowing the
+            range filter, and merged into the cached result set. Result sets are still fetched completely after
+            `result_cache_ttl` seconds.
+        :param incremental_refresh_window: (Default: timedelta(0))
+            The watermark of an incremental refresh is the start of the latest cached partition of the datetime
+            dimension minus this timedelta. For example, `timedelta(days=1)` refreshes the last two days of a query by
+            day, in case data arrives late.
+        :param update_columns: (Optional)
+            A dict mapping tables of this dataset, i.e. its table and the tables of its joins, to the column recording
+            when their rows were last updated, e.g. `{politicians_table: politicians_table.updated_at}`. Cached result
+            sets are tagged with the watermarks of the tables they read, which are the latest values of their update
+            columns, and a cached result set is invalidated as soon as the watermark of one of its tables changes.
+            Tables without an update column only expire with `result_cache_ttl`.
+        :param watermark_cache_ttl: (Default: 10)
+            The number of seconds that the watermarks of tables are cached for, so that every query on the result cache
+            does not query them.
+        :param result_cache_stale_ttl: (Optional)
+            The number of seconds that expired result sets are still returned for, while they are refreshed in the
+            background (stale-while-revalidate). See `fireant.queries.result_cache.REVALIDATE_MAX_WORKERS` for the
+            number of result sets refreshed at once. Result sets invalidated by their watermarks are not returned.
+        :param query_log_size: (Optional)
+            The maximum number of queries counted in the query log of this dataset. The most frequent queries in the
+            query log are replayed by `warm_result_cache` or a `fireant.queries.cache_warmer.CacheWarmer`. This
+            requires a result cache.
         """
         self.table = table
         self.database = database
@@ -143,16 +216,30 @@ class DataSet:
         self.annotation = annotation
 
         self.fields = DataSet.Fields(fields)
+        self._schema = None
 
-        # add query builder entry points
-        self.query = DataSetQueryBuilder(self)
-        self.latest = DimensionLatestQueryBuilder(self)
+        # The query builder entry points are created on first access
+        self._query = None
+        self._latest = None
         self.always_query_all_metrics = always_query_all_metrics
         self.return_additional_metadata = return_additional_metadata
+        self.concurrent_widget_transforms = concurrent_widget_transforms
+        self.client_side_totals = client_side_totals
+        self.choices_cache = TTLCache(choices_cache_ttl, max_size=CHOICES_CACHE_MAX_SIZE) if choices_cache_ttl else None
+        self.result_cache = (
+            TTLCache(result_cache_ttl, max_size=RESULT_CACHE_MAX_SIZE, stale_ttl=result_cache_stale_ttl or 0)
+            if result_cache_ttl
+            else None
+        )
+        self.incremental_refresh_ttl = incremental_refresh_ttl
+        self.incremental_refresh_window = incremental_refresh_window
+        self.update_columns = dict(update_columns or {})
+        self.watermark_cache = TTLCache(watermark_cache_ttl) if watermark_cache_ttl else None
+        self.query_log = QueryLog(query_log_size) if query_log_size else None
 
+        make_choices = partial(DimensionChoicesQueryBuilder, self)
         for field in fields:
-            if not field.definition.is_aggregate:
-                field.choices = DimensionChoicesQueryBuilder(self, field)
+            field.set_choices_factory(make_choices)
 
     def __eq__(self, other):
         return isinstance(other, DataSet) and self.fields == other.fields
@@ -171,10 +258,109 @@ class DataSet:
             )
         )
 
-    @immutable
+    @property
+    def query(self) -> DataSetQueryBuilder:
+        """
+        The entry point for building queries on this dataset. It is created on first access.
+        """
+        if self._query is None:
+            self._query = DataSetQueryBuilder(self)
+
+        return self._query
+
+    @property
+    def latest(self) -> DimensionLatestQueryBuilder:
+        """
+        The entry point for querying the latest values of dimensions of this dataset. It is created on first access.
+        """
+        if self._latest is None:
+            self._latest = DimensionLatestQueryBuilder(self)
+
+        return self._latest
+
+    @property
+    def schema(self) -> DataSetSchema:
+        """
+        The compiled schema of this dataset, which is used for planning the joins of its queries. It is compiled on
+        first use.
+        """
+        if self._schema is None:
+            self._schema = DataSetSchema(self.table, self.joins, self.fields)
+
+        return self._schema
+
     def extra_fields(self, *fields):
-        for field in fields:
-            self.fields.add(field)
+        """
+        Returns a copy of this dataset with extra fields. The fields of this dataset are shared with the copy instead of
+        being copied.
+
+        :param fields:
+            The fields to add to the copy.
+        """
+        dataset = copy.copy(self)
+        dataset.joins = list(self.joins)
+        dataset.fields = DataSet.Fields([*self.fields, *fields])
+
+        # The query builders and the schema of the copy have to be created with the extra fields
+        dataset._query = None
+        dataset._latest = None
+        dataset._schema = None
+        return dataset
+
+    def fetch_choices(self, *dimensions, filters=(), hint=None, force_include=None) -> dict:
+        """
+        Fetches the choices for several dimensions at once, e.g. for all of the filters in a filter panel. This is
+        equivalent to calling `fetch` on the choices of each dimension, but the queries are executed together on a
+        single connection.
+
+        :param dimensions:
+            The dimensions to fetch the choices for.
+        :param filters:
+            (Optional) A list of filters applied to the choices of every dimension.
+        :param hint:
+            For database vendors that support it, add a query hint to collect analytics on the queries triggered by
+            fireant.
+        :param force_include:
+            (Optional) A dict mapping the aliases of dimensions to a list of values to include in their choices.
+        :return:
+            A dict mapping the alias of each dimension to its choices.
+        """
+        choices_builders = [self.fields[dimension.alias].choices.filter(*filters) for dimension in dimensions]
+        return fetch_choices_for_dimensions(choices_builders, hint=hint, force_include=force_include)
+
+    def prefetch_column_definitions(self, connection=None):
+        """
+        Loads the column definitions of all of the tables used by this dataset, i.e. its table, the tables of its joins
+        and the hint tables of its fields, into the schema cache of the database with a single query.
+
+        :param connection: (Optional) The connection to fetch the column definitions with.
+        """
+        tables = [self.table, *[join.table for join in self.joins], *[field.hint_table for field in self.fields]]
+        schema_tables = [
+            (table._schema._name, table._table_name)
+            for table in tables
+            if table is not None and getattr(table, "_schema", None) is not None
+        ]
+
+        if schema_tables:
+            self.database.prefetch_column_definitions(schema_tables, connection=connection)
+
+    def warm_result_cache(self, top_n=10, hint=None) -> int:
+        """
+        Fetches the result sets of the most frequent queries in the query log of this dataset into its result cache,
+        e.g. from a scheduled job before business hours.
+
+        :param top_n:
+            The number of queries to replay.
+        :param hint:
+            A query hint label used with database vendors which support it.
+        :return:
+            The number of queries replayed successfully.
+        """
+        if self.query_log is None:
+            raise DataSetException("Warming the result cache requires a query log, see `query_log_size`")
+
+        return warm_result_cache(self, top_n, hint=hint)
 
     def blend(self, other):
         """
@@ -11,6 +11,9 @@ TEXT_TOTALS = '~~totals'
 
 TOTALS_MARKERS = {TEXT_TOTALS, NUMBER_TOTALS, DATE_TOTALS}
 
+# The name of the index level holding the grouping id of each row in the typed representation of totals
+GROUPING_ID = '$__grouping_id'
+
 
 def get_totals_marker_for_dtype(dtype):
     """
@@ -26,6 +29,116 @@ def get_totals_marker_for_dtype(dtype):
     }.get(dtype, TEXT_TOTALS)
 
 
+def totals_mask(index) -> np.ndarray:
+    """
+    Returns a boolean array with a row for each value of an index and a column for each of its dimension levels, which
+    is true where the value of a level is totals. This supports both totals markers and the typed representation of
+    totals. Instead of comparing each value with a totals marker, only the distinct values of each level are compared.
+
+    :param index:
+        The index of a result set data frame.
+    :return:
+        A boolean array shaped as the number of rows by the number of dimension levels.
+    """
+    if isinstance(index, pd.MultiIndex) and GROUPING_ID in index.names:
+        grouping_ids = np.asarray(index.get_level_values(GROUPING_ID))
+        n_dimension_levels = index.nlevels - 1
+        level_bits = 1 << np.arange(n_dimension_levels - 1, -1, -1)
+        return (grouping_ids[:, np.newaxis] & level_bits) != 0
+
+    if not isinstance(index, pd.MultiIndex):
+        return np.asarray(index == get_totals_marker_for_dtype(index.dtype), dtype=bool).reshape(-1, 1)
+
+    mask = np.zeros((len(index), index.nlevels), dtype=bool)
+    for i, (level, codes) in enumerate(zip(index.levels, index.codes)):
+        marker_codes = np.flatnonzero(level == get_totals_marker_for_dtype(level.dtype))
+        if len(marker_codes):
+            mask[:, i] = np.isin(codes, marker_codes)
+
+    return mask
+
+
+def is_totals(index) -> np.ndarray:
+    """
+    Returns a boolean array which is true for the values of an index that are totals for at least one dimension.
+    """
+    return totals_mask(index).any(axis=1)
+
+
+def to_typed_totals(data_frame):
+    """
+    Converts a result set data frame with totals markers into the typed representation of totals. In the typed
+    representation, the dimension levels of the index only hold the values of the dimensions and keep their native
+    dtypes. The values of levels that are totals are missing, and an extra `GROUPING_ID` index level holds a grouping
+    id for each row, the same as the SQL function GROUPING_ID. The first dimension level is the most significant bit
+    of the grouping id, which is set when that level is totals.
+
+    :param data_frame:
+        A result set data frame with totals markers.
+    :return:
+        A data frame with a multi-level index in the typed representation of totals.
+    """
+    index = data_frame.index
+    if index.names == [None]:
+        # No dimensions
+        return data_frame
+
+    mask = totals_mask(index)
+    n_levels = mask.shape[1]
+
+    levels, codes = [], []
+    for i in range(n_levels):
+        values = index.get_level_values(i)[~mask[:, i]]
+        level_codes = np.full(len(index), -1, dtype=np.int64)
+        level_codes[~mask[:, i]], level = pd.factorize(pd.Series(values).infer_objects(), sort=True)
+        levels.append(level)
+        codes.append(level_codes)
+
+    grouping_ids = mask.dot(1 << np.arange(n_levels - 1, -1, -1))
+    grouping_id_codes, grouping_id_level = pd.factorize(grouping_ids, sort=True)
+    levels.append(grouping_id_level)
+    codes.append(grouping_id_codes)
+
+    typed_index = pd.MultiIndex(levels=levels, codes=codes, names=[*index.names, GROUPING_ID], verify_integrity=False)
+    return data_frame.set_axis(typed_index, axis=0, inplace=False)
+
+
+def to_totals_markers(data_frame):
+    """
+    Converts a data frame in the typed representation of totals back into a data frame with totals markers, which is
+    the representation the widgets transform.
+
+    :param data_frame:
+        A data frame with a multi-level index in the typed representation of totals.
+    :return:
+        A data frame with totals markers.
+    """
+    index = data_frame.index
+    if not isinstance(index, pd.MultiIndex) or GROUPING_ID not in index.names:
+        return data_frame
+
+    mask = totals_mask(index)
+    dimension_levels = [i for i, name in enumerate(index.names) if name != GROUPING_ID]
+
+    levels, codes = [], []
+    for i, level_number in enumerate(dimension_levels):
+        level, level_codes = index.levels[level_number], index.codes[level_number]
+        if mask[:, i].any():
+            # Append the totals marker to the level, so that the level keeps its dtype
+            levels.append(level.append(pd.Index([get_totals_marker_for_dtype(level.dtype)])))
+            codes.append(np.where(mask[:, i], len(level), level_codes))
+        else:
+            levels.append(level)
+            codes.append(level_codes)
+
+    names = [index.names[level_number] for level_number in dimension_levels]
+    marked_index = pd.MultiIndex(levels=levels, codes=codes, names=names, verify_integrity=False)
+    if marked_index.nlevels == 1:
+        marked_index = marked_index.get_level_values(0)
+
+    return data_frame.set_axis(marked_index, axis=0, inplace=False)
+
+
 def scrub_totals_from_share_results(data_frame, dimensions):
     """
     This function returns a data frame with the values for dimension totals filtered out if the corresponding dimension
@@ -55,41 +168,30 @@ def _scrub_totals_for_singlelevel_index_df(data_frame, dimensions):
         return data_frame
 
     # Otherwise, remove any rows where the index value equals the totals marker for its dtype.
-    marker = get_totals_marker_for_dtype(data_frame.index.dtype)
-    is_totals = data_frame.index == marker
-    return data_frame[~is_totals]
+    return data_frame[~is_totals(data_frame.index)]
 
 
 def _scrub_totals_for_multilevel_index_df(data_frame, dimensions):
     if data_frame.empty:
         return data_frame
 
-    # Get the totals marker value for each index level
-    markers = [get_totals_marker_for_dtype(level.dtype) for level in data_frame.index.levels]
-
-    # Create a boolean data frame indicating whether or not the index value equals the totals marker for the dtype
-    # corresponding to each index level
-    is_total_marker = pd.DataFrame(
-        [[value == marker for value, marker in zip(values, markers)] for values in data_frame.index],
-        index=data_frame.index,
-    )
+    # A boolean array indicating whether or not the value of each index level is totals
+    is_totals_marker = totals_mask(data_frame.index)
 
     """
     If a row in the data frame is for totals for one index level, all of the subsequent index levels will also use a
-    totals marker. In order to avoid filtering the wrong rows, a new data frame is created similar to `is_totals_marker`
+    totals marker. In order to avoid filtering the wrong rows, a new array is created similar to `is_totals_marker`
     except a cell is only set to True if that value is a totals marker for the corresponding index level, the leaves of
     the dimension value tree.
 
     This is achieved by rolling an XOR function across each index level with the previous level.
     """
-    first_column = is_total_marker.columns[0]
-    is_totals_marker_leaf = pd.DataFrame(is_total_marker[first_column])
-    for column, prev_column in zip(is_total_marker.columns[1:], list(is_total_marker.columns[:-1])):
-        is_totals_marker_leaf[column] = np.logical_xor(is_total_marker[column], is_total_marker[prev_column])
+    is_totals_marker_leaf = is_totals_marker.copy()
+    is_totals_marker_leaf[:, 1:] ^= is_totals_marker[:, :-1]
 
     # Create a boolean vector for each dimension to mark if that dimension is rolled up
     rollup_dimensions = np.array([isinstance(dimension, Rollup) for dimension in dimensions])
 
-    # Create a boolean pd.Series where False means to remove the row from the data frame.
-    mask = (~(~rollup_dimensions & is_totals_marker_leaf)).all(axis=1)
+    # Create a boolean vector where False means to remove the row from the data frame.
+    mask = ~(~rollup_dimensions & is_totals_marker_leaf).any(axis=1)
     return data_frame.loc[mask]
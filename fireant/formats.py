@@ -3,12 +3,14 @@ from datetime import (
     date,
     datetime,
 )
+from functools import partial
+from operator import methodcaller
 
 import numpy as np
 import pandas as pd
 
 from fireant.dataset.fields import DataType
-from fireant.dataset.totals import TOTALS_MARKERS
+from fireant.dataset.totals import NUMBER_TOTALS, TOTALS_MARKERS
 from fireant.utils import filter_kwargs
 
 RAW_VALUE = "raw"
@@ -58,19 +60,21 @@ def return_none(value):
     return None
 
 
-@filter_kwargs
-def _format_decimal(value, thousands="", precision=None, suffix=None, use_raw_value=False):
-    if not isinstance(value, (int, float)):
-        return value
+def _make_decimal_format(thousands="", precision=None, suffix=None, use_raw_value=False):
+    """
+    Resolves how decimals are formatted for a set of format arguments.
 
-    if use_raw_value and suffix == '%':
-        # When raw values are required, we divide percentage values by 100 to ensure they
-        # work well with Spreadsheet applications like Excel.
-        value /= 100
+    :return:
+        A tuple of the format pattern, whether values are divided by 100 before formatting and whether trailing zeros
+        are stripped after formatting.
+    """
+    # When raw values are required, we divide percentage values by 100 to ensure they
+    # work well with Spreadsheet applications like Excel.
+    divide_by_100 = use_raw_value and suffix == '%'
 
-        # Add extra precision to offset the division
-        if precision is not None:
-            precision += 2
+    # Add extra precision to offset the division
+    if divide_by_100 and precision is not None:
+        precision += 2
 
     if use_raw_value:
         precision_pattern = f'{{:.{precision if precision is not None else 16}f}}'
@@ -79,8 +83,20 @@ def _format_decimal(value, thousands="", precision=None, suffix=None, use_raw_va
     else:
         precision_pattern = f'{{:{thousands}f}}'
 
+    return precision_pattern, divide_by_100, precision is None
+
+
+@filter_kwargs
+def _format_decimal(value, thousands="", precision=None, suffix=None, use_raw_value=False):
+    if not isinstance(value, (int, float)):
+        return value
+
+    precision_pattern, divide_by_100, strip_zeros = _make_decimal_format(thousands, precision, suffix, use_raw_value)
+    if divide_by_100:
+        value /= 100
+
     value = precision_pattern.format(value)
-    if precision is None:
+    if strip_zeros:
         value = value.rstrip('0').rstrip('.')
 
     return value
@@ -210,10 +226,119 @@ def display_value(
     if value in TOTALS_MARKERS:
         return TOTALS_LABEL
 
+    format_kwargs = _get_format_kwargs(field)
+    formatter = FIELD_DISPLAY_FORMATTER.get(field.data_type, _identity)
+    return formatter(value, date_as=date_as, use_raw_value=use_raw_value, **format_kwargs)
+
+
+def _get_format_kwargs(field):
     format_kwargs = {
         key: getattr(field, key, None) for key in ("prefix", "suffix", "thousands", "precision", "interval_key")
     }
-    format_kwargs = {key: value for key, value in format_kwargs.items() if value is not None}
+    return {key: value for key, value in format_kwargs.items() if value is not None}
+
+
+def _compile_number_series_formatter(
+    nan_value, thousands="", precision=None, prefix=None, suffix=None, use_raw_value=False, **kwargs
+):
+    """
+    Builds a formatter for a column of integers or floats which is equivalent to calling `display_value` for each value.
+    The nulls, infinities and totals markers are found on the whole column at once and each formatting step is mapped
+    over the numbers in the column.
+    """
+    precision_pattern, divide_by_100, strip_zeros = _make_decimal_format(thousands, precision, suffix, use_raw_value)
+    styling_pattern = "{prefix}{{}}{suffix}".format(
+        prefix=(prefix or "").replace("{", "{{").replace("}", "}}"),
+        suffix=(suffix or "").replace("{", "{{").replace("}", "}}"),
+    )
+
+    def format_number_series(values):
+        is_float = values.dtype.kind == "f"
+        is_nan = np.isnan(values) if is_float else np.zeros(len(values), dtype=bool)
+        is_inf = np.isinf(values) if is_float else np.zeros(len(values), dtype=bool)
+        # A float can never be equal to the integer totals marker in python, so only integers are compared
+        is_totals = np.zeros(len(values), dtype=bool) if is_float else values == NUMBER_TOTALS
+        is_number = ~(is_nan | is_inf | is_totals)
+
+        numbers = values[is_number]
+        if divide_by_100:
+            numbers = numbers / 100
+
+        # Python has no vectorized str.format, so the string steps are mapped over the column with builtin methods,
+        # which is faster than numpy's string functions
+        formatted = map(precision_pattern.format, numbers.tolist())
+        if strip_zeros:
+            formatted = map(methodcaller('rstrip', '.'), map(methodcaller('rstrip', '0'), formatted))
+        if not use_raw_value:
+            formatted = map(styling_pattern.format, formatted)
+
+        display_values = np.empty(len(values), dtype=object)
+        display_values[is_number] = list(formatted)
+        display_values[is_nan] = nan_value
+        display_values[is_inf] = INF_VALUE
+        display_values[is_totals] = TOTALS_LABEL
+        return display_values
+
+    return format_number_series
+
+
+def display_value_formatter(
+    field,
+    date_as=date_as_string,
+    nan_value=NAN_VALUE,
+    null_value=NULL_VALUE,
+    use_raw_value=False,
+):
+    """
+    Compiles a formatter for a whole column of values of a field. The result of the formatter is equivalent to calling
+    `display_value` for each value in the column, but the format arguments and patterns are only resolved once and the
+    null checks are done on the whole column at once. Columns of integers or floats of number fields are formatted
+    column-wise.
 
+    :param field:
+        The dataset field that the values represent.
+    :param date_as:
+        A format function for datetimes.
+    :param nan_value:
+        The value to return if the value is a Pandas null (np.nan) value.
+    :param null_value:
+        The value to return if the value is None
+    :param use_raw_value:
+        Do not output a value with prefix/suffixes. See `display_value`.
+
+    :return:
+        A function that takes a pd.Series and returns a pd.Series of display values with the same index.
+    """
+    format_kwargs = _get_format_kwargs(field)
     formatter = FIELD_DISPLAY_FORMATTER.get(field.data_type, _identity)
-    return formatter(value, date_as=date_as, use_raw_value=use_raw_value, **format_kwargs)
+
+    format_value = partial(formatter, date_as=date_as, use_raw_value=use_raw_value, **format_kwargs)
+    format_number_series = (
+        _compile_number_series_formatter(nan_value, use_raw_value=use_raw_value, **format_kwargs)
+        if formatter is _format_number_field_value
+        else None
+    )
+
+    def format_non_null_value(value):
+        if isinstance(value, float) and np.isinf(value):
+            return INF_VALUE
+        if value in TOTALS_MARKERS:
+            return TOTALS_LABEL
+        return format_value(value)
+
+    def format_series(series):
+        if format_number_series is not None and series.dtype.kind in "if":
+            display_values = format_number_series(series.values)
+            return pd.Series(display_values, index=series.index, name=series.name, dtype=object)
+
+        # Converting to object dtype yields python scalars (and Timestamps), same as `pd.Series.apply` does
+        values = series.astype(object).values
+        is_null = pd.isnull(values)
+
+        display_values = [
+            (null_value if value is None else nan_value) if null else format_non_null_value(value)
+            for value, null in zip(values, is_null)
+        ]
+        return pd.Series(display_values, index=series.index, name=series.name, dtype=object)
+
+    return format_series
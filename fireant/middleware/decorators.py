@@ -1,4 +1,5 @@
 import signal
+import threading
 import time
 from functools import wraps
 
@@ -50,17 +51,21 @@ class CancelableConnection:
         """
         self._handle_interrupt_signal gets set as signal handler for SIGINT right after opening the db connection.
         """
+        # Signal handlers can only be set from the main thread, so queries executed on other threads can not be cancelled
+        self.handles_signals = threading.current_thread() is threading.main_thread()
         self.previous_signal_handler = signal.getsignal(signal.SIGINT)
         self.connection_context_manager = self.database.connect()
         self.connection = self.connection_context_manager.__enter__()
-        signal.signal(signal.SIGINT, self._handle_interrupt_signal)
+        if self.handles_signals:
+            signal.signal(signal.SIGINT, self._handle_interrupt_signal)
         return self.connection
 
     def __exit__(self, exception_type, exception_value, traceback):
         """
         self._handle_interrupt_signal gets removed as signal handler for SIGINT right before closing the db connection.
         """
-        signal.signal(signal.SIGINT, self.previous_signal_handler)
+        if self.handles_signals:
+            signal.signal(signal.SIGINT, self.previous_signal_handler)
         self.connection_context_manager.__exit__(exception_type, exception_value, traceback)
         if self.wait_time_after_close:
             time.sleep(self.wait_time_after_close)
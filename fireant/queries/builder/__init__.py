@@ -1,6 +1,9 @@
 from .dataset_blender_query_builder import DataSetBlenderQueryBuilder
-from .dataset_query_builder import DataSetQueryBuilder
-from .dimension_choices_query_builder import DimensionChoicesQueryBuilder
+from .dataset_query_builder import DataSetQueryBuilder, QueryPlan
+from .dimension_choices_query_builder import (
+    DimensionChoicesQueryBuilder,
+    fetch_choices_for_dimensions,
+)
 from .dimension_latest_query_builder import DimensionLatestQueryBuilder
 from .query_builder import (
     QueryBuilder,
@@ -1,11 +1,23 @@
 import copy
+from collections import namedtuple
 from typing import List
 
 from pypika import JoinType
 
-from fireant.dataset.fields import is_metric_field
-from fireant.queries.builder.dataset_query_builder import DataSetQueryBuilder
+from fireant.dataset.fields import Field, is_metric_field
+from fireant.queries.builder.dataset_query_builder import DataSetQueryBuilder, QueryPlan
+from fireant.queries.client_side_blending import (
+    blend_data_frames,
+    blender_join_aliases,
+)
+from fireant.queries.execution import (
+    BLENDER_FETCH_MAX_WORKERS,
+    get_parse_dates_for_dimensions,
+    get_shared_executor,
+    reduce_result_set,
+)
 from fireant.queries.finders import (
+    find_and_group_references_for_dimensions,
     find_dataset_fields,
     find_field_in_modified_field,
     find_metrics_for_widgets,
@@ -16,6 +28,7 @@ from fireant.queries.sql_transformer import make_slicer_query_with_totals_and_re
 from fireant.reference_helpers import reference_type_alias
 from fireant.utils import alias_selector, filter_nones, listify, ordered_distinct_list_by_attr
 from fireant.widgets.base import Widget
+from .query_builder import add_hints
 from ..sets import apply_set_dimensions, omit_set_filters
 
 
@@ -202,6 +215,7 @@ def _build_dataset_query(
         references=dataset_references,
         orders=[],
         share_dimensions=dataset_share_dimensions,
+        schema=dataset.schema,
     )
 
 
@@ -212,23 +226,18 @@ def _blender_join_criteria(base_query, join_query, dimensions, base_field_map, j
     `DataSetBlender.dimension_map`.
     """
     join_criteria = None
-    for dimension in dimensions:
-        dimension = find_field_in_modified_field(dimension)
-        # dimension has to be in both field maps:
-        if dimension not in base_field_map or dimension not in join_field_map:
-            continue
-
-        alias0, alias1 = [alias_selector(field_map[dimension].alias) for field_map in [base_field_map, join_field_map]]
-
+    for alias0, alias1 in blender_join_aliases(dimensions, base_field_map, join_field_map):
         next_criteria = base_query[alias0] == join_query[alias1]
         join_criteria = next_criteria if join_criteria is None else (join_criteria & next_criteria)
 
     return join_criteria
 
 
-def _get_sq_field_for_blender_field(field, queries, field_maps, reference=None):
+def _get_sq_term_for_blender_field(field, queries, field_maps, reference=None):
+    """
+    Returns the term that selects the value of a blender field from the dataset subqueries, without an alias.
+    """
     unmodified_field = find_field_in_modified_field(field)
-    field_alias = alias_selector(reference_type_alias(field, reference))
 
     # search for the field in each field map to determine which subquery it will be in
     for query, field_map in zip(queries, field_maps):
@@ -240,12 +249,31 @@ def _get_sq_field_for_blender_field(field, queries, field_maps, reference=None):
 
         subquery_field = query[mapped_field_alias]
         # case #1 modified fields, ex. day(timestamp) or rollup(dimension)
-        return field.for_(subquery_field).as_(field_alias)
+        return field.for_(subquery_field)
 
-    # Need to copy the metrics if there are references so that the `get_sql` monkey patch does not conflict
-    definition = copy.deepcopy(field.definition)
     # case #2: complex blender fields
-    return definition.as_(field_alias)
+    return _map_definition_to_subqueries(field.definition, queries, field_maps, reference)
+
+
+def _map_definition_to_subqueries(definition, queries, field_maps, reference=None):
+    """
+    Returns a copy of the definition of a complex blender field with each of the fields it references replaced by the
+    term selecting that field from the dataset subqueries.
+
+    The replacement is done by seeding the memo of a deep copy with the replacement terms, so that neither the
+    definition nor the fields it references, which are shared between all queries of a dataset, are mutated. This makes
+    it safe to build blended queries concurrently.
+    """
+    replacements = {
+        id(field): _get_sq_term_for_blender_field(field, queries, field_maps, reference)
+        for field in definition.find_(Field)
+    }
+    return copy.deepcopy(definition, replacements)
+
+
+def _get_sq_field_for_blender_field(field, queries, field_maps, reference=None):
+    field_alias = alias_selector(reference_type_alias(field, reference))
+    return _get_sq_term_for_blender_field(field, queries, field_maps, reference).as_(field_alias)
 
 
 def _perform_join_operations(dimensions, base_query, base_field_map, join_queries, join_field_maps):
@@ -275,13 +303,6 @@ def _blend_query(dimensions, metrics, orders, field_maps, queries):
 
     blender_query = _perform_join_operations(dimensions, base_query, base_field_map, join_queries, join_field_maps)
 
-    # WARNING: In order to make complex fields work, the get_sql for each field is monkey patched in. This must
-    # happen here because a complex metric by definition references values selected from the dataset subqueries.
-
-    for metric in find_dataset_fields(metrics):
-        subquery_field = _get_sq_field_for_blender_field(metric, queries, field_maps, reference)
-        metric.get_sql = subquery_field.get_sql
-
     sq_dimensions = [_get_sq_field_for_blender_field(d, queries, field_maps) for d in dimensions]
     sq_metrics = [_get_sq_field_for_blender_field(m, queries, field_maps, reference) for m in metrics]
     blender_query = blender_query.select(*sq_dimensions).select(*sq_metrics)
@@ -298,23 +319,63 @@ def _blend_query(dimensions, metrics, orders, field_maps, queries):
     return blender_query
 
 
+class BlendPlan(
+    namedtuple(
+        "BlendPlan",
+        ["dimensions", "metrics", "datasets", "dataset_dimensions", "field_maps", "dataset_queries"],
+    )
+):
+    """
+    The datasets needed for a blended query, with their mapped dimensions, field maps and queries, along with the
+    blender dimensions and metrics to select from them.
+    """
+
+    @property
+    def query_sets(self):
+        """
+        A dataset query can yield one or more sql queries, depending on how many types of references or dimensions
+        with totals are selected. A blended dataset query must yield the same number and types of sql queries, but each
+        blended together. The individual dataset queries will always yield the same number of sql queries, so here
+        those lists of sql queries are zipped.
+
+               base   ref  totals ref+totals
+        ds1 | ds1_a  ds1_b  ds1_c   ds1_d
+        ds2 | ds2_a  ds2_b  ds2_c   ds2_d
+
+        More concretely, using the diagram above as a reference, a dataset query with 1 reference and 1 totals dimension
+        would yield 4 sql queries. With data blending with 1 reference and 1 totals dimension, 4 sql queries must also
+        be produced.  This converts the list of rows of the table in the diagram to a list of columns. Each set of
+        queries in a column is then reduced to a single data blending query or data frame.
+        """
+        per_dataset_queries_count = max([len(dataset_queries) for dataset_queries in self.dataset_queries])
+        # There will be the same amount of query sets as the longest length of queries for a single dataset
+        query_sets = [[] for _ in range(per_dataset_queries_count)]
+
+        # Add the queries returned for each dataset to the correct queryset
+        for dataset_queries in self.dataset_queries:
+            for i, query in enumerate(dataset_queries):
+                query_sets[i].append(query)
+
+        return query_sets
+
+
+class BlendedQueryPlan(namedtuple("BlendedQueryPlan", QueryPlan._fields + ("blend_plan",))):
+    """
+    A query plan for a blended dataset query, along with the blend plan the blended queries were built from.
+    """
+
+
 class DataSetBlenderQueryBuilder(DataSetQueryBuilder):
     """
     Blended dataset queries consist of widgets, dimensions, filters, orders by and references. At least one or
     more widgets is required. All others are optional.
     """
 
-    @property
-    def sql(self):
+    def _make_blend_plan(self) -> BlendPlan:
         """
-        Serialize this query builder to a list of Pypika/SQL queries. This function will return one query for every
-        combination of reference and rolled up dimension (including null options).
+        Determines which of the blended datasets are needed for this query and builds the queries for each of them.
 
-        This collects all of the metrics in each widget, dimensions, and filters and builds a corresponding pypika query
-        to fetch the data.  When references are used, the base query normally produced is wrapped in an outer query and
-        a query for each reference is joined based on the referenced dimension shifted.
-
-        :return: a list of Pypika's Query subclass instances.
+        :return: A BlendPlan.
         """
         # First run validation for the query on all widgets
         self._validate()
@@ -435,6 +496,8 @@ class DataSetBlenderQueryBuilder(DataSetQueryBuilder):
                     dataset_dimensions[dataset_index].append(mapped_dimension)
 
         datasets_queries = []
+        filtered_datasets = []
+        filtered_dataset_dimensions = []
         filtered_field_maps = []
         for dataset_index, dataset in enumerate(datasets):
             if dataset_included_in_final_query[dataset_index]:
@@ -445,51 +508,119 @@ class DataSetBlenderQueryBuilder(DataSetQueryBuilder):
                         dataset_metrics[dataset_index],
                         dataset_dimensions[dataset_index],
                         dataset_filters[dataset_index],
-                        self._references,
+                        list(self._references),
                         operations,
                         share_dimensions,
                     )
                 )
                 # Filter the field maps of which the dataset is not going to be in the final query.
+                filtered_datasets.append(dataset)
+                filtered_dataset_dimensions.append(dataset_dimensions[dataset_index])
                 filtered_field_maps.append(field_maps[dataset_index])
 
-        """
-        A dataset query can yield one or more sql queries, depending on how many types of references or dimensions 
-        with totals are selected. A blended dataset query must yield the same number and types of sql queries, but each
-        blended together. The individual dataset queries built above will always yield the same number of sql queries, 
-        so here those lists of sql queries are zipped.
-        
-               base   ref  totals ref+totals
-        ds1 | ds1_a  ds1_b  ds1_c   ds1_d  
-        ds2 | ds2_a  ds2_b  ds2_c   ds2_d  
-        
-        More concretely, using the diagram above as a reference, a dataset query with 1 reference and 1 totals dimension
-        would yield 4 sql queries. With data blending with 1 reference and 1 totals dimension, 4 sql queries must also 
-        be produced.  The following lines convert the list of rows of the table in the diagram to a list of columns.
-        Each set of queries in a column are then reduced to a single data blending sql query.
-        """
+        return BlendPlan(
+            selected_blender_dimensions,
+            selected_blender_metrics,
+            filtered_datasets,
+            filtered_dataset_dimensions,
+            filtered_field_maps,
+            datasets_queries,
+        )
 
-        per_dataset_queries_count = max([len(dataset_queries) for dataset_queries in datasets_queries])
-        # There will be the same amount of query sets as the longest length of queries for a single dataset
-        query_sets = [[] for _ in range(per_dataset_queries_count)]
+    def _make_plan(self, limit_to_max_result_set_size=True) -> "BlendedQueryPlan":
+        """
+        Compiles this query builder to one blended query for every combination of reference and rolled up dimension
+        (including null options). Each blended query joins the queries of the datasets for that combination.
 
-        # Add the queries returned for each dataset to the correct queryset
-        for dataset_index, dataset_queries in enumerate(datasets_queries):
-            for i, query in enumerate(dataset_queries):
-                query_sets[i].append(query)
+        :return: A BlendedQueryPlan.
+        """
+        blend_plan = self._make_blend_plan()
+        orders = self.orders
 
         blended_queries = []
-        for queryset in query_sets:
+        for queryset in blend_plan.query_sets:
             blended_query = _blend_query(
-                selected_blender_dimensions,
-                selected_blender_metrics,
-                self.orders,
-                filtered_field_maps,
+                blend_plan.dimensions,
+                blend_plan.metrics,
+                orders,
+                blend_plan.field_maps,
                 queryset,
             )
-            blended_query = self._apply_pagination(blended_query)
+            blended_query = self._apply_pagination(
+                blended_query, limit_to_max_result_set_size=limit_to_max_result_set_size
+            )
 
             if blended_query:
                 blended_queries.append(blended_query)
 
-        return blended_queries
+        dimensions = blend_plan.dimensions
+        operations = find_operations_for_widgets(self._widgets)
+
+        return BlendedQueryPlan(
+            queries=tuple(blended_queries),
+            dimensions=tuple(dimensions),
+            orders=tuple(orders),
+            operations=tuple(operations),
+            share_dimensions=tuple(find_share_dimensions(dimensions, operations)),
+            reference_groups=tuple(find_and_group_references_for_dimensions(dimensions, self._references).values()),
+            # The totals of blended queries are not computed client-side and their result sets are not cached
+            totals_aggregations=None,
+            result_cache_key=None,
+            metric_keys=None,
+            query_metric_keys=None,
+            reaggregation=None,
+            incremental_refresh=None,
+            watermark_tables=None,
+            blend_plan=blend_plan,
+        )
+
+    def _fetch_result_set(self, hint=None):
+        """
+        Fetches the result sets of this query. When client-side blending is enabled, the queries of each dataset are
+        executed concurrently on the database of the dataset instead of as a single blended SQL query. The result sets of
+        each query set are then blended in memory.
+
+        :return:
+            Tuple(The largest number of rows returned by a blended query, the data frame)
+        """
+        if not self.dataset.client_side_blending:
+            return super()._fetch_result_set(hint)
+
+        plan = self.plan
+        blend_plan = plan.blend_plan
+
+        executor = get_shared_executor("blender-fetch", BLENDER_FETCH_MAX_WORKERS)
+        futures = [
+            executor.submit(
+                dataset.database.fetch_dataframes,
+                *[str(query) for query in add_hints(dataset_queries, hint)],
+                parse_dates=get_parse_dates_for_dimensions(dataset_dimensions),
+            )
+            for dataset, dataset_dimensions, dataset_queries in zip(
+                blend_plan.datasets, blend_plan.dataset_dimensions, blend_plan.dataset_queries
+            )
+        ]
+        datasets_data_frames = [future.result() for future in futures]
+
+        offset = self._query_offset or 0
+        limit = min(self._query_limit or float("inf"), self.dataset.database.max_result_set_size)
+
+        blended_data_frames = []
+        for index, query_set in enumerate(blend_plan.query_sets):
+            data_frames = [
+                data_frames[index] if index < len(data_frames) else None for data_frames in datasets_data_frames
+            ]
+            reference = query_set[0]._references[0] if query_set[0]._references else None
+
+            blended_data_frame = blend_data_frames(
+                blend_plan.dimensions, blend_plan.metrics, plan.orders, blend_plan.field_maps, data_frames, reference
+            )
+            blended_data_frames.append(blended_data_frame.iloc[offset : offset + limit].reset_index(drop=True))
+
+        max_rows_returned = max(len(data_frame) for data_frame in blended_data_frames)
+        return max_rows_returned, reduce_result_set(
+            blended_data_frames,
+            list(plan.reference_groups),
+            list(plan.dimensions),
+            list(plan.share_dimensions),
+        )
@@ -1,7 +1,16 @@
+import copy
+from collections import namedtuple
+from functools import partial
 from typing import Dict, Iterable, List, TYPE_CHECKING, Type, Union
 
+import pandas as pd
+from pandas.api.types import is_datetime64_dtype
+
 from fireant.dataset.fields import DataType
+from fireant.dataset.filters import RangeFilter
 from fireant.dataset.intervals import DatetimeInterval
+from fireant.dataset.modifiers import Rollup
+from fireant.dataset.operations import RollingOperation
 from fireant.dataset.totals import scrub_totals_from_share_results
 from fireant.reference_helpers import (
     apply_reference_filters,
@@ -11,6 +20,7 @@ from fireant.utils import (
     alias_selector,
     immutable,
 )
+from fireant.widgets.csv import CSV
 from .query_builder import (
     QueryBuilder,
     QueryException,
@@ -19,23 +29,85 @@ from .query_builder import (
     add_hints,
 )
 from .. import special_cases
-from ..execution import fetch_data
+from ..execution import (
+    ANNOTATION_FETCH_MAX_WORKERS,
+    fetch_data,
+    fetch_data_with_client_side_totals,
+    get_parse_dates_for_dimensions,
+    get_shared_executor,
+    transform_widgets,
+)
 from ..finders import (
     find_and_group_references_for_dimensions,
     find_field_in_modified_field,
     find_metrics_for_widgets,
     find_operations_for_widgets,
     find_share_dimensions,
+    find_totals_dimensions,
 )
 from ..pagination import paginate
+from ..result_cache import (
+    CachedResultSet,
+    FINER_INTERVALS,
+    IncrementalRefresh,
+    Reaggregation,
+    drop_metrics,
+    find_additional_metrics,
+    find_metric_keys,
+    find_watermark,
+    make_result_cache_key,
+    merge_partitions,
+    reaggregate_interval,
+    revalidate_in_background,
+)
 from ..sql_transformer import (
     make_slicer_query,
     make_slicer_query_with_totals_and_references,
+    make_watermark_query,
 )
+from ..totals_helper import find_totals_aggregations
 
 if TYPE_CHECKING:
     from pypika import PyPikaQueryBuilder
 
+# The default number of rows held in memory at once when streaming an export
+EXPORT_CHUNK_SIZE = 10000
+
+_MISSING = object()
+
+
+class QueryPlan(
+    namedtuple(
+        "QueryPlan",
+        [
+            "queries",
+            "dimensions",
+            "orders",
+            "operations",
+            "share_dimensions",
+            "reference_groups",
+            "totals_aggregations",
+            "result_cache_key",
+            "metric_keys",
+            "query_metric_keys",
+            "reaggregation",
+            "incremental_refresh",
+            "watermark_tables",
+        ],
+    )
+):
+    """
+    The compiled form of a dataset query: the SQL queries to execute and everything derived from the query builder
+    that is needed to turn their result sets into widget data. When `totals_aggregations` is set, the totals are
+    computed from the result set of the base query instead of with the totals queries. When `result_cache_key` is set,
+    the result set is cached in the result cache of the dataset, along with the keys of the metrics selected by the
+    queries, and the metrics of the query are taken from any cached result set which contains them. When
+    `reaggregation` is set, the result set can also be computed from a cached result set of the same query with a finer
+    interval of its datetime dimension. When `incremental_refresh` is set, the cached result set is refreshed
+    incrementally once it is older than the incremental refresh TTL of the dataset. The `watermark_tables` are the
+    tables read by the queries which have an update column, whose watermarks tag the cached result set.
+    """
+
 
 class DataSetQueryBuilder(ReferenceQueryBuilderMixin, WidgetQueryBuilderMixin, QueryBuilder):
     """
@@ -45,12 +117,23 @@ class DataSetQueryBuilder(ReferenceQueryBuilderMixin, WidgetQueryBuilderMixin, Q
 
     def __init__(self, dataset):
         super().__init__(dataset)
-        self._totals_dimensions = set()
-        self._apply_filter_to_totals = []
+        self._totals_dimensions = frozenset()
+        self._apply_filter_to_totals = ()
+        self._plan = None
 
     def __call__(self, *args, **kwargs):
         return self
 
+    # noinspection PyDefaultArgument
+    def __deepcopy__(self, memodict={}):
+        result = super().__deepcopy__(memodict)
+        # Copies are made to be changed, so the plan compiled for this query builder is not shared with them
+        result._plan = None
+        return result
+
+    def _clear_memoized(self):
+        self._plan = None
+
     @immutable
     def filter(self, *filters, apply_to_totals=True):
         """
@@ -63,12 +146,12 @@ class DataSetQueryBuilder(ReferenceQueryBuilderMixin, WidgetQueryBuilderMixin, Q
         :return:
             A copy of the query with the filters added.
         """
-        self._filters += [f for f in filters]
-        self._apply_filter_to_totals += [apply_to_totals] * len(filters)
+        self._filters += filters
+        self._apply_filter_to_totals += (apply_to_totals,) * len(filters)
 
     @property
     def reference_groups(self):
-        return list(find_and_group_references_for_dimensions(self.dimensions, self._references).values())
+        return list(self.plan.reference_groups)
 
     @property
     def sql(self) -> List[Type['PyPikaQueryBuilder']]:
@@ -82,15 +165,52 @@ class DataSetQueryBuilder(ReferenceQueryBuilderMixin, WidgetQueryBuilderMixin, Q
 
         :return: a list of Pypika's Query subclass instances.
         """
+        return list(self.plan.queries)
+
+    @property
+    def plan(self) -> QueryPlan:
+        """
+        The query plan of this query builder. It is compiled once and then reused, since changing a query builder always
+        returns a new query builder.
+
+        :return: A QueryPlan.
+        """
+        if self._plan is None:
+            self._plan = self._make_plan()
+
+        return self._plan
+
+    def _make_plan(self, limit_to_max_result_set_size=True) -> QueryPlan:
         # First run validation for the query on all widgets
         self._validate()
 
         dimensions = self.dimensions
+        orders = self.orders
 
         metrics = find_metrics_for_widgets(self._widgets)
         operations = find_operations_for_widgets(self._widgets)
         share_dimensions = find_share_dimensions(dimensions, operations)
 
+        result_cache_key, metric_keys, query_metric_keys, reaggregation, incremental_refresh = (None,) * 5
+        watermark_tables = ()
+        if limit_to_max_result_set_size and self._uses_result_cache():
+            required_tables = self.dataset.schema.find_required_tables_to_join(
+                [*metrics, *dimensions, *self.filters, *[field for field, _ in orders]]
+            )
+            metric_keys = find_metric_keys(dimensions, metrics, orders)
+            reaggregation = self._find_reaggregation(
+                dimensions, metrics, orders, operations, share_dimensions, required_tables
+            )
+            if self.dataset.always_query_all_metrics:
+                metrics = metrics + find_additional_metrics(
+                    self.dataset.fields, metrics, required_tables, self.dataset.schema
+                )
+
+            query_metric_keys = find_metric_keys(dimensions, metrics, orders)
+            result_cache_key = self._make_result_cache_key(dimensions, operations, share_dimensions, required_tables)
+            incremental_refresh = self._find_incremental_refresh(dimensions, metrics, orders, share_dimensions)
+            watermark_tables = self._find_watermark_tables(required_tables)
+
         queries = make_slicer_query_with_totals_and_references(
             database=self.dataset.database,
             table=self.table,
@@ -99,12 +219,149 @@ class DataSetQueryBuilder(ReferenceQueryBuilderMixin, WidgetQueryBuilderMixin, Q
             metrics=metrics,
             operations=operations,
             filters=self.filters,
-            references=self._references,
-            orders=self.orders,
+            references=list(self._references),
+            orders=orders,
             share_dimensions=share_dimensions,
+            schema=self.dataset.schema,
         )
 
-        return [self._apply_pagination(query) for query in queries]
+        return QueryPlan(
+            tuple(
+                self._apply_pagination(query, limit_to_max_result_set_size=limit_to_max_result_set_size)
+                for query in queries
+            ),
+            tuple(dimensions),
+            tuple(orders),
+            tuple(operations),
+            tuple(share_dimensions),
+            tuple(find_and_group_references_for_dimensions(dimensions, self._references).values()),
+            self._find_totals_aggregations(dimensions, metrics, orders, share_dimensions),
+            result_cache_key,
+            metric_keys,
+            query_metric_keys,
+            reaggregation,
+            incremental_refresh,
+            watermark_tables,
+        )
+
+    def _make_result_cache_key(self, dimensions, operations, share_dimensions, required_tables):
+        return make_result_cache_key(
+            database=self.dataset.database,
+            table=self.table,
+            joins=self.dataset.joins,
+            dimensions=dimensions,
+            operations=operations,
+            filters=self.filters,
+            references=list(self._references),
+            share_dimensions=share_dimensions,
+            required_tables=required_tables,
+            schema=self.dataset.schema,
+        )
+
+    def _find_reaggregation(self, dimensions, metrics, orders, operations, share_dimensions, required_tables):
+        """
+        Returns how the result set of this query can be computed from a cached result set of the same query with a
+        finer interval of its first datetime dimension, otherwise None. The metrics must be aggregated again the same
+        way as for client-side totals, and rolling operations are not supported since they change the filters
+        depending on the interval.
+        """
+        if any(isinstance(operation, RollingOperation) for operation in operations):
+            return None
+
+        for i, dimension in enumerate(dimensions):
+            is_rollup = isinstance(dimension, Rollup)
+            interval = dimension.dimension if is_rollup else dimension
+            if isinstance(interval, DatetimeInterval):
+                break
+        else:
+            return None
+
+        if interval.interval_key not in FINER_INTERVALS:
+            return None
+
+        aggregations = find_totals_aggregations(dimensions, metrics, self.filters, list(self._references), orders)
+        if aggregations is None:
+            return None
+
+        finer_result_cache_keys = []
+        for finer_interval_key in FINER_INTERVALS[interval.interval_key]:
+            finer_interval = DatetimeInterval(find_field_in_modified_field(interval), finer_interval_key)
+            finer_dimensions = list(dimensions)
+            finer_dimensions[i] = Rollup(finer_interval) if is_rollup else finer_interval
+            finer_result_cache_keys.append(
+                self._make_result_cache_key(finer_dimensions, operations, share_dimensions, required_tables)
+            )
+
+        return Reaggregation(
+            alias_selector(interval.alias), interval.interval_key, tuple(finer_result_cache_keys), aggregations
+        )
+
+    def _find_incremental_refresh(self, dimensions, metrics, orders, share_dimensions):
+        """
+        Returns how the cached result set of this query can be refreshed incrementally, otherwise None. The first
+        dimension must be a datetime dimension with a range filter on it. When the datetime dimension is rolled up, its
+        totals are recomputed from the merged result set, so the metrics must be aggregated again the same way as for
+        client-side totals.
+        """
+        if self.dataset.incremental_refresh_ttl is None or not dimensions:
+            return None
+
+        interval = dimensions[0].dimension if isinstance(dimensions[0], Rollup) else dimensions[0]
+        if not isinstance(interval, DatetimeInterval):
+            return None
+
+        range_filters = [
+            fltr
+            for fltr in self.filters
+            if isinstance(fltr, RangeFilter) and str(fltr.field.definition) == str(interval.definition)
+        ]
+        if not range_filters:
+            return None
+
+        aggregations = None
+        if find_totals_dimensions(dimensions[:1], share_dimensions):
+            aggregations = find_totals_aggregations(dimensions, metrics, self.filters, list(self._references), orders)
+            if aggregations is None:
+                return None
+
+        return IncrementalRefresh(alias_selector(interval.alias), interval.interval_key, range_filters[0], aggregations)
+
+    def _find_watermark_tables(self, required_tables):
+        """
+        Returns the tables read by this query which have an update column, i.e. the base table and the tables of the
+        joins needed for the required tables, including the joins they depend on, sorted by name.
+        """
+        update_columns = self.dataset.update_columns
+        if not update_columns:
+            return ()
+
+        joins = self.dataset.schema.find_joins_for_tables(required_tables)
+        tables = {
+            str(table): table for table in [self.table, *[join.table for join in joins]] if table in update_columns
+        }
+        return tuple(tables[name] for name in sorted(tables))
+
+    def _uses_result_cache(self):
+        """
+        Whether the result set of this query is cached. Result sets of queries limited by the query builder are not
+        cached, since the rows they contain depend on the order of the rows.
+        """
+        return self.dataset.result_cache is not None and self._query_limit is None and not self._query_offset
+
+    def _find_totals_aggregations(self, dimensions, metrics, orders, share_dimensions):
+        """
+        Returns the aggregations of the metrics when the totals of this query can be computed client-side from the
+        result set of the base query, otherwise None. The base query must not be limited by the query builder.
+        """
+        if (
+            not self.dataset.client_side_totals
+            or self._query_limit is not None
+            or self._query_offset
+            or not find_totals_dimensions(dimensions, share_dimensions)
+        ):
+            return None
+
+        return find_totals_aggregations(dimensions, metrics, self.filters, list(self._references), orders)
 
     def fetch(self, hint=None) -> Union[Iterable[Dict], Dict]:
         """
@@ -115,62 +372,390 @@ class DataSetQueryBuilder(ReferenceQueryBuilderMixin, WidgetQueryBuilderMixin, Q
         :return:
             A list of dict (JSON) objects containing the widget configurations.
         """
-        queries = add_hints(self.sql, hint)
+        plan = self.plan
+        dimensions = list(plan.dimensions)
 
-        operations = find_operations_for_widgets(self._widgets)
-        dimensions = self.dimensions
-
-        share_dimensions = find_share_dimensions(dimensions, operations)
-
-        annotation_frame = None
+        annotation_future = None
         if dimensions and self.dataset.annotation:
             alignment_dimension_alias = self.dataset.annotation.dataset_alignment_field_alias
             first_dimension = find_field_in_modified_field(dimensions[0])
 
             if first_dimension.alias == alignment_dimension_alias:
-                annotation_frame = self.fetch_annotation()
+                # Fetch the annotation data while the dataset queries are being executed
+                executor = get_shared_executor("annotation-fetch", ANNOTATION_FETCH_MAX_WORKERS)
+                annotation_future = executor.submit(self.fetch_annotation)
 
-        max_rows_returned, data_frame = fetch_data(
-            self.dataset.database,
-            queries,
+        max_rows_returned, data_frame = self._fetch_data_frame(hint)
+        annotation_frame = annotation_future.result() if annotation_future is not None else None
+
+        # Apply transformations
+        widget_data = transform_widgets(
+            list(self._widgets),
+            data_frame,
             dimensions,
-            share_dimensions,
-            self.reference_groups,
+            list(self._references),
+            annotation_frame,
+            concurrent=self.dataset.concurrent_widget_transforms,
+        )
+
+        return self._transform_for_return(widget_data, max_rows_returned=max_rows_returned)
+
+    def _fetch_result_set(self, hint=None):
+        """
+        Fetches the result sets of the queries of this query builder and reduces them into a single data frame. When
+        the dataset has a result cache, the data frame is taken from a cached result set which contains all of the
+        metrics of this query, if there is one.
+
+        :return:
+            Tuple(The largest number of rows returned by a query, the data frame)
+        """
+        plan = self.plan
+        if plan.result_cache_key is None:
+            return self._execute_queries(hint)
+
+        result_cache = self.dataset.result_cache
+        if self.dataset.query_log is not None:
+            self.dataset.query_log.record((plan.result_cache_key, plan.query_metric_keys), self)
+
+        # The watermarks are fetched before the queries, so that data updated while they are executed invalidates them
+        watermarks = self._fetch_watermarks(hint)
+        cached = self._get_cached_result_set(plan.result_cache_key, watermarks)
+        if cached is not None and self._is_due_for_incremental_refresh(cached):
+            cached = self._refresh_cached_result_set(cached, hint)
+            if cached is not None:
+                result_cache.replace(plan.result_cache_key, cached)
+
+        if cached is None or not plan.metric_keys <= cached.metric_keys:
+            # Re-aggregated result sets are not cached, so that they expire with the result sets they are computed from
+            cached = self._reaggregate_cached_result_set(watermarks)
+
+        if cached is None:
+            cached = self._get_stale_result_set(watermarks, hint)
+
+        if cached is None:
+            cached = self._fetch_into_result_cache(watermarks, hint)
+
+        # The cached data frame is copied, since the data frame is changed when applying operations
+        data_frame = drop_metrics(cached.data_frame, cached.metric_keys - plan.metric_keys, list(self._references))
+        return cached.max_rows_returned, data_frame
+
+    def _fetch_into_result_cache(self, watermarks, hint=None):
+        """
+        Executes the queries of this query builder and stores their result set in the result cache of the dataset,
+        unless the result set is truncated.
+
+        :param watermarks:
+            The watermarks of the tables read by this query before the queries are executed, see `_fetch_watermarks`.
+        :return:
+            The fetched CachedResultSet.
+        """
+        plan = self.plan
+        result_cache = self.dataset.result_cache
+
+        max_rows_returned, data_frame = self._execute_queries(hint)
+        cached = CachedResultSet(
+            plan.query_metric_keys, max_rows_returned, data_frame, result_cache.clock(), watermarks
+        )
+
+        # Truncated result sets depend on the order of the rows, so they can not be used for other queries
+        if max_rows_returned < self.dataset.database.max_result_set_size:
+            result_cache.set(plan.result_cache_key, cached)
+
+        return cached
+
+    def _get_stale_result_set(self, watermarks, hint=None):
+        """
+        Returns the expired result set of this query, when the result cache keeps expired result sets, and refreshes it
+        in the background. Expired result sets are only returned if they contain all of the metrics of this query and
+        none of the tables they were fetched from has been updated since.
+
+        :return:
+            A CachedResultSet or None if there is no such result set.
+        """
+        plan = self.plan
+        result_cache = self.dataset.result_cache
+        if plan.result_cache_key in result_cache:
+            return None
+
+        cached = result_cache.get_stale(plan.result_cache_key)
+        if cached is None or cached.watermarks != watermarks or not plan.metric_keys <= cached.metric_keys:
+            return None
+
+        revalidate_in_background(
+            result_cache, plan.result_cache_key, partial(self._fetch_into_result_cache, watermarks, hint)
+        )
+        return cached
+
+    def warm_result_cache(self, hint=None):
+        """
+        Fetches the result set of this query into the result cache of the dataset, replacing any cached result set, so
+        that the following fetches of this query are answered from the cache.
+
+        :param hint:
+            A query hint label used with database vendors which support it. Adds a label comment to the query.
+        """
+        if self.plan.result_cache_key is None:
+            raise QueryException("The result set of this query can not be cached")
+
+        self._fetch_into_result_cache(self._fetch_watermarks(hint), hint)
+
+    def _get_cached_result_set(self, result_cache_key, watermarks):
+        """
+        Returns the cached result set for a result cache key. A cached result set which was fetched with other
+        watermarks than the current watermarks of the tables it was fetched from is invalidated.
+
+        :return:
+            A CachedResultSet or None if there is no such cached result set.
+        """
+        result_cache = self.dataset.result_cache
+        cached = result_cache.get(result_cache_key)
+        if cached is not None and cached.watermarks != watermarks:
+            result_cache.invalidate(result_cache_key)
+            return None
+
+        return cached
+
+    def _fetch_watermarks(self, hint=None):
+        """
+        Fetches the watermarks of the tables read by this query which have an update column, i.e. the latest values of
+        their update columns. The watermarks are cached in the watermark cache of the dataset and the watermarks which
+        are not cached are fetched together.
+
+        :return:
+            A tuple of the watermark of each of the `watermark_tables` of the plan.
+        """
+        tables = self.plan.watermark_tables
+        if not tables:
+            return ()
+
+        watermark_cache = self.dataset.watermark_cache
+        watermarks = {}
+        for table in tables:
+            watermark = _MISSING if watermark_cache is None else watermark_cache.get(str(table), _MISSING)
+            if watermark is not _MISSING:
+                watermarks[table] = watermark
+
+        missing_tables = [table for table in tables if table not in watermarks]
+        if missing_tables:
+            queries = [
+                make_watermark_query(self.dataset.database, table, self.dataset.update_columns[table])
+                for table in missing_tables
+            ]
+            results = self.dataset.database.fetch_dataframes(*[str(query) for query in add_hints(queries, hint)])
+
+            for table, result in zip(missing_tables, results):
+                watermark = result.iloc[0, 0] if len(result) else None
+                # Empty tables have no watermark, which is a null value that is not equal to itself
+                watermarks[table] = None if pd.isnull(watermark) else watermark
+                if watermark_cache is not None:
+                    watermark_cache.set(str(table), watermarks[table])
+
+        return tuple(watermarks[table] for table in tables)
+
+    def _reaggregate_cached_result_set(self, watermarks):
+        """
+        Computes the result set of this query from a cached result set of the same query with a finer interval of its
+        datetime dimension, which contains all of the metrics of this query.
+
+        :param watermarks:
+            The current watermarks of the tables read by this query, see `_fetch_watermarks`.
+
+        :return:
+            A CachedResultSet or None if there is no such cached result set.
+        """
+        plan = self.plan
+        reaggregation = plan.reaggregation
+        if reaggregation is None:
+            return None
+
+        for finer_result_cache_key in reaggregation.finer_result_cache_keys:
+            cached = self._get_cached_result_set(finer_result_cache_key, watermarks)
+            if cached is None or not plan.metric_keys <= cached.metric_keys:
+                continue
+
+            data_frame = drop_metrics(cached.data_frame, cached.metric_keys - plan.metric_keys, [])
+            if not is_datetime64_dtype(data_frame.index.get_level_values(reaggregation.dimension_key)):
+                continue
+
+            data_frame = reaggregate_interval(
+                data_frame,
+                reaggregation.dimension_key,
+                reaggregation.interval_key,
+                self.dataset.database,
+                reaggregation.aggregations,
+            )
+            return CachedResultSet(
+                plan.metric_keys, len(data_frame), data_frame, cached.refreshed_at, cached.watermarks
+            )
+
+        return None
+
+    def _is_due_for_incremental_refresh(self, cached):
+        plan = self.plan
+        return (
+            plan.incremental_refresh is not None
+            and plan.query_metric_keys <= cached.metric_keys
+            and self.dataset.incremental_refresh_ttl <= self.dataset.result_cache.clock() - cached.refreshed_at
+        )
+
+    def _refresh_cached_result_set(self, cached, hint=None):
+        """
+        Refreshes a cached result set of this query incrementally. The partitions of the datetime dimension from the
+        watermark on are fetched by narrowing the range filter on the datetime dimension and are merged into the cached
+        result set.
+
+        :return:
+            The refreshed CachedResultSet or None if the result set has to be fetched completely.
+        """
+        plan = self.plan
+        refresh = plan.incremental_refresh
+
+        references = list(self._references)
+        data_frame = drop_metrics(cached.data_frame, cached.metric_keys - plan.query_metric_keys, references)
+        if not is_datetime64_dtype(data_frame.index.get_level_values(refresh.dimension_key)):
+            return None
+
+        watermark = find_watermark(
+            data_frame,
+            refresh.dimension_key,
+            refresh.interval_key,
+            self.dataset.incremental_refresh_window,
+            self.dataset.database,
         )
+        if watermark is None:
+            return None
+
+        range_filter = refresh.range_filter
+        if pd.Timestamp(range_filter.stop) < watermark:
+            # None of the partitions of the query can change anymore
+            return cached._replace(refreshed_at=self.dataset.result_cache.clock())
+
+        narrowed_filter = copy.copy(range_filter)
+        narrowed_filter.start = max(pd.Timestamp(range_filter.start), watermark).to_pydatetime()
+
+        max_rows_returned, fresh_data_frame = self._replace_filter(range_filter, narrowed_filter)._execute_queries(hint)
+        if max_rows_returned >= self.dataset.database.max_result_set_size:
+            return None
+
+        data_frame = merge_partitions(
+            data_frame, fresh_data_frame, refresh.dimension_key, watermark, refresh.aggregations
+        )
+        return CachedResultSet(
+            plan.query_metric_keys,
+            max(cached.max_rows_returned, max_rows_returned),
+            data_frame,
+            self.dataset.result_cache.clock(),
+            cached.watermarks,
+        )
+
+    @immutable
+    def _replace_filter(self, old_filter, new_filter):
+        self._filters = tuple(new_filter if fltr is old_filter else fltr for fltr in self._filters)
+
+    def _execute_queries(self, hint=None):
+        """
+        Executes the queries of this query builder and reduces their result sets into a single data frame.
+
+        :return:
+            Tuple(The largest number of rows returned by a query, the data frame)
+        """
+        plan = self.plan
+
+        if plan.totals_aggregations is not None:
+            return fetch_data_with_client_side_totals(
+                self.dataset.database,
+                add_hints(plan.queries, hint),
+                list(plan.dimensions),
+                list(plan.share_dimensions),
+                plan.totals_aggregations,
+            )
+
+        return fetch_data(
+            self.dataset.database,
+            add_hints(plan.queries, hint),
+            list(plan.dimensions),
+            list(plan.share_dimensions),
+            list(plan.reference_groups),
+        )
+
+    def _fetch_data_frame(self, hint=None):
+        """
+        Fetches the result sets of the queries and reduces them into a single data frame with references, operations
+        and pagination applied, ready to be transformed by widgets.
+
+        :return:
+            Tuple(The largest number of rows returned by a query, the data frame)
+        """
+        plan = self.plan
+
+        max_rows_returned, data_frame = self._fetch_result_set(hint)
 
         # Apply reference filters
         for reference in self._references:
             data_frame = apply_reference_filters(data_frame, reference)
 
         # Apply operations
-        for operation in operations:
-            for reference in [None] + self._references:
+        for operation in plan.operations:
+            for reference in [None, *self._references]:
                 df_key = alias_selector(reference_alias(operation, reference))
                 data_frame[df_key] = operation.apply(data_frame, reference)
 
-        data_frame = scrub_totals_from_share_results(data_frame, dimensions)
-        data_frame = special_cases.apply_operations_to_data_frame(operations, data_frame)
+        data_frame = scrub_totals_from_share_results(data_frame, list(plan.dimensions))
+        data_frame = special_cases.apply_operations_to_data_frame(plan.operations, data_frame)
 
         data_frame = paginate(
             data_frame,
-            self._widgets,
-            orders=self.orders,
+            list(self._widgets),
+            orders=list(plan.orders),
             limit=self._client_limit,
             offset=self._client_offset,
         )
 
-        # Apply transformations
-        widget_data = [
-            widget.transform(
-                data_frame,
-                dimensions,
-                self._references,
-                annotation_frame,
-            )
-            for widget in self._widgets
-        ]
+        return max_rows_returned, data_frame
 
-        return self._transform_for_return(widget_data, max_rows_returned=max_rows_returned)
+    def export_csv(self, file, hint=None, chunksize=EXPORT_CHUNK_SIZE):
+        """
+        Writes the result of this query in CSV format into a writable file object. The first widget of the query must
+        be a CSV widget.
+
+        When the query is a single SQL query whose result needs no further processing (no references, totals,
+        operations or client-side pagination) and the widget does not pivot, transpose or sort, the rows are streamed
+        from a cursor and formatted and written `chunksize` rows at a time. The export then runs in constant memory
+        and is not limited to `max_result_set_size`. Otherwise the whole result set is fetched like with `fetch`.
+
+        :param file:
+            A writable text file object.
+        :param hint:
+            A query hint label used with database vendors which support it. Adds a label comment to the query.
+        :param chunksize:
+            The maximum number of rows that are held in memory at once when streaming.
+        """
+        widget = self._widgets[0] if self._widgets else None
+        if not isinstance(widget, CSV):
+            raise QueryException("The first widget of the query must be a CSV widget to export it.")
+
+        plan = self._make_plan(limit_to_max_result_set_size=False)
+        dimensions = list(plan.dimensions)
+        queries = add_hints(plan.queries, hint)
+
+        is_streamable = (
+            widget.is_streamable
+            and len(queries) == 1
+            and not plan.operations
+            and self._client_limit is None
+            and self._client_offset is None
+        )
+        if not is_streamable:
+            _, data_frame = self._fetch_data_frame(hint)
+            file.write(widget.transform(data_frame, dimensions, list(self._references)))
+            return
+
+        chunks = self.dataset.database.fetch_dataframe_chunks(
+            str(queries[0]),
+            chunksize,
+            parse_dates=get_parse_dates_for_dimensions(dimensions),
+        )
+        widget.write_chunks(chunks, dimensions, file)
 
     def fetch_annotation(self):
         """
@@ -210,9 +795,14 @@ class DataSetQueryBuilder(ReferenceQueryBuilderMixin, WidgetQueryBuilderMixin, Q
             filters=annotation_alignment_dimension_filters,
         )
 
-        _, annotation_df = fetch_data(self.dataset.database, [annotation_query], [annotation.alignment_field])
+        def fetch_annotation_data_frame():
+            _, annotation_df = fetch_data(self.dataset.database, [annotation_query], [annotation.alignment_field])
+            return annotation_df
+
+        if annotation.cache is None:
+            return fetch_annotation_data_frame()
 
-        return annotation_df
+        return annotation.cache.get_or_set(str(annotation_query), fetch_annotation_data_frame)
 
     def fetch_query_filters(self, dimension_alias):
         """
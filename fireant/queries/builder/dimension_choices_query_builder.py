@@ -1,6 +1,18 @@
-from typing import List
+import bisect
+from typing import (
+    Dict,
+    Iterable,
+    List,
+)
 
+import numpy as np
+import pandas as pd
 from pypika import Order
+from pypika.enums import Matching
+from pypika.terms import (
+    BasicCriterion,
+    ValueWrapper,
+)
 
 from fireant.utils import alias_selector
 from .query_builder import (
@@ -8,12 +20,85 @@ from .query_builder import (
     add_hints,
     get_column_names,
 )
-from ..execution import fetch_data
+from ..execution import (
+    fetch_data,
+    get_parse_dates_for_dimensions,
+    reduce_result_set,
+    truncate_result_set,
+)
 from ..field_helper import make_term_for_field
 from ..finders import find_joins_for_tables
 from ..sql_transformer import make_slicer_query
 from ...formats import display_value
 
+LIKE_ESCAPE_CHAR = "!"
+DEFAULT_SEARCH_LIMIT = 50
+
+
+class LikeWithEscape(BasicCriterion):
+    """
+    A LIKE criterion with an explicit ESCAPE character, so that wildcards in the pattern can be matched literally. The
+    ESCAPE clause is used instead of relying on a default escape character since that differs between databases.
+    """
+
+    def __init__(self, term, pattern):
+        super().__init__(Matching.like, term, ValueWrapper(pattern))
+
+    def get_sql(self, **kwargs):
+        return "{criterion} ESCAPE '{escape_char}'".format(
+            criterion=super().get_sql(**kwargs), escape_char=LIKE_ESCAPE_CHAR
+        )
+
+
+def make_like_prefix_pattern(prefix: str) -> str:
+    for char in (LIKE_ESCAPE_CHAR, "%", "_"):
+        prefix = prefix.replace(char, LIKE_ESCAPE_CHAR + char)
+    return prefix + "%"
+
+
+class DimensionChoices:
+    """
+    The choices fetched for a dimension, as stored in the choices cache of a dataset. A sorted index of the raw choice
+    values is built the first time the choices are searched by prefix, so that searching only requires a binary search.
+    """
+
+    def __init__(self, choices: pd.Series, max_rows_returned: int):
+        """
+        :param choices:
+            A series of the choice display values indexed by the raw choice values.
+        :param max_rows_returned:
+            The number of rows returned by the query for the choices.
+        """
+        self.choices = choices
+        self.max_rows_returned = max_rows_returned
+        self._keys = None
+        self._positions = None
+
+    def _build_index(self):
+        keys = np.array([str(value) for value in self.choices.index], dtype=object)
+        self._positions = np.argsort(keys, kind="stable")
+        self._keys = keys[self._positions].tolist()
+
+    def search(self, prefix: str, limit: int = None) -> pd.Series:
+        """
+        :param prefix:
+            The prefix that the raw choice values must start with. The comparison is case-sensitive.
+        :param limit:
+            (Optional) The maximum number of choices to return.
+        :return:
+            The matching choices, in the same order as in the cached choices.
+        """
+        if self._keys is None:
+            self._build_index()
+
+        start = bisect.bisect_left(self._keys, prefix)
+        end = start
+        while end < len(self._keys) and self._keys[end].startswith(prefix):
+            end += 1
+
+        positions = np.sort(self._positions[start:end])[:limit]
+        return self.choices.iloc[positions]
+
 
 class DimensionChoicesQueryBuilder(QueryBuilder):
     """
@@ -24,12 +109,12 @@ class DimensionChoicesQueryBuilder(QueryBuilder):
         super().__init__(dataset)
 
         self.hint_table = getattr(dimension, "hint_table", None)
-        self._dimensions.append(dimension)
+        self._dimensions += (dimension,)
 
         # TODO remove after 3.0.0
         display_alias = dimension.alias + "_display"
         if display_alias in dataset.fields:
-            self._dimensions.append(dataset.fields[display_alias])
+            self._dimensions += (dataset.fields[display_alias],)
 
     def _extract_hint_filters(self):
         """
@@ -101,6 +186,7 @@ class DimensionChoicesQueryBuilder(QueryBuilder):
                 joins=self.dataset.joins,
                 dimensions=dimensions,
                 filters=filters,
+                schema=self.dataset.schema,
             )
             .limit(self._query_limit)
             .offset(self._query_offset)
@@ -113,20 +199,7 @@ class DimensionChoicesQueryBuilder(QueryBuilder):
 
         return [query]
 
-    def fetch(self, hint=None, force_include=()) -> List[str]:
-        """
-        Fetch the data for this query and transform it into the widgets.
-
-        :param hint:
-            For database vendors that support it, add a query hint to collect analytics on the queries triggered by
-            fireant.
-        :param force_include:
-            A list of dimension values to include in the result set. This can be used to avoid having necessary results
-            cut off due to the pagination.  These results will be returned at the head of the results.
-        :return:
-            A list of dict (JSON) objects containing the widget configurations.
-        """
-        query = add_hints(self.sql, hint)[0]
+    def _make_terms_for_choices(self):
         dimension = self.dimensions[0]
         alias_definition = dimension.definition.as_(alias_selector(dimension.alias))
         dimension_definition = dimension.definition
@@ -135,6 +208,12 @@ class DimensionChoicesQueryBuilder(QueryBuilder):
             alias_definition = alias_definition.replace_table(alias_definition.table, self.hint_table)
             dimension_definition = dimension.definition.replace_table(dimension_definition.table, self.hint_table)
 
+        return alias_definition, dimension_definition
+
+    def _make_choices_query(self, force_include=(), search_prefix=None, search_limit=None):
+        query = self.sql[0]
+        alias_definition, dimension_definition = self._make_terms_for_choices()
+
         if force_include:
             include = self.dataset.database.to_char(dimension_definition).isin([str(x) for x in force_include])
 
@@ -144,10 +223,15 @@ class DimensionChoicesQueryBuilder(QueryBuilder):
         # Filter out NULL values from choices
         query = query.where(dimension_definition.notnull())
 
+        if search_prefix is not None:
+            pattern = make_like_prefix_pattern(search_prefix)
+            query = query.where(LikeWithEscape(self.dataset.database.to_char(dimension_definition), pattern))
+            query = query.limit(search_limit)
+
         # Order by the dimension definition that the choices are for
-        query = query.orderby(alias_definition)
-        max_rows_returned, data = fetch_data(self.dataset.database, [query], self.dimensions)
+        return query.orderby(alias_definition)
 
+    def _make_choices(self, data, max_rows_returned) -> DimensionChoices:
         if len(data.index.names) > 1:
             display_alias = data.index.names[1]
             data.reset_index(display_alias, inplace=True)
@@ -159,9 +243,149 @@ class DimensionChoicesQueryBuilder(QueryBuilder):
 
         dimension_display = self.dimensions[-1]
         choices = choices.map(lambda raw: display_value(raw, dimension_display) or raw)
-        return self._transform_for_return(choices, max_rows_returned=max_rows_returned)
+        return DimensionChoices(choices, max_rows_returned)
+
+    def _make_choices_cache_key(self, force_include=(), search_prefix=None, search_limit=None) -> tuple:
+        """
+        Returns the key of the choices in the choices cache of the dataset. The key is made from the state of this
+        builder instead of the choices query, since building the query for a dimension with a hint table fetches the
+        columns of the hint table.
+        """
+        return (
+            tuple(dimension.alias for dimension in self.dimensions),
+            tuple(repr(filter_) for filter_ in self.filters),
+            str(self.hint_table) if self.hint_table is not None else None,
+            self._query_limit,
+            self._query_offset,
+            tuple(str(value) for value in force_include),
+            search_prefix,
+            search_limit,
+        )
+
+    def _fetch_choices(self, hint=None, **kwargs) -> DimensionChoices:
+        """
+        Fetches the choices, or returns them from the choices cache of the dataset when they were already fetched for
+        the same builder state. The keyword arguments are passed to `_make_choices_query`.
+        """
+
+        def fetch_choices():
+            query = add_hints([self._make_choices_query(**kwargs)], hint)[0]
+            max_rows_returned, data = fetch_data(self.dataset.database, [query], self.dimensions)
+            return self._make_choices(data, max_rows_returned)
+
+        cache = self.dataset.choices_cache
+        if cache is None:
+            return fetch_choices()
+
+        return cache.get_or_set(self._make_choices_cache_key(**kwargs), fetch_choices)
+
+    def fetch(self, hint=None, force_include=()) -> List[str]:
+        """
+        Fetch the data for this query and transform it into the widgets.
+
+        :param hint:
+            For database vendors that support it, add a query hint to collect analytics on the queries triggered by
+            fireant.
+        :param force_include:
+            A list of dimension values to include in the result set. This can be used to avoid having necessary results
+            cut off due to the pagination.  These results will be returned at the head of the results.
+        :return:
+            A list of dict (JSON) objects containing the widget configurations.
+        """
+        choices = self._fetch_choices(hint, force_include=force_include)
+        return self._transform_for_return(choices.choices.copy(), max_rows_returned=choices.max_rows_returned)
+
+    def search(self, prefix: str, limit: int = DEFAULT_SEARCH_LIMIT, hint=None) -> List[str]:
+        """
+        Search the choices whose raw value starts with a prefix, e.g. for a typeahead in a filter.
+
+        When all of the choices for the same filters are in the choices cache of the dataset, they are searched in
+        memory. Otherwise the choices are fetched with a query that filters them with `LIKE 'prefix%'` and is limited
+        to `limit` rows.
+
+        :param prefix:
+            The prefix that the choices must start with.
+        :param limit:
+            The maximum number of choices to return.
+        :param hint:
+            For database vendors that support it, add a query hint to collect analytics on the queries triggered by
+            fireant.
+        :return:
+            The matching choices, ordered by their value.
+        """
+        cache = self.dataset.choices_cache
+        if cache is not None and self._query_limit is None and not self._query_offset:
+            all_choices = cache.get(self._make_choices_cache_key())
+
+            # The cached choices can only be searched when they were not cut off by the max result set size
+            if all_choices is not None and all_choices.max_rows_returned < self.dataset.database.max_result_set_size:
+                choices = all_choices.search(prefix, limit)
+                return self._transform_for_return(choices.copy(), max_rows_returned=len(choices))
+
+        choices = self._fetch_choices(hint, search_prefix=prefix, search_limit=limit)
+        return self._transform_for_return(choices.choices.copy(), max_rows_returned=choices.max_rows_returned)
 
     def __repr__(self):
         return ".".join(
             ["dataset", self._dimensions[0].alias, "choices"] + ["filter({})".format(repr(f)) for f in self._filters]
         )
+
+
+def fetch_choices_for_dimensions(
+    choices_builders: Iterable[DimensionChoicesQueryBuilder], hint=None, force_include: Dict[str, Iterable] = None
+) -> dict:
+    """
+    Fetches the choices of several dimensions of the same dataset. The queries for the choices that are not in the
+    choices cache of the dataset are executed together on a single connection, instead of one connection per dimension.
+
+    :param choices_builders:
+        The choices query builders of the dimensions.
+    :param hint:
+        For database vendors that support it, add a query hint to collect analytics on the queries triggered by
+        fireant.
+    :param force_include:
+        (Optional) A dict mapping the aliases of dimensions to a list of values to include in their choices. These are
+        returned at the head of the choices, as with the `force_include` argument of `fetch`.
+    :return:
+        A dict mapping the aliases of the dimensions to their choices.
+    """
+    choices_builders = list(choices_builders)
+    force_include = force_include or {}
+
+    choices, queries = {}, {}
+    for builder in choices_builders:
+        alias = builder.dimensions[0].alias
+        cache_key = builder._make_choices_cache_key(force_include=force_include.get(alias, ()))
+
+        cache = builder.dataset.choices_cache
+        cached_choices = cache.get(cache_key) if cache is not None else None
+        if cached_choices is not None:
+            choices[alias] = cached_choices
+        else:
+            query = builder._make_choices_query(force_include=force_include.get(alias, ()))
+            queries[alias] = (builder, query, cache_key)
+
+    if queries:
+        database = next(iter(queries.values()))[0].dataset.database
+        dimensions = [dimension for builder, _, _ in queries.values() for dimension in builder.dimensions]
+        hinted_queries = add_hints([query for _, query, _ in queries.values()], hint)
+        data_frames = database.fetch_dataframes(
+            *[str(query) for query in hinted_queries], parse_dates=get_parse_dates_for_dimensions(dimensions)
+        )
+
+        for (alias, (builder, _, cache_key)), data_frame in zip(queries.items(), data_frames):
+            max_rows_returned = truncate_result_set(database, data_frame)
+            data = reduce_result_set([data_frame], (), builder.dimensions, ())
+            choices[alias] = builder._make_choices(data, max_rows_returned)
+
+            if builder.dataset.choices_cache is not None:
+                builder.dataset.choices_cache.set(cache_key, choices[alias])
+
+    results = {}
+    for builder in choices_builders:
+        alias = builder.dimensions[0].alias
+        results[alias] = builder._transform_for_return(
+            choices[alias].choices.copy(), max_rows_returned=choices[alias].max_rows_returned
+        )
+
+    return results
@@ -16,7 +16,7 @@ class DimensionLatestQueryBuilder(QueryBuilder):
 
     @immutable
     def __call__(self, dimension: Field, *dimensions: Field):
-        self._dimensions += [dimension] + list(dimensions)
+        self._dimensions += (dimension, *dimensions)
 
     @property
     def sql(self):
@@ -37,6 +37,7 @@ class DimensionLatestQueryBuilder(QueryBuilder):
             base_table=self.table,
             joins=self.dataset.joins,
             dimensions=self.dimensions,
+            schema=self.dataset.schema,
         )
         return [query]
 
@@ -1,3 +1,4 @@
+import copy
 from typing import TYPE_CHECKING, Union
 
 from pypika import Order
@@ -65,8 +66,8 @@ class QueryBuilder(object):
         """
         self.dataset = dataset
         self.table = dataset.table
-        self._dimensions = []
-        self._filters = []
+        self._dimensions = ()
+        self._filters = ()
         self._orders = None
         self._client_limit = None
         self._client_offset = None
@@ -75,15 +76,21 @@ class QueryBuilder(object):
 
     # noinspection PyDefaultArgument
     def __deepcopy__(self, memodict={}):
-        fields = [d for d in self._dimensions]
-        if self._orders is not None:
-            fields += [field for (field, _) in self._orders]
+        """
+        The state of a query builder is kept in tuples of dimensions, filters, orders, etc., which are never changed
+        once set. Builder functions replace the tuples they add to instead. Therefore copies of a query builder, such as
+        the ones made by builder functions, share all of the state with the original, which makes chaining builder
+        functions cheap.
 
-        for field in fields:
-            field = find_field_in_modified_field(field)
-            memodict[id(field)] = field
+        When the query builder is copied as part of copying its dataset, e.g. the query builders set on a dataset, the
+        state is copied as well, so that the copy refers to the copied dataset.
+        """
+        if id(self.dataset) in memodict:
+            return deepcopy(self, memodict)
 
-        return deepcopy(self, memodict)
+        result = copy.copy(self)
+        memodict[id(self)] = result
+        return result
 
     @immutable
     def dimension(self, *dimensions):
@@ -97,7 +104,7 @@ class QueryBuilder(object):
         """
         validate_fields(dimensions, self.dataset)
         aliases = {dimension.alias for dimension in self._dimensions}
-        self._dimensions += [dimension for dimension in dimensions if dimension.alias not in aliases]
+        self._dimensions += tuple(dimension for dimension in dimensions if dimension.alias not in aliases)
 
     @immutable
     def filter(self, *filters):
@@ -110,7 +117,7 @@ class QueryBuilder(object):
             A copy of the query with the filters added.
         """
         validate_fields([fltr.field for fltr in filters], self.dataset)
-        self._filters += [f for f in filters]
+        self._filters += filters
 
     @immutable
     def orderby(self, field: Field, orientation: Order = None):
@@ -125,10 +132,10 @@ class QueryBuilder(object):
         validate_fields([field], self.dataset)
 
         if self._orders is None:
-            self._orders = []
+            self._orders = ()
 
         if field is not None:
-            self._orders += [(field, orientation)]
+            self._orders += ((field, orientation),)
 
     @immutable
     def limit_query(self, limit):
@@ -256,13 +263,17 @@ class QueryBuilder(object):
         max_rows_returned, data = fetch_data(self.dataset.database, queries, self.dimensions)
         return self._transform_for_return(data, max_rows_returned=max_rows_returned)
 
-    def _apply_pagination(self, query):
+    def _apply_pagination(self, query, limit_to_max_result_set_size=True):
         # Some platforms require an order by when pagination is used. Therefore, if there is no ordering set,
         # we just default to the first column.
         if not self.orders:
             query = query.orderby(1)
 
-        query = query.limit(min(self._query_limit or float('inf'), self.dataset.database.max_result_set_size))
+        if limit_to_max_result_set_size:
+            query = query.limit(min(self._query_limit or float('inf'), self.dataset.database.max_result_set_size))
+        elif self._query_limit:
+            query = query.limit(self._query_limit)
+
         return query.offset(self._query_offset)
 
     def _transform_for_return(self, widget_data, **metadata) -> Union[dict, list]:
@@ -281,7 +292,7 @@ class ReferenceQueryBuilderMixin:
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self._references = []
+        self._references = ()
 
     @immutable
     def reference(self, *references):
@@ -305,7 +316,7 @@ class WidgetQueryBuilderMixin:
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self._widgets = []
+        self._widgets = ()
 
     def _validate(self):
         for widget in self._widgets:
@@ -0,0 +1,150 @@
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class QueryLog:
+    """
+    A thread-safe log of the queries fetched from the result cache of a dataset, which counts how often each query is
+    fetched. Queries are identified by their fingerprint and the latest query builder of each query is kept, so that
+    the most frequent queries can be replayed to warm the result cache.
+
+    Like caches, the query log is shared by all copies of its dataset and only its settings are kept when pickled.
+    """
+
+    def __init__(self, max_size):
+        """
+        :param max_size:
+            The maximum number of queries in the log. When full, the least frequent query is dropped.
+        """
+        self.max_size = max_size
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def record(self, fingerprint, query_builder):
+        """
+        Counts a fetch of a query.
+
+        :param fingerprint:
+            A hashable key identifying the query.
+        :param query_builder:
+            The query builder of the query.
+        """
+        with self._lock:
+            count, _ = self._entries.get(fingerprint, (0, None))
+            if not count and len(self._entries) >= self.max_size:
+                del self._entries[min(self._entries, key=lambda key: self._entries[key][0])]
+
+            self._entries[fingerprint] = (count + 1, query_builder)
+
+    def most_frequent(self, n):
+        """
+        :return:
+            The query builders of the `n` most frequent queries, the most frequent first.
+        """
+        with self._lock:
+            entries = sorted(self._entries.values(), key=lambda entry: entry[0], reverse=True)
+
+        return [query_builder for _, query_builder in entries[:n]]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memodict={}):
+        return self
+
+    def __getstate__(self):
+        return {"max_size": self.max_size}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+
+def warm_result_cache(dataset, top_n, hint=None):
+    """
+    Replays the most frequent queries in the query log of a dataset, which fetches their result sets into the result
+    cache of the dataset. A query which fails is logged and skipped.
+
+    :param dataset:
+        A dataset with a result cache and a query log.
+    :param top_n:
+        The number of queries to replay.
+    :param hint:
+        A query hint label used with database vendors which support it.
+    :return:
+        The number of queries replayed successfully.
+    """
+    warmed = 0
+    for query_builder in dataset.query_log.most_frequent(top_n):
+        try:
+            query_builder.warm_result_cache(hint)
+        except Exception:
+            # The query builder is not serialized, since compiling its plan could be what failed
+            logger.exception("Could not warm the result cache with %r", query_builder)
+            continue
+
+        warmed += 1
+
+    return warmed
+
+
+class CacheWarmer:
+    """
+    Warms the result cache of a dataset in a background thread, by replaying the most frequent queries in its query
+    log every `interval` seconds. Applications which need to warm the cache at specific times, e.g. before business
+    hours, can call `DataSet.warm_result_cache` from their own scheduler instead.
+    """
+
+    def __init__(self, dataset, top_n=10, interval=3600, hint=None):
+        """
+        :param dataset:
+            A dataset with a result cache and a query log.
+        :param top_n:
+            The number of queries to replay each time.
+        :param interval:
+            The number of seconds between warming the result cache.
+        :param hint:
+            A query hint label used with database vendors which support it.
+        """
+        self.dataset = dataset
+        self.top_n = top_n
+        self.interval = interval
+        self.hint = hint
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """
+        Starts warming the result cache, the first time right away. Nothing happens if the warmer is already running.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="fireant-cache-warmer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while True:
+            try:
+                warm_result_cache(self.dataset, self.top_n, self.hint)
+            except Exception:
+                # The warmer keeps running, so that the result cache is warmed again after a temporary failure
+                logger.exception("Could not warm the result cache")
+
+            if self._stopped.wait(self.interval):
+                return
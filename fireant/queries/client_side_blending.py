@@ -0,0 +1,217 @@
+import operator
+from functools import reduce
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+from pypika import (
+    Order,
+    functions as fn,
+)
+from pypika.enums import Arithmetic
+from pypika.terms import (
+    ArithmeticExpression,
+    Negative,
+    ValueWrapper,
+)
+
+from fireant.dataset.fields import Field
+from fireant.dataset.modifiers import DimensionModifier
+from fireant.exceptions import DataSetException
+from fireant.reference_helpers import reference_type_alias
+from fireant.utils import alias_selector
+from .finders import find_field_in_modified_field
+
+ARITHMETIC_OPERATORS = {
+    Arithmetic.add: operator.add,
+    Arithmetic.sub: operator.sub,
+    Arithmetic.mul: operator.mul,
+    Arithmetic.div: operator.truediv,
+}
+
+CROSS_JOIN_KEY = "$__cross_join_key"
+
+
+def blender_join_aliases(dimensions, base_field_map, join_field_map):
+    """
+    Returns a list of tuples shaped as the alias of a mapped dimension in the base dataset and its alias in the joined
+    dataset, for each dimension mapped between the datasets via `DataSetBlender.dimension_map`.
+    """
+    join_aliases = []
+    for dimension in dimensions:
+        dimension = find_field_in_modified_field(dimension)
+        # dimension has to be in both field maps:
+        if dimension not in base_field_map or dimension not in join_field_map:
+            continue
+
+        join_aliases.append(
+            tuple(alias_selector(field_map[dimension].alias) for field_map in [base_field_map, join_field_map])
+        )
+
+    return join_aliases
+
+
+def _subquery_column(index, column):
+    return "sq{}.{}".format(index, column)
+
+
+def _cross_join(left, right):
+    return (
+        left.assign(**{CROSS_JOIN_KEY: 0})
+        .merge(right.assign(**{CROSS_JOIN_KEY: 0}), on=CROSS_JOIN_KEY)
+        .drop(columns=CROSS_JOIN_KEY)
+    )
+
+
+def _join_data_frames(dimensions, field_maps, data_frames):
+    """
+    Joins the data frames of the dataset queries the same way as the subqueries of a blended SQL query, which is a left
+    join of each data frame to the first one on the mapped dimensions. The joins are hash joins on the dimension
+    columns. Rows with nulls in the join columns of the joined data frame are dropped first, since NULL never equals
+    NULL in SQL.
+    """
+    (base_frame, *join_frames), (base_field_map, *join_field_maps) = data_frames, field_maps
+
+    blended = base_frame
+    for index, (join_frame, join_field_map) in enumerate(zip(join_frames, join_field_maps), start=1):
+        if join_frame is None:
+            continue
+
+        join_aliases = blender_join_aliases(dimensions, base_field_map, join_field_map)
+        if not join_aliases:
+            # No dimensions mapped
+            blended = _cross_join(blended, join_frame)
+            continue
+
+        left_on = [_subquery_column(0, alias) for alias, _ in join_aliases]
+        right_on = [_subquery_column(index, alias) for _, alias in join_aliases]
+        blended = blended.merge(join_frame.dropna(subset=right_on), how="left", left_on=left_on, right_on=right_on)
+
+    return blended
+
+
+def _find_subquery_column(field, field_maps, data_frames, reference) -> Optional[str]:
+    unmodified_field = find_field_in_modified_field(field)
+
+    # search for the field in each field map to determine which subquery it is in
+    for index, (data_frame, field_map) in enumerate(zip(data_frames, field_maps)):
+        if data_frame is None or unmodified_field not in field_map:
+            continue
+
+        mapped_field = field_map[unmodified_field]
+        return _subquery_column(index, alias_selector(reference_type_alias(mapped_field, reference)))
+
+    return None
+
+
+def evaluate_blender_field(term, blended, field_maps, data_frames, reference=None):
+    """
+    Evaluates the definition of a blender field on the joined data frame of the dataset queries. Fields which are
+    mapped to a dataset field are read from the column selected for them. The definitions of complex blender fields are
+    evaluated as vectorized operations on those columns.
+
+    :param term:
+        A blender field or a pypika term from the definition of a complex blender field.
+    :param blended:
+        The joined data frame of the dataset queries.
+    :param field_maps:
+        The field maps of the datasets, in the same order as `data_frames`.
+    :param data_frames:
+        The data frames of the dataset queries. Used for determining which datasets were queried.
+    :param reference:
+        (Optional) The reference of the query set being blended.
+    :return:
+        A series or a scalar value.
+    """
+
+    def evaluate(term_):
+        return evaluate_blender_field(term_, blended, field_maps, data_frames, reference)
+
+    if isinstance(term, (Field, DimensionModifier)):
+        column = _find_subquery_column(term, field_maps, data_frames, reference)
+        if column is not None:
+            return blended[column]
+
+        return evaluate(term.definition)
+
+    if isinstance(term, ArithmeticExpression) and term.operator in ARITHMETIC_OPERATORS:
+        value = ARITHMETIC_OPERATORS[term.operator](evaluate(term.left), evaluate(term.right))
+
+        if term.operator is Arithmetic.div and isinstance(value, pd.Series):
+            # Division by zero results in NULL instead of infinity
+            value = value.replace([np.inf, -np.inf], np.nan)
+
+        return value
+
+    if isinstance(term, ValueWrapper):
+        return term.value
+
+    if isinstance(term, Negative):
+        return -evaluate(term.term)
+
+    if isinstance(term, fn.Coalesce):
+        values = [evaluate(arg) for arg in term.args]
+        return reduce(lambda value, other: value.fillna(other) if isinstance(value, pd.Series) else value, values)
+
+    if isinstance(term, fn.NullIf):
+        value, other = [evaluate(arg) for arg in term.args]
+        return value.where(value != other)
+
+    raise DataSetException(
+        "The definition '{}' is not supported when blending datasets client-side.".format(term.get_sql(quote_char=""))
+    )
+
+
+def blend_data_frames(dimensions, metrics, orders, field_maps, data_frames: List[pd.DataFrame], reference=None):
+    """
+    Blends the result sets of the queries of each dataset in a query set into a single data frame. The data frame has
+    the same columns and order as the result set of the blended SQL query for the same query set.
+
+    :param dimensions:
+        The selected blender dimensions.
+    :param metrics:
+        The selected blender metrics.
+    :param orders:
+        A list of tuples shaped as field and orientation to sort the data frame by.
+    :param field_maps:
+        The field maps of the datasets, in the same order as `data_frames`.
+    :param data_frames:
+        The result sets of the dataset queries. The first one is the result set of the primary dataset.
+    :param reference:
+        (Optional) The reference of the query set.
+    :return:
+        The blended data frame.
+    """
+    data_frames = [
+        (
+            None
+            if data_frame is None
+            else data_frame.rename(columns=lambda column, index=index: _subquery_column(index, column))
+        )
+        for index, data_frame in enumerate(data_frames)
+    ]
+    blended = _join_data_frames(dimensions, field_maps, data_frames)
+
+    result = pd.DataFrame(index=blended.index)
+    for dimension in dimensions:
+        result[alias_selector(dimension.alias)] = evaluate_blender_field(dimension, blended, field_maps, data_frames)
+    for metric in metrics:
+        result[alias_selector(reference_type_alias(metric, reference))] = evaluate_blender_field(
+            metric, blended, field_maps, data_frames, reference
+        )
+
+    sort_columns, ascending = [], []
+    for field, orientation in orders:
+        is_dimension = any(dimension is field for dimension in dimensions)
+        # Don't add the reference type to dimensions
+        sort_columns.append(alias_selector(field.alias if is_dimension else reference_type_alias(field, reference)))
+        ascending.append(orientation != Order.desc)
+
+    if not sort_columns and len(result.columns):
+        # The same as the default ordering by the first column in queries
+        sort_columns, ascending = [result.columns[0]], [True]
+
+    if sort_columns:
+        result = result.sort_values(sort_columns, ascending=ascending, kind="mergesort")
+
+    return result.reset_index(drop=True)
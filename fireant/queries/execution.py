@@ -1,4 +1,6 @@
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Iterable, List, Tuple, Type
 
 import pandas as pd
@@ -7,14 +9,25 @@ from pypika.queries import QueryBuilder
 from fireant.database import Database
 from fireant.dataset.fields import DataType, Field
 from fireant.dataset.references import calculate_delta_percent
-from fireant.dataset.totals import get_totals_marker_for_dtype
+from fireant.dataset.totals import get_totals_marker_for_dtype, to_typed_totals
 from fireant.utils import alias_selector, chunks
 from .finders import find_field_in_modified_field, find_totals_dimensions
 from .pandas_workaround import df_subtract
+from .totals_helper import make_totals_data_frames
 from ..dataset.modifiers import RollupValue
 
 logger = logging.getLogger(__name__)
 
+# The maximum number of threads of the thread pool shared by concurrent widget transforms
+WIDGET_TRANSFORM_MAX_WORKERS = 4
+# The maximum number of threads of the thread pool used for fetching annotations concurrently with the dataset queries
+ANNOTATION_FETCH_MAX_WORKERS = 4
+# The maximum number of threads of the thread pool used for executing the queries of blended datasets concurrently
+BLENDER_FETCH_MAX_WORKERS = 4
+
+_executors = {}
+_executors_lock = threading.Lock()
+
 # Passing in an empty dictionary as format option to pandas' parse_dates causes errors to be ignored instead of
 # being coerced into NaT.
 PANDAS_TO_DATETIME_FORMAT = {}
@@ -26,9 +39,78 @@ def fetch_data(
     dimensions: Iterable[Field],
     share_dimensions: Iterable[Field] = (),
     reference_groups=(),
+    typed_totals: bool = False,
 ) -> Tuple[int, pd.DataFrame]:
     queries = [str(query) for query in queries]
+    pandas_parse_dates = get_parse_dates_for_dimensions(dimensions)
+
+    results = database.fetch_dataframes(*queries, parse_dates=pandas_parse_dates)
+    return _reduce_fetched_result_sets(
+        database, results, dimensions, share_dimensions, reference_groups, typed_totals=typed_totals
+    )
+
+
+def fetch_data_with_client_side_totals(
+    database: Database,
+    queries: List[Type[QueryBuilder]],
+    dimensions: Iterable[Field],
+    share_dimensions: Iterable[Field],
+    totals_aggregations: dict,
+) -> Tuple[int, pd.DataFrame]:
+    """
+    The same as `fetch_data` for queries without references, except that only the first query, the base query, is
+    executed. The result sets of the totals queries are computed from the result set of the base query instead, unless
+    it was truncated to `max_result_set_size`.
+
+    :param totals_aggregations:
+        A dict mapping the alias selector of each metric to its aggregation. See
+        `fireant.queries.totals_helper.find_totals_aggregations`.
+    :return:
+        Tuple(The largest number of rows returned by a query, the data frame)
+    """
+    queries = [str(query) for query in queries]
+    pandas_parse_dates = get_parse_dates_for_dimensions(dimensions)
+
+    results = database.fetch_dataframes(queries[0], parse_dates=pandas_parse_dates)
+    if len(results[0]) < database.max_result_set_size:
+        totals_results = make_totals_data_frames(results[0], dimensions, share_dimensions, totals_aggregations)
+    else:
+        # The totals can not be computed from a truncated result set
+        totals_results = database.fetch_dataframes(*queries[1:], parse_dates=pandas_parse_dates) if queries[1:] else []
+
+    return _reduce_fetched_result_sets(database, [*results, *totals_results], dimensions, share_dimensions, ())
+
+
+def _reduce_fetched_result_sets(database, results, dimensions, share_dimensions, reference_groups, typed_totals=False):
+    max_rows_returned = 0
+    for result_df in results:
+        row_count = truncate_result_set(database, result_df)
+        if row_count > max_rows_returned:
+            max_rows_returned = row_count
+
+    logger.info('max_rows_returned', extra={'row_count': max_rows_returned, 'database': str(database)})
+    return max_rows_returned, reduce_result_set(
+        results, reference_groups, dimensions, share_dimensions, typed_totals=typed_totals
+    )
+
 
+def truncate_result_set(database: Database, result_df: pd.DataFrame) -> int:
+    """
+    Drops the rows of a result set above the max result set size of the database in place.
+
+    :return:
+        The number of rows in the result set before it was truncated.
+    """
+    row_count = len(result_df)
+    if row_count > database.max_result_set_size:
+        logger.warning('row_count_over_max', extra={'row_count': row_count, 'database': str(database)})
+        # drop all result rows above database.max_result_set_size in place
+        result_df.drop(result_df.index[database.max_result_set_size :], inplace=True)
+
+    return row_count
+
+
+def get_parse_dates_for_dimensions(dimensions: Iterable[Field]) -> dict:
     # Indicate which dimensions need to be parsed as date types
     # For this we create a dictionary with the dimension alias as key and PANDAS_TO_DATETIME_FORMAT as value
     pandas_parse_dates = {}
@@ -37,19 +119,7 @@ def fetch_data(
         if unmodified_dimension.data_type == DataType.date:
             pandas_parse_dates[alias_selector(unmodified_dimension.alias)] = PANDAS_TO_DATETIME_FORMAT
 
-    results = database.fetch_dataframes(*queries, parse_dates=pandas_parse_dates)
-    max_rows_returned = 0
-    for result_df in results:
-        row_count = len(result_df)
-        if row_count > max_rows_returned:
-            max_rows_returned = row_count
-        if row_count > database.max_result_set_size:
-            logger.warning('row_count_over_max', extra={'row_count': len(result_df), 'database': str(database)})
-            # drop all result rows above database.max_result_set_size in place
-            result_df.drop(result_df.index[database.max_result_set_size :], inplace=True)
-
-    logger.info('max_rows_returned', extra={'row_count': max_rows_returned, 'database': str(database)})
-    return max_rows_returned, reduce_result_set(results, reference_groups, dimensions, share_dimensions)
+    return pandas_parse_dates
 
 
 def reduce_result_set(
@@ -57,6 +127,7 @@ def reduce_result_set(
     reference_groups,
     dimensions: Iterable[Field],
     share_dimensions: Iterable[Field],
+    typed_totals: bool = False,
 ):
     """
     Reduces the result sets from individual queries into a single data frame. This effectively joins sets of references
@@ -66,6 +137,9 @@ def reduce_result_set(
     :param reference_groups: A list of groups of references (grouped by interval such as WoW, etc)
     :param dimensions: A list of dimensions, used for setting the index on the result data frame.
     :param share_dimensions: A list of dimensions from which the totals are used for calculating share operations.
+    :param typed_totals:
+        When true, the data frame is returned in the typed representation of totals instead of with totals markers. See
+        `fireant.dataset.totals.to_typed_totals`.
     :return:
     """
     # One result group for each rolled up dimension. Groups contain one member plus one for each reference type used.
@@ -106,7 +180,8 @@ def reduce_result_set(
 
         group_data_frames.append(merged_df)
 
-    return pd.concat(group_data_frames, sort=False).sort_index(na_position="first")
+    data_frame = pd.concat(group_data_frames, sort=False).sort_index(na_position="first")
+    return to_typed_totals(data_frame) if typed_totals else data_frame
 
 
 def _replace_rollup_constants_for_totals_markers(data_frame, dtypes):
@@ -163,3 +238,42 @@ def _make_reference_data_frame(base_df, ref_df, reference):
     # ref_delta_df = ref_delta_df.join(original_ref_df[ref_columns])
 
     return ref_delta_df
+
+
+def get_shared_executor(name, max_workers):
+    """
+    Returns a thread pool shared by all queries for the given purpose, which is created when it is first needed.
+
+    :param name: The purpose of the thread pool, which is also used as prefix of the thread names.
+    :param max_workers: The maximum number of threads of the thread pool.
+    :return: A ThreadPoolExecutor.
+    """
+    with _executors_lock:
+        if name not in _executors:
+            _executors[name] = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"fireant-{name}")
+
+        return _executors[name]
+
+
+def transform_widgets(widgets, data_frame, dimensions, references, annotation_frame=None, concurrent=False):
+    """
+    Transforms the result set data frame for each widget. The data frame is shared by all widgets, which only read
+    from it, so the transforms can run concurrently.
+
+    :param widgets: A list of widgets.
+    :param data_frame: The result set data frame.
+    :param dimensions: A list of dimensions that are being rendered.
+    :param references: A list of references that are being rendered.
+    :param annotation_frame: A data frame containing the annotation data.
+    :param concurrent: When true, the widgets are transformed on a thread pool shared by all queries.
+    :return: A list with the transformed data of each widget, in the same order as the widgets.
+    """
+
+    def transform(widget):
+        return widget.transform(data_frame, dimensions, references, annotation_frame)
+
+    if not concurrent or len(widgets) < 2:
+        return [transform(widget) for widget in widgets]
+
+    executor = get_shared_executor("widget-transform", WIDGET_TRANSFORM_MAX_WORKERS)
+    return list(executor.map(transform, widgets))
@@ -46,20 +46,22 @@ def find_required_tables_to_join(elements, base_table):
         A collection of tables required to execute a query,
     """
     return ordered_distinct_list(
-        [
-            table
-            for element in elements
-            # Need extra for-loop to incl. the `display_definition` from `UniqueDimension`
-            for attr in [_get_field_definition(element)]
-            # ... but then filter Nones since most elements do not have `display_definition`
-            if attr is not None
-            for table in attr.tables_
-            # Omit the base table from this list
-            if base_table != table
-        ]
+        [table for element in elements for table in find_tables_for_element(element, base_table)]
     )
 
 
+def find_tables_for_element(element, base_table):
+    """
+    Returns the tables, other than the base table, that a dataset element selects from.
+    """
+    definition = _get_field_definition(element)
+    if definition is None:
+        return []
+
+    # Omit the base table from this list
+    return [table for table in definition.tables_ if base_table != table]
+
+
 def find_joins_for_tables(joins, base_table, required_tables):
     """
     Given a set of tables required for a dataset query, this function finds the joins required for the query and
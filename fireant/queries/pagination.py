@@ -4,6 +4,7 @@ import pandas as pd
 from pandas.core.dtypes.common import is_datetime64_ns_dtype
 from pypika import Order
 
+from fireant.dataset.fields import Aggregation
 from fireant.utils import alias_selector
 
 
@@ -80,13 +81,25 @@ def _index_isnull(data_frame):
     return pd.isnull(data_frame.index)
 
 
-def _aggregate_dimension_groups(group):
-    # FIXME this should aggregate according to field definition, instead of sum/max
-    # Need a way to interpret definitions in python code in order to do that
-    if is_datetime64_ns_dtype(group):
-        # sum aggregation doesn't work on the datetime type so use max instead
-        return group.max()
-    return group.sum()
+def _aggregate_dimension_groups(dimension_groups, data_frame, orders):
+    """
+    Aggregates the values of each column for each group of dimension values. Columns of metrics that are ordered by are
+    aggregated according to the aggregation of the metric. Other columns are summed, except for dates which use the
+    max since sums don't work on the datetime type.
+    """
+    metric_aggregations = {alias_selector(field.alias): getattr(field, "aggregation", None) for field, _ in orders}
+
+    column_aggregations = {}
+    for column in data_frame.columns:
+        aggregation = metric_aggregations.get(column)
+        if isinstance(aggregation, Aggregation):
+            column_aggregations[column] = aggregation.reaggregation.name
+        elif is_datetime64_ns_dtype(data_frame[column]):
+            column_aggregations[column] = "max"
+        else:
+            column_aggregations[column] = "sum"
+
+    return dimension_groups.aggregate(column_aggregations)
 
 
 def _group_paginate(data_frame, start=None, end=None, orders=()):
@@ -115,7 +128,7 @@ def _group_paginate(data_frame, start=None, end=None, orders=()):
     ]
 
     if orders:
-        aggregated_df = dimension_groups.aggregate(_aggregate_dimension_groups)
+        aggregated_df = _aggregate_dimension_groups(dimension_groups, data_frame, orders)
         sort, ascending = _get_sorting_schema(orders)
         sorted_df = aggregated_df.sort_values(by=sort, ascending=ascending)
         sorted_dimension_values = tuple(sorted_df.index)[start:end]
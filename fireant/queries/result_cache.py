@@ -0,0 +1,292 @@
+import logging
+import threading
+from collections import namedtuple
+
+import pandas as pd
+
+from fireant.dataset.totals import DATE_TOTALS, is_totals
+from fireant.utils import alias_selector
+from .execution import get_shared_executor
+from .field_helper import make_term_for_field
+from .finders import find_field_in_modified_field
+from .sql_transformer import make_slicer_query_with_totals_and_references
+from .totals_helper import reaggregate
+
+logger = logging.getLogger(__name__)
+
+# The maximum number of stale result sets refreshed in the background at once, shared by all datasets
+REVALIDATE_MAX_WORKERS = 4
+
+# The result sets which are being refreshed in the background, by the id of their result cache and their key
+_revalidating = set()
+_revalidating_lock = threading.Lock()
+
+# For each datetime interval, the finer intervals which nest into it, from the coarsest to the finest. Weeks do not nest
+# into months, quarters or years.
+FINER_INTERVALS = {
+    "day": ("hour",),
+    "week": ("day", "hour"),
+    "month": ("day", "hour"),
+    "quarter": ("month", "day", "hour"),
+    "year": ("quarter", "month", "day", "hour"),
+}
+
+CachedResultSet = namedtuple(
+    "CachedResultSet", ["metric_keys", "max_rows_returned", "data_frame", "refreshed_at", "watermarks"]
+)
+CachedResultSet.__doc__ = """
+The reduced result set of a query in the result cache of a dataset, along with the keys of the metrics it contains, the
+time, according to the clock of the cache, when it was last fetched or refreshed and the watermarks of the tables it
+was fetched from at that time.
+"""
+
+Reaggregation = namedtuple(
+    "Reaggregation", ["dimension_key", "interval_key", "finer_result_cache_keys", "aggregations"]
+)
+Reaggregation.__doc__ = """
+How the result set of a query can be computed from the cached result set of the same query with a finer interval of
+its datetime dimension: the alias selector of the dimension, the interval of the query, the result cache keys of the
+query with each finer interval and the aggregations of the metrics.
+"""
+
+IncrementalRefresh = namedtuple("IncrementalRefresh", ["dimension_key", "interval_key", "range_filter", "aggregations"])
+IncrementalRefresh.__doc__ = """
+How the cached result set of a query can be refreshed incrementally: the alias selector of its first dimension, which
+is a datetime dimension, the interval of that dimension, the range filter on it which is narrowed to fetch the latest
+partitions, and the aggregations of the metrics when the totals of the datetime dimension need to be recomputed.
+"""
+
+
+def find_metric_keys(dimensions, metrics, orders):
+    """
+    Finds the keys of the metrics in the result set of a query, which are the selected metrics and the fields that are
+    only selected for ordering. The key of a metric is its alias and its SQL, so that metrics of different queries
+    with the same alias but a different definition are told apart.
+
+    :return:
+        A frozenset of tuples of the alias and the SQL of each metric.
+    """
+    dimension_aliases = {find_field_in_modified_field(dimension).alias for dimension in dimensions}
+    fields = [*metrics, *[field for field, _ in orders if field.alias not in dimension_aliases]]
+
+    return frozenset((field.alias, str(make_term_for_field(field))) for field in fields)
+
+
+def find_additional_metrics(fields, metrics, required_tables, schema):
+    """
+    Finds the metrics of a dataset which can be added to a query without changing its result set otherwise. These are
+    the metrics which do not need any tables to be joined other than those already joined by the query, since an
+    additional join could filter out or duplicate rows.
+
+    :param fields:
+        The fields of the dataset.
+    :param metrics:
+        The metrics selected in the query.
+    :param required_tables:
+        The tables joined by the query.
+    :param schema:
+        The compiled schema of the dataset.
+    :return:
+        A list of metrics.
+    """
+    selected_aliases = {metric.alias for metric in metrics}
+    required_tables = set(required_tables)
+
+    return [
+        field
+        for field in fields
+        if field.is_aggregate
+        and field.alias not in selected_aliases
+        and required_tables.issuperset(schema.find_tables_for_element(field))
+    ]
+
+
+def make_result_cache_key(
+    *, database, table, joins, dimensions, operations, filters, references, share_dimensions, required_tables, schema
+):
+    """
+    Makes the key of the result set of a query in the result cache of a dataset. The key is the canonical form of the
+    query without its metrics, so that queries which only differ in their metrics have the same key: the SQL of the
+    queries that would be executed without any metrics, which covers the dimensions, filters, references and totals,
+    and the tables joined by the query, since joins can change the rows that metrics are aggregated over.
+
+    :param required_tables:
+        The tables joined by the query, including the tables only needed by its metrics.
+    :return:
+        A hashable key.
+    """
+    queries = make_slicer_query_with_totals_and_references(
+        database=database,
+        table=table,
+        joins=joins,
+        dimensions=dimensions,
+        metrics=[],
+        operations=operations,
+        filters=filters,
+        references=references,
+        orders=[],
+        share_dimensions=share_dimensions,
+        schema=schema,
+    )
+
+    # Queries without dimensions would not select anything without metrics, which pypika serializes to an empty string
+    query_keys = tuple(str(query if query._selects else query.select(1)) for query in queries)
+    return query_keys, tuple(sorted(str(table) for table in required_tables))
+
+
+def drop_metrics(data_frame, metric_keys, references):
+    """
+    Drops the columns of metrics, including the columns of their references, from a result set.
+
+    :param data_frame:
+        A reduced result set.
+    :param metric_keys:
+        The keys of the metrics to drop, see `find_metric_keys`.
+    :param references:
+        The references of the query.
+    :return:
+        A copy of the data frame without the columns of the metrics.
+    """
+    suffixes = [""] + [
+        "_{}".format(alias) for reference in references for alias in (reference.alias, reference.reference_type.alias)
+    ]
+    columns = {alias_selector(alias) + suffix for alias, _ in metric_keys for suffix in suffixes}
+
+    return data_frame.drop(columns=[column for column in data_frame.columns if column in columns])
+
+
+def reaggregate_interval(data_frame, dimension_key, interval_key, database, aggregations):
+    """
+    Aggregates a result set with a datetime dimension into a coarser interval. The datetimes are truncated the same way
+    as the database truncates them and the metrics are aggregated again for each group of rows with the same truncated
+    datetime and values of the other dimensions. The totals of the datetime dimension are kept as they are.
+
+    :param data_frame:
+        A reduced result set.
+    :param dimension_key:
+        The alias selector of the datetime dimension.
+    :param interval_key:
+        The interval to aggregate into.
+    :param database:
+        The database of the dataset.
+    :param aggregations:
+        A dict mapping the alias selector of each metric to its aggregation.
+    :return:
+        The reduced result set with the coarser interval.
+    """
+    dimension_keys = list(data_frame.index.names)
+    data_frame = data_frame.reset_index()
+
+    datetimes = data_frame[dimension_key]
+    is_totals = datetimes == DATE_TOTALS
+    data_frame[dimension_key] = database.trunc_date_values(datetimes.mask(is_totals), interval_key).mask(
+        is_totals, datetimes
+    )
+
+    aggregated = reaggregate(data_frame, dimension_keys, aggregations)
+    metric_keys = [key for key in data_frame.columns if key in aggregations]
+    # The groups keep the order in which they first appear, so they are sorted like any other reduced result set
+    return aggregated[dimension_keys + metric_keys].set_index(dimension_keys).sort_index(na_position="first")
+
+
+def find_watermark(data_frame, dimension_key, interval_key, window, database):
+    """
+    Finds the watermark of a cached result set, from which on its partitions are refreshed. The partitions are the
+    rows for each value of the datetime dimension and the watermark is the start of the partition of the latest
+    datetime minus the refresh window.
+
+    :param data_frame:
+        A reduced result set.
+    :param dimension_key:
+        The alias selector of the datetime dimension.
+    :param interval_key:
+        The interval of the datetime dimension.
+    :param window:
+        A timedelta, the refresh window.
+    :param database:
+        The database of the dataset.
+    :return:
+        The watermark or None if the result set has no partitions.
+    """
+    datetimes = data_frame.index.get_level_values(dimension_key)
+    latest = datetimes[datetimes != DATE_TOTALS].max()
+    if pd.isnull(latest):
+        return None
+
+    return database.trunc_date_values(pd.Series([latest - window]), interval_key)[0]
+
+
+def merge_partitions(data_frame, fresh_data_frame, dimension_key, watermark, aggregations=None):
+    """
+    Replaces the partitions of a cached result set from the watermark on with the partitions of a result set fetched
+    for the datetimes from the watermark on. The totals of the datetime dimension can not be taken from either result
+    set, so they are recomputed from the merged rows.
+
+    :param data_frame:
+        The cached reduced result set.
+    :param fresh_data_frame:
+        The fetched reduced result set.
+    :param dimension_key:
+        The alias selector of the datetime dimension.
+    :param watermark:
+        The datetime from which on the partitions are replaced.
+    :param aggregations:
+        A dict mapping the alias selector of each metric to its aggregation. Required when the result set contains
+        totals of the datetime dimension.
+    :return:
+        The merged result set.
+    """
+    datetimes = data_frame.index.get_level_values(dimension_key)
+    fresh_datetimes = fresh_data_frame.index.get_level_values(dimension_key)
+
+    is_datetime_totals = datetimes == DATE_TOTALS
+    merged = pd.concat(
+        [
+            data_frame[~is_datetime_totals & ~(datetimes >= watermark)],
+            fresh_data_frame.loc[(fresh_datetimes != DATE_TOTALS) & (fresh_datetimes >= watermark), data_frame.columns],
+        ]
+    )
+
+    if not is_datetime_totals.any():
+        return merged
+
+    # The totals of the datetime dimension are the totals of all other dimensions as well, so they are aggregated from
+    # the rows without any totals
+    totals = reaggregate(merged[~is_totals(merged.index)].reset_index(drop=True), [], aggregations)
+    totals.index = data_frame.index[is_datetime_totals]
+    return pd.concat([merged, totals[merged.columns]])
+
+
+def revalidate_in_background(result_cache, result_cache_key, revalidate):
+    """
+    Refreshes a stale result set in the background on a thread pool shared by all datasets. A result set is not
+    refreshed if it is already being refreshed or if `REVALIDATE_MAX_WORKERS` result sets are already being refreshed,
+    so that expired dashboards do not flood the database with refreshes.
+
+    :param result_cache:
+        The result cache of the dataset.
+    :param result_cache_key:
+        The key of the result set.
+    :param revalidate:
+        A function without arguments which fetches the result set into the result cache.
+    :return:
+        True if the result set is refreshed, otherwise False.
+    """
+    key = (id(result_cache), result_cache_key)
+    with _revalidating_lock:
+        if key in _revalidating or len(_revalidating) >= REVALIDATE_MAX_WORKERS:
+            return False
+
+        _revalidating.add(key)
+
+    def run():
+        try:
+            revalidate()
+        except Exception:
+            logger.exception("Could not refresh a stale result set")
+        finally:
+            with _revalidating_lock:
+                _revalidating.discard(key)
+
+    get_shared_executor("result-cache-revalidate", REVALIDATE_MAX_WORKERS).submit(run)
+    return True
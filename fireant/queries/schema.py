@@ -0,0 +1,97 @@
+from toposort import toposort_flatten
+
+from fireant.dataset.modifiers import DimensionModifier
+from fireant.exceptions import DataSetException
+from fireant.utils import ordered_distinct_list
+from .finders import (
+    MissingTableJoinException,
+    find_joins_for_tables,
+    find_tables_for_element,
+)
+
+
+class DataSetSchema:
+    """
+    The compiled schema of a dataset. It holds everything about the fields and joins of a dataset that is needed for
+    planning the joins of its queries, so that it is computed once instead of for every query:
+
+    - the tables each field selects from, other than the base table
+    - for each joined table, the joins needed to join it, including the joins those depend on
+    - the position of each join in a topological order of all joins
+
+    Joins which can not be joined, because of a missing or circular join, are kept with the exception to raise when
+    they are required by a query.
+    """
+
+    def __init__(self, table, joins, fields):
+        """
+        :param table:
+            The base table of the dataset.
+        :param joins:
+            The joins of the dataset.
+        :param fields:
+            The fields of the dataset.
+        """
+        self.table = table
+        self._field_tables = {id(field): (field, tuple(find_tables_for_element(field, table))) for field in fields}
+
+        self._join_closures = {}
+        self._join_errors = {}
+        for join in joins:
+            try:
+                self._join_closures[join.table] = frozenset(find_joins_for_tables(joins, table, [join.table]))
+            except DataSetException as e:
+                self._join_errors[join.table] = e
+
+        dependencies = {
+            join: {dependency for dependency in self._join_closures[join.table] if dependency is not join}
+            for join in joins
+            if join.table in self._join_closures
+        }
+        self._join_ranks = {join: rank for rank, join in enumerate(toposort_flatten(dependencies, sort=True))}
+
+    def find_tables_for_element(self, element):
+        """
+        Returns the tables, other than the base table, that a field, modified field or filter selects from.
+        """
+        field = element
+        while isinstance(field, DimensionModifier):
+            field = field.dimension
+
+        compiled = self._field_tables.get(id(field))
+        if compiled is not None and compiled[0] is field:
+            return compiled[1]
+
+        return find_tables_for_element(element, self.table)
+
+    def find_required_tables_to_join(self, elements):
+        """
+        The same as `fireant.queries.finders.find_required_tables_to_join`, using the compiled tables of fields.
+
+        :return:
+            A collection of tables required to execute a query.
+        """
+        return ordered_distinct_list([table for element in elements for table in self.find_tables_for_element(element)])
+
+    def find_joins_for_tables(self, required_tables):
+        """
+        The same as `fireant.queries.finders.find_joins_for_tables`, using the compiled joins of each table.
+
+        :return:
+            A list of joins in the order that they must be joined to the query.
+        :raises:
+            MissingTableJoinException - If a table is required but there is no join for that table
+            CircularJoinsException - If there is a circular dependency between two or more joins
+        """
+        joins = set()
+        for table in required_tables:
+            if table in self._join_errors:
+                error = self._join_errors[table]
+                raise error.__class__(*error.args)
+
+            if table not in self._join_closures:
+                raise MissingTableJoinException("Could not find a join for table {}".format(str(table)))
+
+            joins |= self._join_closures[table]
+
+        return sorted(joins, key=self._join_ranks.__getitem__)
@@ -36,7 +36,9 @@ def _make_set_dimension(set_filter: Field, target_dataset: 'DataSet') -> Field:
     while hasattr(old_definition, 'definition'):
         old_definition = old_definition.definition
 
-    old_definition = deepcopy(old_definition)
+    # The fields referenced by the definition are kept instead of copied, so that data blending can map them to the
+    # columns selected for them in the dataset subqueries.
+    old_definition = deepcopy(old_definition, {id(field): field for field in old_definition.find_(Field)})
     old_definition_sql = old_definition.get_sql(quote_char="")
 
     set_dimension = deepcopy(set_filter.filter.field)
@@ -1,3 +1,4 @@
+import copy
 import functools
 
 import pandas as pd
@@ -42,18 +43,26 @@ def adjust_daterange_filter_for_rolling_window(dimensions, operations, filters):
     if not 0 < len(filters_on_dim0):
         return filters
 
+    # The first value of a rolling window of N intervals needs the N - 1 intervals before it, which are trimmed from the
+    # result again by `adjust_dataframe_for_rolling_window`
     max_rolling_period = max(operation.window for operation in operations if isinstance(operation, RollingOperation))
-
-    for filter_ in filters_on_dim0:
-        # Monkey patch the update start date on the date filter
-        args = (
-            {dim0.interval_key + "s": max_rolling_period}
-            if isinstance(dim0, DatetimeInterval) and "quarter" != dim0.interval_key
-            else {"months": max_rolling_period * 3}
-        )
-        filter_.definition.start.value -= relativedelta(**args)
-
-    return filters
+    rolling_period = (
+        {dim0.interval_key + "s": max_rolling_period - 1}
+        if isinstance(dim0, DatetimeInterval) and "quarter" != dim0.interval_key
+        else {"months": (max_rolling_period - 1) * 3}
+    )
+
+    adjusted_filters = []
+    for filter_ in filters:
+        if filter_ in filters_on_dim0:
+            # Replace the filter with a copy with an updated start date, since the filters are shared with the query
+            # builder and should not be mutated.
+            filter_ = copy.copy(filter_)
+            filter_.start -= relativedelta(**rolling_period)
+
+        adjusted_filters.append(filter_)
+
+    return adjusted_filters
 
 
 def adjust_dataframe_for_rolling_window(operations, data_frame):
@@ -2,6 +2,7 @@ from typing import Iterable, List, Sequence, Type
 
 from pypika import Table, functions as fn
 from pypika.queries import QueryBuilder
+from pypika.terms import Term
 
 from fireant.database import Database
 from fireant.dataset.fields import Field
@@ -19,6 +20,7 @@ from .finders import (
     find_totals_dimensions,
 )
 from .references import adapt_for_reference_query
+from .schema import DataSetSchema
 from .special_cases import apply_special_cases
 from .totals_helper import adapt_for_totals_query
 
@@ -36,6 +38,7 @@ def make_slicer_query_with_totals_and_references(
     references,
     orders,
     share_dimensions=(),
+    schema=None,
 ) -> List[Type[QueryBuilder]]:
     """
     :param dataset:
@@ -49,6 +52,8 @@ def make_slicer_query_with_totals_and_references(
     :param references:
     :param orders:
     :param share_dimensions:
+    :param schema:
+        (Optional) The compiled schema of the dataset, used for planning the joins of the queries.
     :return:
     """
 
@@ -101,6 +106,7 @@ def make_slicer_query_with_totals_and_references(
                 metrics_with_ref,
                 filters_with_ref,
                 orders,
+                schema=schema,
             )
 
             # Add these to the query instance so when the data frames are joined together, the correct references and
@@ -112,6 +118,14 @@ def make_slicer_query_with_totals_and_references(
     return queries
 
 
+def _find_joins_for_elements(elements, base_table, joins, schema=None):
+    if schema is not None:
+        return schema.find_joins_for_tables(schema.find_required_tables_to_join(elements))
+
+    join_tables_needed_for_query = find_required_tables_to_join(elements, base_table)
+    return find_joins_for_tables(joins, base_table, join_tables_needed_for_query)
+
+
 def make_slicer_query(
     database: Database,
     base_table: Table,
@@ -120,6 +134,7 @@ def make_slicer_query(
     metrics: Sequence[Field] = (),
     filters: Sequence[Filter] = (),
     orders: Sequence = (),
+    schema: DataSetSchema = None,
 ) -> Type[QueryBuilder]:
     """
     Creates a pypika/SQL query from a list of slicer elements.
@@ -147,6 +162,8 @@ def make_slicer_query(
         A collection of filters to apply to the query.
     :param orders:
         A collection of orders as tuples of the metric/dimension to order by and the direction to order in.
+    :param schema:
+        (Optional) The compiled schema of the dataset. When set, it is used for planning the joins instead of `joins`.
 
     :return:
     """
@@ -154,9 +171,7 @@ def make_slicer_query(
     elements = flatten([metrics, dimensions, filters])
 
     # Add joins
-    join_tables_needed_for_query = find_required_tables_to_join(elements, base_table)
-
-    for join in find_joins_for_tables(joins, base_table, join_tables_needed_for_query):
+    for join in _find_joins_for_elements(elements, base_table, joins, schema):
         query = query.join(join.table, how=join.join_type).on(join.criterion)
 
     # Add dimensions
@@ -194,12 +209,12 @@ def make_latest_query(
     base_table: Table,
     joins: Iterable[Join] = (),
     dimensions: Iterable[Field] = (),
+    schema: DataSetSchema = None,
 ):
     query = database.query_cls.from_(base_table, immutable=False)
 
     # Add joins
-    join_tables_needed_for_query = find_required_tables_to_join(dimensions, base_table)
-    for join in find_joins_for_tables(joins, base_table, join_tables_needed_for_query):
+    for join in _find_joins_for_elements(dimensions, base_table, joins, schema):
         query = query.join(join.table, how=join.join_type).on(join.criterion)
 
     for dimension in dimensions:
@@ -207,3 +222,20 @@ def make_latest_query(
         query = query.select(fn.Max(dimension.definition).as_(f_dimension_key))
 
     return query
+
+
+def make_watermark_query(database: Database, table: Table, update_column: Term):
+    """
+    Creates a query for the watermark of a table, which is the latest value of the column recording when its rows were
+    last updated.
+
+    :param database:
+        The database of the dataset.
+    :param table:
+        The table to query.
+    :param update_column:
+        The update column of the table.
+    :return:
+        A pypika query.
+    """
+    return database.query_cls.from_(table).select(fn.Max(update_column).as_(alias_selector("watermark")))
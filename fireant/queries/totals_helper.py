@@ -1,5 +1,14 @@
+import pandas as pd
+
+from fireant.dataset.fields import Aggregation
+from fireant.dataset.modifiers import RollupValue
 from fireant.dataset.totals import Rollup
-from .finders import find_filters_for_totals
+from fireant.utils import alias_selector
+from .finders import (
+    find_field_in_modified_field,
+    find_filters_for_totals,
+    find_totals_dimensions,
+)
 
 
 def adapt_for_totals_query(totals_dimension, dimensions, filters):
@@ -25,3 +34,113 @@ def adapt_for_totals_query(totals_dimension, dimensions, filters):
     totals_filters = find_filters_for_totals(filters)
 
     return totals_dims, totals_filters
+
+
+def find_totals_aggregations(dimensions, metrics, filters, references, orders):
+    """
+    Determines whether the totals of a query can be computed from the result set of its base query instead of with
+    totals queries, which is the case when every selected metric is a SUM, COUNT, MIN or MAX aggregation and the
+    totals queries are filtered the same way as the base query.
+
+    :param dimensions:
+        The dimensions of the query.
+    :param metrics:
+        The metrics selected in the query.
+    :param filters:
+        The filters of the query.
+    :param references:
+        The references of the query.
+    :param orders:
+        The orders of the query. Metrics which are only selected for ordering also have to be aggregated.
+    :return:
+        A dict mapping the alias selector of each metric to its aggregation, or None when the totals have to be
+        queried.
+    """
+    if references:
+        return None
+
+    if len(find_filters_for_totals(filters)) != len(filters) or any(fltr.is_aggregate for fltr in filters):
+        # Totals queries are filtered differently or the metrics are filtered after aggregation
+        return None
+
+    dimension_aliases = {find_field_in_modified_field(dimension).alias for dimension in dimensions}
+    fields = [*metrics, *[field for field, _ in orders if field.alias not in dimension_aliases]]
+
+    aggregations = {}
+    for field in fields:
+        aggregation = getattr(field, "aggregation", None)
+        if aggregation is None:
+            return None
+
+        aggregations[alias_selector(field.alias)] = aggregation
+
+    return aggregations
+
+
+def make_totals_data_frames(data_frame, dimensions, share_dimensions, aggregations):
+    """
+    Computes the result sets of the totals queries of a query from the result set of its base query. The result sets
+    have the same shape and order as the result sets of the totals queries, so that they can be reduced the same way.
+    The values of metrics are aggregated again with vectorized grouped reductions.
+
+    :param data_frame:
+        The result set of the base query.
+    :param dimensions:
+        The dimensions of the query.
+    :param share_dimensions:
+        The dimensions from which the totals are used for calculating share operations.
+    :param aggregations:
+        A dict mapping the alias selector of each metric to its aggregation, see `find_totals_aggregations`.
+    :return:
+        A list with a data frame for each totals query.
+    """
+    dimension_keys = [alias_selector(dimension.alias) for dimension in dimensions]
+    totals_dimensions = find_totals_dimensions(dimensions, share_dimensions)
+
+    totals_data_frames = []
+    for totals_dimension in totals_dimensions[::-1]:
+        index = [i for i, dimension in enumerate(dimensions) if dimension is totals_dimension][0]
+        totals_df = reaggregate(data_frame, dimension_keys[:index], aggregations)
+
+        for key in dimension_keys[index:]:
+            totals_df[key] = RollupValue.CONSTANT
+
+        totals_data_frames.append(totals_df[list(data_frame.columns)])
+
+    return totals_data_frames
+
+
+def reaggregate(data_frame, group_keys, aggregations):
+    """
+    Aggregates the values of metrics again for groups of rows, with the aggregation that computes the value of the
+    aggregation of each metric for a group from its values for the rows.
+
+    :param data_frame:
+        A data frame with the group keys and the metrics as columns.
+    :param group_keys:
+        The columns to group the rows by. When empty, all rows are aggregated into a single row.
+    :param aggregations:
+        A dict mapping the alias selector of each metric to its aggregation.
+    :return:
+        A data frame with the group keys and the metrics as columns and a row for each group.
+    """
+    grouped = data_frame.groupby(group_keys, sort=False, dropna=False) if group_keys else data_frame
+
+    columns = {reaggregation: [] for reaggregation in (Aggregation.sum, Aggregation.min, Aggregation.max)}
+    counts = []
+    for key, aggregation in aggregations.items():
+        (counts if aggregation is Aggregation.count else columns[aggregation.reaggregation]).append(key)
+
+    aggregated = [
+        # The same as in SQL, the sum of only null values is null, while counts are never null
+        grouped[columns[Aggregation.sum]].sum(min_count=1),
+        grouped[counts].sum(),
+        grouped[columns[Aggregation.min]].min(),
+        grouped[columns[Aggregation.max]].max(),
+    ]
+
+    if not group_keys:
+        # Aggregating without groups results in a series for each aggregation, which are combined into a single row
+        return pd.DataFrame([pd.concat(aggregated)]).infer_objects()
+
+    return pd.concat(aggregated, axis=1).reset_index()
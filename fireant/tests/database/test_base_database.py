@@ -4,10 +4,11 @@ from unittest.mock import (
     patch,
 )
 
+import pandas as pd
 from pypika import Field
 
-from fireant.database import Database
-from fireant.middleware.decorators import connection_middleware
+from fireant.database import ColumnsTransformer, Database, MySQLDatabase
+from fireant.middleware.decorators import connection_middleware, log_middleware
 
 
 @connection_middleware
@@ -72,3 +73,205 @@ class TestBaseDatabase(TestCase):
 
         self.assertEqual(2, mock_connect.call_count)
         self.assertNotEqual(connection_1, connection_2)
+
+
+class FetchDataFrameChunksTests(TestCase):
+    def _mock_connection(self, *batches):
+        connection = Mock()
+        cursor = connection.cursor.return_value
+        cursor.description = [("$timestamp",), ("$votes",)]
+        cursor.fetchmany.side_effect = list(batches) + [[]]
+        return connection
+
+    def test_yields_a_data_frame_per_batch_of_rows(self):
+        connection = self._mock_connection([("2019-01-01", 1), ("2019-01-02", 2)], [("2019-01-03", 3)])
+
+        chunks = list(Database().fetch_dataframe_chunks("SELECT 1", 2, connection=connection))
+
+        self.assertEqual([2, 1], [len(chunk) for chunk in chunks])
+        self.assertEqual([1, 2, 3], [value for chunk in chunks for value in chunk["$votes"]])
+        connection.cursor.return_value.fetchmany.assert_called_with(2)
+
+    def test_parses_date_columns(self):
+        connection = self._mock_connection([("2019-01-01", 1)])
+
+        chunks = list(
+            Database().fetch_dataframe_chunks("SELECT 1", 2, parse_dates={"$timestamp": {}}, connection=connection)
+        )
+
+        self.assertEqual(pd.Timestamp("2019-01-01"), chunks[0]["$timestamp"][0])
+
+    def test_empty_result_set_yields_empty_data_frame_with_columns(self):
+        connection = self._mock_connection()
+
+        chunks = list(Database().fetch_dataframe_chunks("SELECT 1", 2, connection=connection))
+
+        self.assertEqual(1, len(chunks))
+        self.assertEqual(["$timestamp", "$votes"], list(chunks[0].columns))
+
+    def test_cursor_is_closed_when_the_consumer_stops_early(self):
+        connection = self._mock_connection([("2019-01-01", 1)], [("2019-01-02", 2)])
+
+        chunks = Database().fetch_dataframe_chunks("SELECT 1", 1, connection=connection)
+        next(chunks)
+        connection.cursor.return_value.close.assert_not_called()
+
+        chunks.close()
+        connection.cursor.return_value.close.assert_called_once()
+
+    def test_cursor_is_closed_when_the_result_set_is_read(self):
+        connection = self._mock_connection([("2019-01-01", 1)])
+
+        list(Database().fetch_dataframe_chunks("SELECT 1", 2, connection=connection))
+
+        connection.cursor.return_value.close.assert_called_once()
+
+    def test_query_passes_through_the_middlewares(self):
+        connection = self._mock_connection([("2019-01-01", 1)])
+        database = Database(middlewares=[log_middleware])
+
+        with self.assertLogs("fireant.query_log", level="INFO") as logs:
+            list(database.fetch_dataframe_chunks("SELECT 1", 2, connection=connection))
+
+        self.assertIn("SELECT 1", logs.output[-1])
+
+    @patch.object(Database, "connect")
+    def test_connection_is_held_open_until_chunks_are_consumed(self, mock_connect):
+        connection = self._mock_connection([("2019-01-01", 1)])
+        mock_connect.return_value.__enter__ = Mock(return_value=connection)
+        mock_connect.return_value.__exit__ = Mock(return_value=None)
+
+        chunks = Database().fetch_dataframe_chunks("SELECT 1", 2)
+        mock_connect.assert_not_called()
+
+        next(chunks)
+        mock_connect.return_value.__exit__.assert_not_called()
+
+        list(chunks)
+        mock_connect.return_value.__exit__.assert_called_once()
+
+
+@patch.object(MySQLDatabase, 'fetch')
+class SchemaCacheTests(TestCase):
+    rows = [
+        ('schema_a', 'table_a', 'id', 'int'),
+        ('schema_a', 'table_a', 'name', 'varchar(255)'),
+        ('schema_b', 'table_b', 'id', 'int'),
+    ]
+
+    def test_column_definitions_are_fetched_for_several_tables_with_one_query(self, mock_fetch):
+        mock_fetch.return_value = self.rows
+
+        result = MySQLDatabase().fetch_column_definitions([('schema_a', 'table_a'), ('schema_b', 'table_b')])
+
+        mock_fetch.assert_called_once_with(
+            'SELECT DISTINCT `table_schema`,`table_name`,`column_name`,`column_type` '
+            'FROM `INFORMATION_SCHEMA`.`columns` '
+            'WHERE (`table_schema`=%(schema_0)s AND `table_name`=%(table_0)s) '
+            'OR (`table_schema`=%(schema_1)s AND `table_name`=%(table_1)s) '
+            'ORDER BY `column_name`',
+            parameters={
+                'schema_0': 'schema_a',
+                'table_0': 'table_a',
+                'schema_1': 'schema_b',
+                'table_1': 'table_b',
+            },
+            connection=None,
+        )
+        self.assertDictEqual(
+            {
+                ('schema_a', 'table_a'): [('id', 'int'), ('name', 'varchar(255)')],
+                ('schema_b', 'table_b'): [('id', 'int')],
+            },
+            result,
+        )
+
+    def test_column_definitions_are_matched_to_tables_regardless_of_case(self, mock_fetch):
+        mock_fetch.return_value = [
+            ('Schema_A', 'Table_A', 'id', 'int'),
+            ('SCHEMA_B', 'TABLE_B', 'id', 'int'),
+        ]
+
+        result = MySQLDatabase().fetch_column_definitions([('schema_a', 'table_a'), ('schema_b', 'table_b')])
+
+        self.assertDictEqual(
+            {
+                ('schema_a', 'table_a'): [('id', 'int')],
+                ('schema_b', 'table_b'): [('id', 'int')],
+            },
+            result,
+        )
+
+    def test_column_definitions_are_not_cached_without_ttl(self, mock_fetch):
+        mock_fetch.return_value = self.rows
+        db = MySQLDatabase()
+
+        db.get_column_definitions('schema_a', 'table_a')
+        db.get_column_definitions('schema_a', 'table_a')
+
+        self.assertEqual(2, mock_fetch.call_count)
+
+    def test_cached_column_definitions_are_reused(self, mock_fetch):
+        mock_fetch.return_value = self.rows
+        db = MySQLDatabase(schema_cache_ttl=60)
+
+        db.prefetch_column_definitions([('schema_a', 'table_a'), ('schema_b', 'table_b')])
+        result = db.get_column_definitions('schema_b', 'table_b')
+
+        mock_fetch.assert_called_once()
+        self.assertListEqual([('id', 'int')], result)
+
+    def test_only_missing_tables_are_prefetched(self, mock_fetch):
+        mock_fetch.return_value = self.rows
+        db = MySQLDatabase(schema_cache_ttl=60)
+
+        db.get_column_definitions('schema_a', 'table_a')
+        db.prefetch_column_definitions([('schema_a', 'table_a'), ('schema_b', 'table_b')])
+
+        self.assertEqual({'schema_0': 'schema_b', 'table_0': 'table_b'}, mock_fetch.call_args[1]['parameters'])
+
+    def test_invalidate_column_definitions(self, mock_fetch):
+        mock_fetch.return_value = self.rows
+        db = MySQLDatabase(schema_cache_ttl=60)
+        db.prefetch_column_definitions([('schema_a', 'table_a'), ('schema_b', 'table_b')])
+
+        db.invalidate_column_definitions('schema_a', 'table_a')
+        db.get_column_definitions('schema_b', 'table_b')
+        db.get_column_definitions('schema_a', 'table_a')
+        self.assertEqual(2, mock_fetch.call_count)
+
+        db.invalidate_column_definitions()
+        db.get_column_definitions('schema_b', 'table_b')
+        self.assertEqual(3, mock_fetch.call_count)
+
+    def test_columns_transformer_uses_cached_column_definitions(self, mock_fetch):
+        mock_fetch.return_value = self.rows
+        db = MySQLDatabase(schema_cache_ttl=60)
+        db.prefetch_column_definitions([('schema_a', 'table_a')])
+
+        columns = ColumnsTransformer.table_to_ansi('schema_a', 'table_a', db)
+
+        mock_fetch.assert_called_once()
+        self.assertListEqual(['id', 'name'], [column.name for column in columns])
+
+
+class TruncDateValuesTests(TestCase):
+    dates = pd.Series(pd.to_datetime(["2020-01-04 13:30", "2020-01-05 01:00", "2020-05-17", None]))
+
+    def test_trunc_date_values(self):
+        for interval, expected in [
+            ("hour", ["2020-01-04 13:00", "2020-01-05 01:00", "2020-05-17", None]),
+            ("day", ["2020-01-04", "2020-01-05", "2020-05-17", None]),
+            ("week", ["2019-12-30", "2019-12-30", "2020-05-11", None]),
+            ("month", ["2020-01-01", "2020-01-01", "2020-05-01", None]),
+            ("quarter", ["2020-01-01", "2020-01-01", "2020-04-01", None]),
+            ("year", ["2020-01-01", "2020-01-01", "2020-01-01", None]),
+        ]:
+            with self.subTest(interval=interval):
+                pd.testing.assert_series_equal(
+                    pd.Series(pd.to_datetime(expected)), Database().trunc_date_values(self.dates, interval)
+                )
+
+    def test_invalid_interval(self):
+        with self.assertRaises(ValueError):
+            Database().trunc_date_values(self.dates, "minute")
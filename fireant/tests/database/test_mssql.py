@@ -6,6 +6,7 @@ from unittest.mock import (
     patch,
 )
 
+import pandas as pd
 import pytz
 from pypika import Field
 
@@ -121,12 +122,12 @@ class TestMSSQLDatabase(TestCase):
         MSSQLDatabase().get_column_definitions('test_schema', 'test_table')
 
         mock_fetch.assert_called_once_with(
-            'SELECT DISTINCT "COLUMN_NAME","DATA_TYPE" '
+            'SELECT DISTINCT "TABLE_SCHEMA","TABLE_NAME","COLUMN_NAME","DATA_TYPE" '
             'FROM "INFORMATION_SCHEMA"."COLUMNS" '
-            'WHERE "TABLE_SCHEMA"=%(schema)s AND "TABLE_NAME"=%(table)s '
+            'WHERE "TABLE_SCHEMA"=%(schema_0)s AND "TABLE_NAME"=%(table_0)s '
             'ORDER BY "column_name"',
             connection=None,
-            parameters={'schema': 'test_schema', 'table': 'test_table'},
+            parameters={'schema_0': 'test_schema', 'table_0': 'test_table'},
         )
 
 
@@ -152,3 +153,12 @@ class MSSQLSQLBuilderTests(TestCase):
             'FETCH NEXT 200000 ROWS ONLY',
             str(queries[1]),
         )
+
+
+class MSSQLTruncDateValuesTests(TestCase):
+    def test_weeks_run_from_sunday_to_saturday_and_are_truncated_to_the_following_monday(self):
+        dates = pd.Series(pd.to_datetime(["2020-01-04", "2020-01-05", "2020-01-11"]))
+
+        truncated = MSSQLDatabase().trunc_date_values(dates, "week")
+
+        self.assertListEqual(list(pd.to_datetime(["2019-12-30", "2020-01-06", "2020-01-06"])), list(truncated))
@@ -98,10 +98,10 @@ class TestPostgreSQL(TestCase):
         PostgreSQLDatabase().get_column_definitions('test_schema', 'test_table')
 
         mock_fetch.assert_called_once_with(
-            'SELECT DISTINCT "column_name","data_type" '
+            'SELECT DISTINCT "table_schema","table_name","column_name","data_type" '
             'FROM "information_schema"."columns" '
-            'WHERE "table_schema"=%(schema)s AND "table_name"=%(table)s '
+            'WHERE "table_schema"=%(schema_0)s AND "table_name"=%(table_0)s '
             'ORDER BY "column_name"',
             connection=None,
-            parameters={'schema': 'test_schema', 'table': 'test_table'},
+            parameters={'schema_0': 'test_schema', 'table_0': 'test_table'},
         )
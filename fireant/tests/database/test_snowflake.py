@@ -1,3 +1,4 @@
+import types
 from unittest import TestCase
 from unittest.mock import (
     ANY,
@@ -11,6 +12,16 @@ from fireant.database import SnowflakeDatabase
 
 
 class TestSnowflake(TestCase):
+    @staticmethod
+    def _patch_snowflake_connector():
+        # snowflake is a namespace package, so importing it does not import its connector module
+        snowflake = types.ModuleType('snowflake')
+        snowflake.__path__ = []
+        connector = types.ModuleType('snowflake.connector')
+        connector.connect = Mock(name='connect')
+
+        return connector, patch.dict('sys.modules', {'snowflake': snowflake, 'snowflake.connector': connector})
+
     def test_defaults(self):
         snowflake = SnowflakeDatabase()
 
@@ -24,11 +35,10 @@ class TestSnowflake(TestCase):
         self.assertIsNone(snowflake.warehouse)
 
     def test_connect_with_password(self):
-        mock_snowflake = Mock(name='mock_snowflake')
-        mock_connector = mock_snowflake.connector
+        mock_connector, patch_snowflake = self._patch_snowflake_connector()
 
         # need to patch this here so it can be imported in the function scope
-        with patch.dict('sys.modules', snowflake=mock_snowflake):
+        with patch_snowflake:
             mock_connector.connect.return_value = 'OK'
 
             snowflake = SnowflakeDatabase(
@@ -47,14 +57,13 @@ class TestSnowflake(TestCase):
             warehouse=None,
         )
 
-    @patch('fireant.database.snowflake.serialization')
-    def test_connect_with_pkey(self, mock_serialization):
-        mock_snowflake = Mock(name='mock_snowflake')
-        mock_connector = mock_snowflake.connector
-        mock_pkey = mock_serialization.load_pem_private_key.return_value = Mock(name='pkey')
+    @patch('cryptography.hazmat.primitives.serialization.load_pem_private_key')
+    def test_connect_with_pkey(self, mock_load_pem_private_key):
+        mock_connector, patch_snowflake = self._patch_snowflake_connector()
+        mock_pkey = mock_load_pem_private_key.return_value = Mock(name='pkey')
 
         # need to patch this here so it can be imported in the function scope
-        with patch.dict('sys.modules', snowflake=mock_snowflake):
+        with patch_snowflake:
             mock_connector.connect.return_value = 'OK'
 
             snowflake = SnowflakeDatabase(
@@ -70,7 +79,7 @@ class TestSnowflake(TestCase):
             self.assertEqual('OK', result)
 
         with self.subTest('connects with credentials'):
-            mock_serialization.load_pem_private_key.assert_called_once_with(b'abcdefg', b'1234', backend=ANY)
+            mock_load_pem_private_key.assert_called_once_with(b'abcdefg', b'1234', backend=ANY)
 
         with self.subTest('connects with credentials'):
             mock_connector.connect.assert_called_once_with(
@@ -143,10 +152,10 @@ class TestSnowflake(TestCase):
         SnowflakeDatabase().get_column_definitions('test_schema', 'test_table')
 
         mock_fetch.assert_called_once_with(
-            'SELECT DISTINCT COLUMN_NAME,DATA_TYPE '
+            'SELECT DISTINCT TABLE_SCHEMA,TABLE_NAME,COLUMN_NAME,DATA_TYPE '
             'FROM INFORMATION_SCHEMA.COLUMNS '
-            'WHERE TABLE_SCHEMA=%(schema)s AND TABLE_NAME=%(table)s '
+            'WHERE TABLE_SCHEMA=%(schema_0)s AND TABLE_NAME=%(table_0)s '
             'ORDER BY column_name',
             connection=None,
-            parameters={'schema': 'test_schema', 'table': 'test_table'},
+            parameters={'schema_0': 'test_schema', 'table_0': 'test_table'},
         )
@@ -106,15 +106,15 @@ class TestVertica(TestCase):
         VerticaDatabase().get_column_definitions('test_schema', 'test_table')
 
         expected_query = (
-            '(SELECT DISTINCT "column_name","data_type" FROM "view_columns" '
-            'WHERE "table_schema"=:schema AND "table_name"=:table) '
+            '(SELECT DISTINCT "table_schema","table_name","column_name","data_type" FROM "view_columns" '
+            'WHERE "table_schema"=:schema_0 AND "table_name"=:table_0) '
             'UNION '
-            '(SELECT DISTINCT "column_name","data_type" FROM "columns" '
-            'WHERE "table_schema"=:schema AND "table_name"=:table)'
+            '(SELECT DISTINCT "table_schema","table_name","column_name","data_type" FROM "columns" '
+            'WHERE "table_schema"=:schema_0 AND "table_name"=:table_0)'
         )
 
         mock_fetch.assert_called_once_with(
-            expected_query, connection=None, parameters={'schema': 'test_schema', 'table': 'test_table'}
+            expected_query, connection=None, parameters={'schema_0': 'test_schema', 'table_0': 'test_table'}
         )
 
     @patch.object(VerticaDatabase, 'execute')
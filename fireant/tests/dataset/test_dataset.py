@@ -1,6 +1,10 @@
 from unittest import TestCase
+from unittest.mock import patch
 
-from fireant import Field
+from pypika import Schema, Tables, functions as fn
+
+from fireant import DataSet, Field, Join, MySQLDatabase
+from fireant.queries.builder import DimensionChoicesQueryBuilder
 from .mocks import mock_dataset
 
 
@@ -50,3 +54,86 @@ class SlicerContainerTests(TestCase):
                 'deepjoin',
             },
         )
+
+
+def _make_dataset():
+    politicians = Tables('politician')[0]
+    return DataSet(
+        table=politicians,
+        database=MySQLDatabase(),
+        fields=[
+            Field('party', definition=politicians.party),
+            Field('votes', definition=fn.Sum(politicians.votes)),
+        ],
+    )
+
+
+class DataSetLazyConstructionTests(TestCase):
+    def test_query_builders_are_created_on_first_access(self):
+        dataset = _make_dataset()
+
+        self.assertIsNone(dataset._query)
+        self.assertIsNone(dataset._latest)
+        self.assertIs(dataset.query, dataset.query)
+        self.assertIs(dataset.latest, dataset.latest)
+        self.assertIs(dataset, dataset.query.dataset)
+
+    def test_choices_are_created_on_first_access(self):
+        dataset = _make_dataset()
+        party = dataset.fields.party
+
+        self.assertIsNone(party._choices)
+        self.assertIsInstance(party.choices, DimensionChoicesQueryBuilder)
+        self.assertIs(party.choices, party.choices)
+        self.assertIs(dataset, party.choices.dataset)
+        self.assertEqual((party,), party.choices._dimensions)
+
+    def test_metrics_have_no_choices(self):
+        dataset = _make_dataset()
+
+        self.assertFalse(hasattr(dataset.fields.votes, 'choices'))
+
+    def test_extra_fields_shares_fields_of_dataset(self):
+        dataset = _make_dataset()
+        query = dataset.query
+        party_length = Field('party-length', definition=fn.Length(dataset.fields.party.definition))
+
+        extended = dataset.extra_fields(party_length)
+
+        self.assertIs(dataset.fields.party, extended.fields.party)
+        self.assertIs(party_length, extended.fields['party-length'])
+        self.assertNotIn('party-length', dataset.fields)
+        self.assertIs(query, dataset.query)
+        self.assertIs(extended, extended.query.dataset)
+
+
+@patch.object(MySQLDatabase, 'fetch')
+class DataSetPrefetchColumnDefinitionsTests(TestCase):
+    def test_dataset_prefetches_tables_of_joins_and_hint_tables(self, mock_fetch):
+        mock_fetch.return_value = []
+        politicians, districts, hints = Tables('politician', 'district', 'hints')
+        politicians._schema = districts._schema = hints._schema = Schema('politics')
+        dataset = DataSet(
+            table=politicians,
+            database=MySQLDatabase(schema_cache_ttl=60),
+            joins=[Join(districts, politicians.district_id == districts.id)],
+            fields=[
+                Field('party', definition=politicians.party, hint_table=hints),
+                Field('district', definition=districts.name),
+            ],
+        )
+
+        dataset.prefetch_column_definitions()
+
+        mock_fetch.assert_called_once()
+        self.assertEqual(
+            {
+                'schema_0': 'politics',
+                'table_0': 'politician',
+                'schema_1': 'politics',
+                'table_1': 'district',
+                'schema_2': 'politics',
+                'table_2': 'hints',
+            },
+            mock_fetch.call_args[1]['parameters'],
+        )
@@ -16,7 +16,7 @@ from pypika import Query
 
 from fireant import DayOverDay
 from fireant.dataset.modifiers import Rollup, RollupValue
-from fireant.dataset.totals import get_totals_marker_for_dtype
+from fireant.dataset.totals import get_totals_marker_for_dtype, to_typed_totals
 from fireant.queries.execution import (
     fetch_data,
     reduce_result_set,
@@ -82,7 +82,9 @@ class TestFetchData(TestCase):
         database.fetch_dataframes.assert_called_with(
             'SELECT * FROM "politics"."politician"', 'SELECT * FROM "politics"."hints"', parse_dates={}
         )
-        reduce_mock.assert_called_once_with([self.test_result_a, self.test_result_b], (), self.test_dimensions, ())
+        reduce_mock.assert_called_once_with(
+            [self.test_result_a, self.test_result_b], (), self.test_dimensions, (), typed_totals=False
+        )
 
     @patch("fireant.queries.execution.reduce_result_set")
     def test_fetch_data_strips_rows_over_max_result_set_size(self, reduce_mock):
@@ -91,7 +93,8 @@ class TestFetchData(TestCase):
             pd.DataFrame([{"a": 1.0}, {"a": 2.0}, {"a": 3.0}]),
             pd.DataFrame([{"a": 1.0}]),
         ]
-        reduce_mock.side_effect = lambda *args: args[0]  # let the reduce mock pass on the dataframes unchanged
+        # let the reduce mock pass on the dataframes unchanged
+        reduce_mock.side_effect = lambda *args, **kwargs: args[0]
 
         max_rows_returned, result = fetch_data(database, self.test_queries, self.test_dimensions)
 
@@ -286,6 +289,22 @@ class ReduceResultSetsWithTotalsTests(TestCase):
 
         pandas.testing.assert_frame_equal(expected, result)
 
+    def test_reduce_single_result_set_with_str_dimension_and_typed_totals(self):
+        expected = to_typed_totals(dimx1_str_totals_df)
+        raw_df = replace_totals(dimx1_str_df)
+        totals_df = pd.merge(
+            pd.DataFrame([RollupValue.CONSTANT], columns=["$political_party"]),
+            pd.DataFrame([raw_df[metrics].sum(axis=0)]),
+            how="outer",
+            left_index=True,
+            right_index=True,
+        )
+
+        dimensions = (Rollup(mock_dataset.fields.political_party),)
+        result = reduce_result_set([raw_df, totals_df], (), dimensions, (), typed_totals=True)
+
+        pandas.testing.assert_frame_equal(expected, result)
+
     def test_reduce_single_result_set_with_dimx2_date_str_totals_date(self):
         expected = dimx2_date_str_totalsx2_df.loc[(slice(None), slice("Democrat", "Republican")), :].append(
             dimx2_date_str_totalsx2_df.iloc[-1]
@@ -1,6 +1,8 @@
 from unittest import TestCase
 
-from fireant import DataType
+from pypika import Table, functions as fn
+
+from fireant import Aggregation, DataType, Field
 
 
 class DataTypeTests(TestCase):
@@ -15,3 +17,41 @@ class DataTypeTests(TestCase):
 
     def test_repr_of_text(self):
         self.assertEqual('text', repr(DataType.text))
+
+
+class AggregationTests(TestCase):
+    table = Table("politician")
+
+    def test_aggregation_is_inferred_from_the_definition(self):
+        for definition, aggregation in [
+            (fn.Sum(self.table.votes), Aggregation.sum),
+            (fn.Count(self.table.id), Aggregation.count),
+            (fn.Min(self.table.votes), Aggregation.min),
+            (fn.Max(self.table.votes), Aggregation.max),
+        ]:
+            with self.subTest(aggregation=aggregation):
+                self.assertIs(aggregation, Field("metric", definition=definition).aggregation)
+
+    def test_no_aggregation_for_non_additive_definitions(self):
+        for definition in [
+            fn.Count(self.table.id).distinct(),
+            fn.Avg(self.table.votes),
+            fn.Sum(self.table.votes) / fn.Count(self.table.id),
+            self.table.political_party,
+        ]:
+            with self.subTest(definition=str(definition)):
+                self.assertIsNone(Field("metric", definition=definition).aggregation)
+
+    def test_declared_aggregation_overrides_the_inferred_aggregation(self):
+        field = Field("metric", definition=fn.Avg(self.table.votes), aggregation=Aggregation.max)
+
+        self.assertIs(Aggregation.max, field.aggregation)
+
+    def test_aggregation_of_a_field_defined_by_another_field(self):
+        votes = Field("votes", definition=fn.Sum(self.table.votes))
+
+        self.assertIs(Aggregation.sum, Field("metric", definition=votes).aggregation)
+
+    def test_counts_are_aggregated_again_with_a_sum(self):
+        self.assertIs(Aggregation.sum, Aggregation.count.reaggregation)
+        self.assertIs(Aggregation.min, Aggregation.min.reaggregation)
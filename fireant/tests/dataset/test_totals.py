@@ -0,0 +1,79 @@
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+import pandas.testing
+
+from fireant.dataset.totals import (
+    GROUPING_ID,
+    is_totals,
+    to_totals_markers,
+    to_typed_totals,
+    totals_mask,
+)
+from .mocks import (
+    dimx0_metricx1_df,
+    dimx1_str_totals_df,
+    dimx2_date_str_totalsx2_df,
+    dimx3_date_str_str_totalsx3_df,
+)
+
+
+class TotalsMaskTests(TestCase):
+    def test_single_level_index(self):
+        mask = totals_mask(dimx1_str_totals_df.index)
+
+        self.assertEqual((len(dimx1_str_totals_df), 1), mask.shape)
+        self.assertListEqual([False, False, False, True], list(mask[:, 0]))
+
+    def test_multi_level_index_is_the_same_as_comparing_each_value(self):
+        index = dimx3_date_str_str_totalsx3_df.index
+        expected = np.array([[value in (pd.Timestamp.max, "~~totals") for value in values] for values in index])
+
+        np.testing.assert_array_equal(expected, totals_mask(index))
+
+    def test_is_totals_for_any_level(self):
+        index = dimx2_date_str_totalsx2_df.index
+
+        np.testing.assert_array_equal(
+            [pd.Timestamp.max == timestamp or "~~totals" == party for timestamp, party in index],
+            is_totals(index),
+        )
+
+    def test_no_dimensions(self):
+        self.assertFalse(is_totals(dimx0_metricx1_df.index).any())
+
+
+class TypedTotalsTests(TestCase):
+    def test_levels_keep_their_native_dtypes(self):
+        data_frame = pd.DataFrame({"$year": [2019, 2020, 9223372036854775807], "$votes": [1, 2, 3]}).set_index("$year")
+
+        typed = to_typed_totals(data_frame)
+
+        self.assertEqual(np.dtype("int64"), typed.index.levels[0].dtype)
+        self.assertListEqual([0, 1, -1], list(typed.index.codes[0]))
+        self.assertListEqual([0, 0, 1], list(typed.index.get_level_values(GROUPING_ID)))
+
+    def test_grouping_ids_are_the_same_as_in_sql(self):
+        typed = to_typed_totals(dimx2_date_str_totalsx2_df)
+        grouping_ids = typed.index.get_level_values(GROUPING_ID)
+
+        # The first level is the most significant bit
+        self.assertSetEqual({0, 1, 3}, set(grouping_ids))
+        np.testing.assert_array_equal(totals_mask(dimx2_date_str_totalsx2_df.index), totals_mask(typed.index))
+
+    def test_null_values_are_not_totals(self):
+        data_frame = pd.DataFrame({"$party": ["a", None, "~~totals"], "$votes": [1, 2, 3]}).set_index("$party")
+
+        typed = to_typed_totals(data_frame)
+
+        self.assertListEqual([False, False, True], list(is_totals(typed.index)))
+        self.assertTrue(pd.isnull(typed.index.get_level_values(0)[1]))
+
+    def test_round_trip_to_totals_markers(self):
+        for data_frame in (dimx1_str_totals_df, dimx2_date_str_totalsx2_df, dimx3_date_str_str_totalsx3_df):
+            with self.subTest(index=data_frame.index.names):
+                pandas.testing.assert_frame_equal(data_frame, to_totals_markers(to_typed_totals(data_frame)))
+
+    def test_no_dimensions(self):
+        self.assertIs(dimx0_metricx1_df, to_typed_totals(dimx0_metricx1_df))
@@ -1,4 +1,5 @@
 import copy
+from concurrent.futures import ThreadPoolExecutor
 from unittest import TestCase
 
 from pypika import Order
@@ -370,9 +371,10 @@ class DataSetBlenderQueryBuilderTests(TestCase):
         self.assertEqual(
             "SELECT "
             '"sq0"."$timestamp" "$timestamp",'
-            'CASE WHEN "sq1"."$candidate-spend"/"sq0"."$wins">1000 THEN \'set(sq1.$candidate-spend/sq0.$wins>1000)\' '
-            'ELSE \'complement(sq1.$candidate-spend/sq0.$wins>1000)\' '
-            'END \"$set(sq1.$candidate-spend/sq0.$wins>1000)\",'
+            'CASE WHEN "sq1"."$candidate-spend"/"sq0"."$wins">1000 '
+            'THEN \'set(SUM(candidate_spend)/SUM(is_winner)>1000)\' '
+            'ELSE \'complement(SUM(candidate_spend)/SUM(is_winner)>1000)\' '
+            'END "$set(SUM(candidate_spend)/SUM(is_winner)>1000)",'
             '"sq1"."$candidate-spend"/"sq0"."$wins" "$candidate-spend-per-wins" '
             "FROM ("
             "SELECT "
@@ -896,3 +898,39 @@ class DataSetBlenderQueryBuilderTests(TestCase):
             .widget(f.ReactTable(mock_dataset_blender.fields["votes"]))
             .dimension(mock_dataset_blender.fields["district-id"])
         ).sql
+
+
+class DataSetBlenderConcurrencyTests(TestCase):
+    def _make_query(self, with_reference):
+        query = (
+            mock_dataset_blender.query()
+            .widget(f.ReactTable(mock_dataset_blender.fields["candidate-spend-per-wins"]))
+            .dimension(f.day(mock_dataset_blender.fields.timestamp))
+            .orderby(mock_dataset_blender.fields["candidate-spend-per-wins"])
+        )
+        if with_reference:
+            query = query.reference(f.WeekOverWeek(mock_dataset_blender.fields.timestamp))
+        return query
+
+    def test_building_blended_queries_does_not_mutate_dataset_fields(self):
+        self._make_query(with_reference=True).sql
+
+        for dataset in (mock_dataset_blender.primary_dataset, mock_dataset_blender.secondary_dataset):
+            for field in dataset.fields:
+                self.assertNotIn("get_sql", vars(field))
+
+    def test_blended_queries_built_concurrently_match_queries_built_serially(self):
+        expected = {
+            with_reference: [str(query) for query in self._make_query(with_reference).sql]
+            for with_reference in (False, True)
+        }
+
+        def build(i):
+            with_reference = bool(i % 2)
+            return with_reference, [str(query) for query in self._make_query(with_reference).sql]
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(build, range(400)))
+
+        for with_reference, sql in results:
+            self.assertEqual(expected[with_reference], sql)
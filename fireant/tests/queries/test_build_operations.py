@@ -1,3 +1,4 @@
+from datetime import date
 from unittest import TestCase
 
 import fireant as f
@@ -64,6 +65,35 @@ class QueryBuilderOperationTests(TestCase):
             str(queries[0]),
         )
 
+    def test_build_query_with_rollingmean_operation_extends_date_filter_by_window(self):
+        date_filter = mock_dataset.fields.timestamp.between(date(2018, 1, 1), date(2018, 1, 31))
+
+        def make_sql():
+            return str(
+                mock_dataset.query.widget(f.ReactTable(f.RollingMean(mock_dataset.fields.votes, 3, 3)))
+                .dimension(timestamp_daily)
+                .filter(date_filter)
+                .sql[0]
+            )
+
+        sql = make_sql()
+
+        self.assertEqual(
+            'SELECT '
+            'TRUNC("timestamp",\'DD\') "$timestamp",'
+            'SUM("votes") "$votes" '
+            'FROM "politics"."politician" '
+            'WHERE "timestamp" BETWEEN \'2017-12-30\' AND \'2018-01-31\' '
+            'GROUP BY "$timestamp" '
+            'ORDER BY "$timestamp" '
+            'LIMIT 200000',
+            sql,
+        )
+
+        with self.subTest("does not mutate the filter"):
+            self.assertEqual(date(2018, 1, 1), date_filter.start)
+            self.assertEqual(sql, make_sql())
+
     def test_build_query_with_rollingmean_operation(self):
         queries = (
             mock_dataset.query.widget(f.ReactTable(f.RollingMean(mock_dataset.fields.votes, 3, 3)))
@@ -1,4 +1,6 @@
+import copy
 from unittest import TestCase
+from unittest.mock import patch
 
 from pypika import (
     MySQLQuery,
@@ -7,6 +9,7 @@ from pypika import (
 
 import fireant as f
 from fireant.queries.builder import add_hints
+from fireant.queries.builder import DataSetQueryBuilder
 from fireant.tests.dataset.mocks import mock_dataset
 from fireant.widgets.base import MetricRequiredException
 
@@ -36,6 +39,55 @@ class QueryBuilderTests(TestCase):
 
         self.assertIsNot(query1, query2)
 
+    def test_copies_share_unchanged_state(self):
+        query1 = mock_dataset.query.widget(f.ReactTable(mock_dataset.fields.votes)).filter(
+            mock_dataset.fields.votes > 10
+        )
+        query2 = query1.dimension(mock_dataset.fields.timestamp)
+
+        self.assertIs(query1.dataset, query2.dataset)
+        self.assertIs(query1._widgets, query2._widgets)
+        self.assertIs(query1._filters, query2._filters)
+        self.assertEqual(0, len(query1._dimensions))
+        self.assertEqual(1, len(query2._dimensions))
+
+    def test_query_builder_of_copied_dataset_uses_copied_dataset(self):
+        dataset = copy.deepcopy(mock_dataset)
+
+        self.assertIs(dataset, dataset.query.dataset)
+        self.assertIs(dataset, dataset.query.dimension(dataset.fields.timestamp).dataset)
+
+
+class QueryPlanTests(TestCase):
+    def setUp(self):
+        self.query = mock_dataset.query.widget(f.ReactTable(mock_dataset.fields.votes)).dimension(
+            f.day(mock_dataset.fields.timestamp)
+        )
+
+    def test_plan_is_compiled_once(self):
+        with patch.object(DataSetQueryBuilder, "_make_plan", wraps=self.query._make_plan) as mock_make_plan:
+            self.query.sql
+            str(self.query)
+            self.query.reference_groups
+
+        mock_make_plan.assert_called_once()
+        self.assertIs(self.query.plan, self.query.plan)
+
+    def test_plan_is_not_shared_with_copies(self):
+        plan = self.query.plan
+        query2 = self.query.dimension(mock_dataset.fields.political_party)
+
+        self.assertIs(plan, self.query.plan)
+        self.assertIsNot(plan, query2.plan)
+        self.assertEqual(2, len(query2.plan.dimensions))
+
+    def test_plan_is_recompiled_when_mutated(self):
+        plan = self.query.plan
+        self.query.dimension(mock_dataset.fields.political_party, mutate=True)
+
+        self.assertIsNot(plan, self.query.plan)
+        self.assertEqual(2, len(self.query.plan.dimensions))
+
 
 # noinspection SqlDialectInspection,SqlNoDataSourceInspection
 class QueryBuilderValidationTests(TestCase):
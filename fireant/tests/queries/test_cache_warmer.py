@@ -0,0 +1,146 @@
+import copy
+import pickle
+import time
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+import pandas as pd
+
+import fireant as f
+from fireant.cache import TTLCache
+from fireant.exceptions import DataSetException
+from fireant.queries.cache_warmer import CacheWarmer, QueryLog
+from fireant.tests.dataset.mocks import mock_dataset
+
+
+class QueryLogTests(TestCase):
+    def test_most_frequent_queries_first(self):
+        query_log = QueryLog(10)
+        for fingerprint in ["a", "b", "b", "c", "c", "c"]:
+            query_log.record(fingerprint, fingerprint.upper())
+
+        self.assertListEqual(["C", "B"], query_log.most_frequent(2))
+
+    def test_latest_query_builder_is_kept(self):
+        query_log = QueryLog(10)
+        query_log.record("a", 1)
+        query_log.record("a", 2)
+
+        self.assertListEqual([2], query_log.most_frequent(10))
+
+    def test_least_frequent_query_is_dropped_when_full(self):
+        query_log = QueryLog(2)
+        for fingerprint in ["a", "a", "b", "c"]:
+            query_log.record(fingerprint, fingerprint.upper())
+
+        self.assertEqual(2, len(query_log))
+        self.assertListEqual(["A", "C"], query_log.most_frequent(10))
+
+    def test_copies_share_the_query_log(self):
+        query_log = QueryLog(10)
+
+        self.assertIs(query_log, copy.deepcopy({"query_log": query_log})["query_log"])
+
+    def test_pickle_keeps_settings_but_not_queries(self):
+        query_log = QueryLog(10)
+        query_log.record("a", 1)
+
+        unpickled = pickle.loads(pickle.dumps(query_log))
+
+        self.assertEqual(10, unpickled.max_size)
+        self.assertEqual(0, len(unpickled))
+
+
+class WarmResultCacheTests(TestCase):
+    def setUp(self):
+        self.dataset = copy.deepcopy(mock_dataset)
+        self.dataset.result_cache = TTLCache(60)
+        self.dataset.query_log = QueryLog(10)
+        self.result_df = pd.DataFrame({"$political_party": ["d", "r"], "$votes": [1, 2]})
+
+        patcher = patch.object(self.dataset.database, "fetch_dataframes", return_value=[self.result_df])
+        self.mock_fetch = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _query(self, *filters):
+        widget = f.Widget(self.dataset.fields.votes)
+        widget.transform = Mock(side_effect=lambda data_frame, *args: data_frame)
+        return self.dataset.query.dimension(self.dataset.fields.political_party).filter(*filters).widget(widget)
+
+    def test_most_frequent_queries_are_replayed(self):
+        frequent_query = self._query()
+        frequent_query.fetch()
+        frequent_query.fetch()
+        self._query(self.dataset.fields.political_party.isin(["d"])).fetch()
+        self.dataset.result_cache.clear()
+
+        warmed = self.dataset.warm_result_cache(top_n=1)
+
+        self.assertEqual(1, warmed)
+        self.assertEqual(3, self.mock_fetch.call_count)
+        (query,) = self.mock_fetch.call_args[0]
+        self.assertNotIn("WHERE", query)
+
+        frequent_query.fetch()
+        self.assertEqual(3, self.mock_fetch.call_count)
+
+    def test_failing_queries_are_skipped(self):
+        self._query().fetch()
+        self._query(self.dataset.fields.political_party.isin(["d"])).fetch()
+        self.mock_fetch.side_effect = [Exception("timeout"), [self.result_df]]
+
+        with self.assertLogs("fireant.queries.cache_warmer"):
+            warmed = self.dataset.warm_result_cache()
+
+        self.assertEqual(1, warmed)
+
+    def test_queries_which_can_not_be_compiled_are_skipped(self):
+        self._query().fetch()
+        broken_query = Mock(warm_result_cache=Mock(side_effect=Exception("invalid")))
+        type(broken_query).sql = property(Mock(side_effect=Exception("invalid")))
+        self.dataset.query_log.record("broken", broken_query)
+        self.dataset.query_log.record("broken", broken_query)
+
+        with self.assertLogs("fireant.queries.cache_warmer"):
+            warmed = self.dataset.warm_result_cache()
+
+        self.assertEqual(1, warmed)
+
+    def test_dataset_without_a_query_log_can_not_be_warmed(self):
+        self.dataset.query_log = None
+
+        with self.assertRaises(DataSetException):
+            self.dataset.warm_result_cache()
+
+
+class CacheWarmerTests(TestCase):
+    @patch("fireant.queries.cache_warmer.warm_result_cache")
+    def test_result_cache_is_warmed_when_started(self, mock_warm_result_cache):
+        warmer = CacheWarmer(mock_dataset, top_n=5, interval=3600, hint="warm")
+
+        warmer.start()
+        warmer.stop()
+
+        mock_warm_result_cache.assert_called_once_with(mock_dataset, 5, "warm")
+
+    @patch("fireant.queries.cache_warmer.warm_result_cache", side_effect=[Exception("no connection"), 0])
+    def test_warmer_keeps_running_after_a_failure(self, mock_warm_result_cache):
+        warmer = CacheWarmer(mock_dataset, interval=0.01)
+
+        with self.assertLogs("fireant.queries.cache_warmer"):
+            warmer.start()
+            while mock_warm_result_cache.call_count < 2:
+                time.sleep(0.01)
+            warmer.stop()
+
+    @patch("fireant.queries.cache_warmer.warm_result_cache")
+    def test_starting_a_running_warmer_does_nothing(self, mock_warm_result_cache):
+        warmer = CacheWarmer(mock_dataset, interval=3600)
+
+        warmer.start()
+        thread = warmer._thread
+        warmer.start()
+
+        self.assertIs(thread, warmer._thread)
+        warmer.stop()
+        mock_warm_result_cache.assert_called_once()
@@ -0,0 +1,171 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+from pypika import Order, Tables, functions as fn
+
+from fireant import DataSet, DataType, Database, Field, Pandas, Rollup
+from fireant.dataset.modifiers import RollupValue
+from fireant.exceptions import DataSetException
+
+
+class PrimaryDatabase(Database):
+    pass
+
+
+class SecondaryDatabase(Database):
+    pass
+
+
+t0, t1 = Tables("test0", "test1")
+primary_ds = DataSet(
+    table=t0,
+    database=PrimaryDatabase(),
+    fields=[
+        Field("timestamp", label="Timestamp", definition=t0.timestamp, data_type=DataType.date),
+        Field("account", label="Account", definition=t0.account, data_type=DataType.text),
+        Field("metric0", label="Metric0", definition=fn.Sum(t0.metric), data_type=DataType.number),
+    ],
+)
+secondary_ds = DataSet(
+    table=t1,
+    database=SecondaryDatabase(),
+    fields=[
+        Field("timestamp", label="Timestamp", definition=t1.timestamp, data_type=DataType.date),
+        Field("account", label="Account", definition=t1.account, data_type=DataType.text),
+        Field("metric1", label="Metric1", definition=fn.Sum(t1.metric), data_type=DataType.number),
+    ],
+)
+blend_ds = (
+    primary_ds.blend(secondary_ds)
+    .on_dimensions(client_side_blending=True)
+    .extra_fields(
+        Field(
+            "metric_share",
+            label="Metric Share",
+            definition=primary_ds.fields.metric0 / secondary_ds.fields.metric1,
+            data_type=DataType.number,
+        ),
+        Field(
+            "metric_abs",
+            label="Metric Abs",
+            definition=fn.Abs(primary_ds.fields.metric0),
+            data_type=DataType.number,
+        ),
+    )
+)
+
+
+def _fetch_data_frame(query):
+    # Return the data frame that would be transformed by the widgets
+    with patch("fireant.queries.builder.dataset_query_builder.transform_widgets") as mock_transform_widgets:
+        query.fetch()
+
+    return mock_transform_widgets.call_args[0][1]
+
+
+@patch.object(SecondaryDatabase, "fetch_dataframes")
+@patch.object(PrimaryDatabase, "fetch_dataframes")
+class ClientSideBlendingTests(TestCase):
+    def test_each_dataset_is_queried_on_its_own_database(self, mock_primary_fetch, mock_secondary_fetch):
+        mock_primary_fetch.return_value = [pd.DataFrame({"$account": ["a", "b"], "$metric0": [1, 2]})]
+        mock_secondary_fetch.return_value = [pd.DataFrame({"$account": ["a"], "$metric1": [4]})]
+
+        _fetch_data_frame(
+            blend_ds.query.widget(Pandas(blend_ds.fields.metric0, blend_ds.fields.metric1)).dimension(
+                blend_ds.fields.account
+            )
+        )
+
+        mock_primary_fetch.assert_called_once_with(
+            'SELECT "account" "$account",SUM("metric") "$metric0" FROM "test0" GROUP BY "$account"',
+            parse_dates={},
+        )
+        mock_secondary_fetch.assert_called_once_with(
+            'SELECT "account" "$account",SUM("metric") "$metric1" FROM "test1" GROUP BY "$account"',
+            parse_dates={},
+        )
+
+    def test_data_frames_are_left_joined_on_mapped_dimensions(self, mock_primary_fetch, mock_secondary_fetch):
+        mock_primary_fetch.return_value = [pd.DataFrame({"$account": ["a", "b", "c", None], "$metric0": [1, 2, 3, 4]})]
+        mock_secondary_fetch.return_value = [
+            pd.DataFrame({"$account": ["c", "a", "d", None], "$metric1": [30, 10, 40, 50]})
+        ]
+
+        result = _fetch_data_frame(
+            blend_ds.query.widget(Pandas(blend_ds.fields.metric0, blend_ds.fields.metric1)).dimension(
+                blend_ds.fields.account
+            )
+        )
+
+        result = result.sort_index(na_position="last")
+        self.assertListEqual(["a", "b", "c"], list(result.index[:3]))
+        self.assertTrue(pd.isnull(result.index[3]))
+        self.assertListEqual([1, 2, 3, 4], list(result["$metric0"]))
+        # NULL values of mapped dimensions do not match each other, same as in SQL
+        np.testing.assert_array_equal([10, np.nan, 30, np.nan], result["$metric1"].values)
+
+    def test_complex_blender_metric_is_evaluated_on_joined_data_frame(self, mock_primary_fetch, mock_secondary_fetch):
+        mock_primary_fetch.return_value = [pd.DataFrame({"$account": ["a", "b", "c"], "$metric0": [1, 2, 3]})]
+        mock_secondary_fetch.return_value = [pd.DataFrame({"$account": ["a", "b"], "$metric1": [4, 0]})]
+
+        result = _fetch_data_frame(
+            blend_ds.query.widget(Pandas(blend_ds.fields.metric_share)).dimension(blend_ds.fields.account)
+        )
+
+        np.testing.assert_array_equal([0.25, np.nan, np.nan], result.sort_index()["$metric_share"].values)
+
+    def test_orders_are_applied_to_blended_data_frame(self, mock_primary_fetch, mock_secondary_fetch):
+        mock_primary_fetch.return_value = [pd.DataFrame({"$account": ["a", "b"], "$metric0": [1, 2]})]
+        mock_secondary_fetch.return_value = [pd.DataFrame({"$account": ["a", "b"], "$metric1": [4, 8]})]
+
+        result = _fetch_data_frame(
+            blend_ds.query.widget(Pandas(blend_ds.fields.metric0))
+            .dimension(blend_ds.fields.account)
+            .orderby(blend_ds.fields.metric1, orientation=Order.desc)
+        )
+
+        self.assertListEqual(["b", "a"], list(result.index))
+
+    def test_totals_query_sets_are_blended_separately(self, mock_primary_fetch, mock_secondary_fetch):
+        mock_primary_fetch.return_value = [
+            pd.DataFrame({"$account": ["a", "b"], "$metric0": [1, 2]}),
+            pd.DataFrame({"$account": [RollupValue.CONSTANT], "$metric0": [3]}),
+        ]
+        mock_secondary_fetch.return_value = [
+            pd.DataFrame({"$account": ["a", "b"], "$metric1": [4, 8]}),
+            pd.DataFrame({"$account": [RollupValue.CONSTANT], "$metric1": [12]}),
+        ]
+
+        result = _fetch_data_frame(
+            blend_ds.query.widget(Pandas(blend_ds.fields.metric_share)).dimension(Rollup(blend_ds.fields.account))
+        )
+
+        self.assertEqual(2, len(mock_primary_fetch.call_args[0]))
+        self.assertListEqual(["a", "b", "~~totals"], sorted(result.index))
+        self.assertListEqual([0.25, 0.25, 0.25], list(result["$metric_share"]))
+
+    def test_datasets_without_mapped_dimensions_are_cross_joined(self, mock_primary_fetch, mock_secondary_fetch):
+        mock_primary_fetch.return_value = [pd.DataFrame({"$metric0": [1]})]
+        mock_secondary_fetch.return_value = [pd.DataFrame({"$metric1": [4]})]
+
+        result = _fetch_data_frame(blend_ds.query.widget(Pandas(blend_ds.fields.metric_share)))
+
+        self.assertListEqual([0.25], list(result["$metric_share"]))
+
+    def test_unsupported_definition_raises_exception(self, mock_primary_fetch, mock_secondary_fetch):
+        mock_primary_fetch.return_value = [pd.DataFrame({"$metric0": [-1]})]
+        mock_secondary_fetch.return_value = []
+
+        with self.assertRaises(DataSetException):
+            _fetch_data_frame(blend_ds.query.widget(Pandas(blend_ds.fields.metric_abs)))
+
+    def test_sql_is_unchanged(self, mock_primary_fetch, mock_secondary_fetch):
+        query = blend_ds.query.widget(Pandas(blend_ds.fields.metric_share)).dimension(blend_ds.fields.account)
+        sql_blend_ds = primary_ds.blend(secondary_ds).on_dimensions().extra_fields(blend_ds.fields.metric_share)
+        sql_query = sql_blend_ds.query.widget(Pandas(sql_blend_ds.fields.metric_share)).dimension(
+            sql_blend_ds.fields.account
+        )
+
+        self.assertEqual([str(q) for q in sql_query.sql], [str(q) for q in query.sql])
@@ -9,6 +9,8 @@ from unittest.mock import (
 import pandas as pd
 
 from fireant import DataSet, DataType, Field
+from fireant.cache import TTLCache
+from fireant.queries.builder import fetch_choices_for_dimensions
 from fireant.tests.dataset.matchers import (
     FieldMatcher,
     PypikaQueryMatcher,
@@ -344,3 +346,207 @@ class DimensionsChoicesFetchTests(TestCase):
         self.assertTrue(
             pd.Series(['a', 'b', 'c'], index=['a', 'b', 'c'], name='political_party').equals(result['data'])
         )
+
+
+def _make_cached_dataset():
+    return DataSet(
+        table=politicians_table,
+        database=test_database,
+        choices_cache_ttl=60,
+        fields=[
+            Field(
+                "political_party",
+                label="Party",
+                definition=politicians_table.political_party,
+                data_type=DataType.text,
+            ),
+            Field(
+                "state",
+                label="State",
+                definition=politicians_table.state,
+                data_type=DataType.text,
+            ),
+        ],
+    )
+
+
+def _make_choices_df(values):
+    return pd.DataFrame({'$political_party': values}).set_index('$political_party')
+
+
+# noinspection SqlDialectInspection,SqlNoDataSourceInspection
+@patch("fireant.queries.builder.dimension_choices_query_builder.fetch_data")
+class DimensionsChoicesCacheTests(TestCase):
+    def setUp(self):
+        self.dataset = _make_cached_dataset()
+
+    def test_choices_are_fetched_once_for_the_same_filters(self, mock_fetch_data: Mock):
+        mock_fetch_data.side_effect = lambda *args: (2, _make_choices_df(['d', 'r']))
+
+        first = self.dataset.fields.political_party.choices.fetch()
+        second = self.dataset.fields.political_party.choices.fetch()
+
+        mock_fetch_data.assert_called_once()
+        self.assertListEqual(['d', 'r'], list(first))
+        self.assertListEqual(['d', 'r'], list(second))
+
+    def test_choices_are_cached_per_filters(self, mock_fetch_data: Mock):
+        mock_fetch_data.side_effect = lambda *args: (2, _make_choices_df(['d', 'r']))
+        choices = self.dataset.fields.political_party.choices
+
+        choices.fetch()
+        choices.filter(self.dataset.fields.state.isin(['Texas'])).fetch()
+
+        self.assertEqual(2, mock_fetch_data.call_count)
+
+    def test_choices_are_not_cached_without_ttl(self, mock_fetch_data: Mock):
+        mock_fetch_data.side_effect = lambda *args: (2, _make_choices_df(['d', 'r']))
+
+        mock_dataset.fields.political_party.choices.fetch()
+        mock_dataset.fields.political_party.choices.fetch()
+
+        self.assertEqual(2, mock_fetch_data.call_count)
+
+    def test_cached_choices_for_hint_table_do_not_fetch_hint_columns(self, mock_fetch_data: Mock):
+        mock_fetch_data.side_effect = lambda *args: (2, _make_choices_df(['d', 'r']))
+        choices = mock_hint_dataset.fields.political_party.choices.filter(
+            mock_hint_dataset.fields["election-year"].isin([1992])
+        )
+
+        with patch.object(mock_hint_dataset, "choices_cache", TTLCache(60)), patch.object(
+            mock_hint_dataset.database, "get_column_definitions", return_value=[["election_year", "int"]]
+        ) as mock_get_column_definitions:
+            choices.fetch()
+            result = choices.search('d')
+
+        mock_fetch_data.assert_called_once()
+        mock_get_column_definitions.assert_called_once()
+        self.assertListEqual(['d'], list(result))
+
+    def test_search_uses_cached_choices(self, mock_fetch_data: Mock):
+        mock_fetch_data.side_effect = lambda *args: (4, _make_choices_df(['Dem', 'Democrat', 'Ind', 'Rep']))
+        choices = self.dataset.fields.political_party.choices
+
+        choices.fetch()
+        result = choices.search('Dem')
+
+        mock_fetch_data.assert_called_once()
+        self.assertListEqual(['Dem', 'Democrat'], list(result))
+
+    def test_search_cached_choices_with_limit(self, mock_fetch_data: Mock):
+        mock_fetch_data.side_effect = lambda *args: (4, _make_choices_df(['Dem', 'Democrat', 'Ind', 'Rep']))
+        choices = self.dataset.fields.political_party.choices
+
+        choices.fetch()
+
+        self.assertListEqual(['Dem'], list(choices.search('D', limit=1)))
+        self.assertListEqual([], list(choices.search('X')))
+
+    def test_search_queries_with_like_prefix_when_cache_is_cold(self, mock_fetch_data: Mock):
+        mock_fetch_data.side_effect = lambda *args: (1, _make_choices_df(['Dem_1']))
+
+        result = self.dataset.fields.political_party.choices.search('Dem_', limit=10)
+
+        self.assertListEqual(['Dem_1'], list(result))
+        mock_fetch_data.assert_called_once_with(
+            ANY,
+            [
+                PypikaQueryMatcher(
+                    "SELECT "
+                    '"political_party" "$political_party" '
+                    'FROM "politics"."politician" '
+                    'WHERE NOT "political_party" IS NULL '
+                    "AND CAST(\"political_party\" AS VARCHAR) LIKE 'Dem!_%' ESCAPE '!' "
+                    'GROUP BY "$political_party" '
+                    'ORDER BY "$political_party" '
+                    'LIMIT 10'
+                )
+            ],
+            FieldMatcher(self.dataset.fields.political_party),
+        )
+
+    def test_search_does_not_use_truncated_cached_choices(self, mock_fetch_data: Mock):
+        mock_fetch_data.side_effect = lambda *args: (test_database.max_result_set_size, _make_choices_df(['Dem']))
+        choices = self.dataset.fields.political_party.choices
+
+        choices.fetch()
+        choices.search('Dem')
+
+        self.assertEqual(2, mock_fetch_data.call_count)
+
+
+# noinspection SqlDialectInspection,SqlNoDataSourceInspection
+@patch.object(type(test_database), "fetch_dataframes")
+class DataSetFetchChoicesTests(TestCase):
+    def test_queries_for_all_dimensions_are_fetched_together(self, mock_fetch_dataframes: Mock):
+        mock_fetch_dataframes.return_value = [
+            pd.DataFrame({'$political_party': ['d', 'r']}),
+            pd.DataFrame({'$state': ['Texas']}),
+        ]
+
+        result = mock_dataset.fetch_choices(mock_dataset.fields.political_party, mock_dataset.fields.state)
+
+        mock_fetch_dataframes.assert_called_once_with(
+            'SELECT "political_party" "$political_party" '
+            'FROM "politics"."politician" '
+            'WHERE NOT "political_party" IS NULL '
+            'GROUP BY "$political_party" '
+            'ORDER BY "$political_party"',
+            'SELECT "state"."state_name" "$state" '
+            'FROM "politics"."politician" '
+            'FULL OUTER JOIN "locations"."district" ON "politician"."district_id"="district"."id" '
+            'JOIN "locations"."state" ON "district"."state_id"="state"."id" '
+            'WHERE NOT "state"."state_name" IS NULL '
+            'GROUP BY "$state" '
+            'ORDER BY "$state"',
+            parse_dates={},
+        )
+        self.assertListEqual(['political_party', 'state'], list(result))
+        self.assertListEqual(['d', 'r'], list(result['political_party']))
+        self.assertListEqual(['Texas'], list(result['state']))
+
+    def test_filters_and_force_include_are_applied_per_dimension(self, mock_fetch_dataframes: Mock):
+        mock_fetch_dataframes.return_value = [
+            pd.DataFrame({'$political_party': ['r', 'd']}),
+            pd.DataFrame({'$state': ['Texas']}),
+        ]
+
+        mock_dataset.fetch_choices(
+            mock_dataset.fields.political_party,
+            mock_dataset.fields.state,
+            filters=[mock_dataset.fields['candidate-name'].isin(['Bill Clinton'])],
+            force_include={'political_party': ['r']},
+        )
+
+        queries = mock_fetch_dataframes.call_args[0]
+        self.assertIn('"candidate_name" IN (\'Bill Clinton\')', queries[0])
+        self.assertIn('ORDER BY CAST("political_party" AS VARCHAR) IN (\'r\') DESC', queries[0])
+        self.assertIn('"candidate_name" IN (\'Bill Clinton\')', queries[1])
+        self.assertNotIn('DESC', queries[1])
+
+    def test_choices_builders_can_be_a_generator(self, mock_fetch_dataframes: Mock):
+        mock_fetch_dataframes.return_value = [
+            pd.DataFrame({'$political_party': ['d', 'r']}),
+            pd.DataFrame({'$state': ['Texas']}),
+        ]
+        fields = [mock_dataset.fields.political_party, mock_dataset.fields.state]
+
+        result = fetch_choices_for_dimensions(field.choices for field in fields)
+
+        self.assertListEqual(['political_party', 'state'], list(result))
+        self.assertListEqual(['d', 'r'], list(result['political_party']))
+
+    def test_cached_choices_are_not_fetched(self, mock_fetch_dataframes: Mock):
+        dataset = _make_cached_dataset()
+        mock_fetch_dataframes.side_effect = [
+            [pd.DataFrame({'$political_party': ['d', 'r']})],
+            [pd.DataFrame({'$state': ['Texas']})],
+        ]
+
+        dataset.fetch_choices(dataset.fields.political_party)
+        result = dataset.fetch_choices(dataset.fields.political_party, dataset.fields.state)
+
+        self.assertEqual(2, mock_fetch_dataframes.call_count)
+        self.assertEqual(1, len(mock_fetch_dataframes.call_args[0]))
+        self.assertListEqual(['d', 'r'], list(result['political_party']))
+        self.assertListEqual(['Texas'], list(result['state']))
@@ -1,4 +1,8 @@
 import copy
+import re
+import threading
+from datetime import date
+from io import StringIO
 from unittest import TestCase
 from unittest.mock import ANY, MagicMock, Mock, patch
 
@@ -6,13 +10,22 @@ import pandas as pd
 from pypika import Order, Table
 
 import fireant as f
-from fireant import DataSet, DataType, Field, Share
+from fireant import DataSet, DataType, Field, Rollup, Share
+from fireant.cache import TTLCache
 from fireant.dataset.filters import ComparisonOperator
+from fireant.dataset.modifiers import RollupValue
 from fireant.dataset.references import ReferenceFilter
+from fireant.queries.builder.query_builder import QueryException
 from fireant.queries.sets import _make_set_dimension
 from fireant.tests.database.mock_database import TestDatabase
 from fireant.tests.dataset.matchers import FieldMatcher, PypikaQueryMatcher
-from fireant.tests.dataset.mocks import mock_category_annotation_dataset, mock_dataset, mock_date_annotation_dataset
+from fireant.tests.dataset.mocks import (
+    dimx1_str_totals_df,
+    dimx2_date_str_df,
+    mock_category_annotation_dataset,
+    mock_dataset,
+    mock_date_annotation_dataset,
+)
 
 
 # noinspection SqlDialectInspection,SqlNoDataSourceInspection
@@ -316,9 +329,10 @@ class QueryBuilderAnnotationTests(TestCase):
     def get_fetch_call_args(self, mock_fetch_data):
         self.assertEqual(mock_fetch_data.call_count, 2)
 
-        fetch_annotation_data, fetch_data = mock_fetch_data.mock_calls[:2]
-        _, fetch_annotation_args, _ = fetch_annotation_data
-        _, fetch_data_args, _ = fetch_data
+        # The annotation is fetched concurrently, so the calls are told apart by their arguments instead of their order
+        fetch_annotation_args, fetch_data_args = sorted(
+            [args for _, args, _ in mock_fetch_data.mock_calls[:2]], key=len
+        )
 
         return fetch_annotation_args, fetch_data_args
 
@@ -488,6 +502,34 @@ class QueryBuilderAnnotationTests(TestCase):
             [],
         )
 
+    def test_annotation_is_fetched_concurrently_with_dataset_queries(self, mock_fetch_data: Mock):
+        threads = {}
+
+        def record_thread(*args):
+            threads["annotation" if len(args) == 3 else "data"] = threading.current_thread()
+            return mock_fetch_data.return_value
+
+        mock_fetch_data.side_effect = record_thread
+        dims = [mock_date_annotation_dataset.fields.timestamp]
+
+        mock_date_annotation_dataset.query.widget(self.mock_widget).dimension(*dims).fetch()
+
+        self.assertIs(threading.current_thread(), threads["data"])
+        self.assertIsNot(threading.current_thread(), threads["annotation"])
+
+    def test_fetch_annotation_is_cached_with_cache_ttl(self, mock_fetch_data: Mock):
+        dataset = copy.deepcopy(mock_date_annotation_dataset)
+        dataset.annotation.cache = TTLCache(60)
+        widget = f.Widget(dataset.fields.votes)
+        widget.transform = Mock()
+
+        for _ in range(2):
+            dataset.query.widget(widget).dimension(dataset.fields.timestamp).fetch()
+
+        # The dataset query is fetched twice and the annotation query once
+        self.assertEqual(3, mock_fetch_data.call_count)
+        self.assertEqual(1, len(dataset.annotation.cache))
+
     def test_fetch_annotation_no_dimension(self, mock_fetch_data: Mock):
         dims = []
 
@@ -599,3 +641,156 @@ class QueryBuilderAnnotationTests(TestCase):
             ),
             fetch_data_args,
         )
+
+
+class QueryBuilderExportCSVTests(TestCase):
+    @patch("fireant.queries.builder.dataset_query_builder.fetch_data")
+    @patch.object(type(mock_dataset.database), "fetch_dataframe_chunks")
+    def test_streams_chunks_into_file_without_max_result_set_size_limit(self, mock_fetch_chunks, mock_fetch_data):
+        mock_fetch_chunks.return_value = iter(
+            [
+                pd.DataFrame({"$political_party": ["d", "i"], "$votes": [1, 2]}),
+                pd.DataFrame({"$political_party": ["r"], "$votes": [3]}),
+            ]
+        )
+        file = StringIO()
+
+        mock_dataset.query.dimension(mock_dataset.fields.political_party).widget(
+            f.CSV(mock_dataset.fields.votes)
+        ).export_csv(file, chunksize=2)
+
+        mock_fetch_data.assert_not_called()
+        query, chunksize = mock_fetch_chunks.call_args[0]
+        self.assertEqual(2, chunksize)
+        self.assertNotIn("LIMIT", query)
+        self.assertEqual("Party,Votes\nd,1\ni,2\nr,3\n", file.getvalue())
+
+    @patch("fireant.queries.builder.dataset_query_builder.fetch_data")
+    @patch.object(type(mock_dataset.database), "fetch_dataframe_chunks")
+    def test_falls_back_to_fetching_whole_result_set_with_totals(self, mock_fetch_chunks, mock_fetch_data):
+        mock_fetch_data.return_value = 100, dimx1_str_totals_df
+        file = StringIO()
+
+        mock_dataset.query.dimension(Rollup(mock_dataset.fields.political_party)).widget(
+            f.CSV(mock_dataset.fields.votes)
+        ).export_csv(file)
+
+        mock_fetch_chunks.assert_not_called()
+        self.assertIn("Totals,111674336\n", file.getvalue())
+
+    @patch("fireant.queries.builder.dataset_query_builder.fetch_data")
+    @patch.object(type(mock_dataset.database), "fetch_dataframe_chunks")
+    def test_falls_back_to_fetching_whole_result_set_with_pivot(self, mock_fetch_chunks, mock_fetch_data):
+        mock_fetch_data.return_value = 100, dimx2_date_str_df
+        widget = f.CSV(mock_dataset.fields.votes, pivot=[mock_dataset.fields.political_party])
+
+        mock_dataset.query.dimension(mock_dataset.fields.timestamp, mock_dataset.fields.political_party).widget(
+            widget
+        ).export_csv(StringIO())
+
+        mock_fetch_chunks.assert_not_called()
+        mock_fetch_data.assert_called_once()
+
+    def test_requires_csv_widget(self):
+        with self.assertRaises(QueryException):
+            mock_dataset.query.dimension(mock_dataset.fields.political_party).widget(
+                f.Pandas(mock_dataset.fields.votes)
+            ).export_csv(StringIO())
+
+
+@patch("fireant.queries.builder.dataset_query_builder.paginate")
+@patch("fireant.queries.builder.dataset_query_builder.fetch_data", return_value=(100, MagicMock()))
+class QueryBuilderWidgetTransformTests(TestCase):
+    def _make_widgets(self):
+        widgets = [f.Widget(mock_dataset.fields.votes), f.Widget(mock_dataset.fields.wins)]
+        threads = []
+        for i, widget in enumerate(widgets):
+            widget.transform = Mock(side_effect=lambda *args, i=i: threads.append(threading.current_thread()) or i)
+        return widgets, threads
+
+    def test_widgets_are_transformed_in_calling_thread_by_default(self, mock_fetch_data: Mock, mock_paginate: Mock):
+        widgets, threads = self._make_widgets()
+
+        result = mock_dataset.query.dimension(mock_dataset.fields.timestamp).widget(*widgets).fetch()
+
+        self.assertListEqual([0, 1], result)
+        self.assertListEqual([threading.current_thread()] * 2, threads)
+
+    def test_widgets_are_transformed_concurrently_when_enabled(self, mock_fetch_data: Mock, mock_paginate: Mock):
+        widgets, threads = self._make_widgets()
+        dataset = copy.deepcopy(mock_dataset)
+        dataset.concurrent_widget_transforms = True
+
+        result = dataset.query.dimension(dataset.fields.timestamp).widget(*widgets).fetch()
+
+        self.assertListEqual([0, 1], result)
+        self.assertNotIn(threading.current_thread(), threads)
+        for widget in widgets:
+            widget.transform.assert_called_once_with(mock_paginate.return_value, ANY, [], None)
+
+
+class QueryBuilderClientSideTotalsTests(TestCase):
+    def setUp(self):
+        self.dataset = copy.deepcopy(mock_dataset)
+        self.dataset.client_side_totals = True
+        self.base_df = pd.DataFrame({"$political_party": ["d", "r"], "$votes": [1, 2], "$voters": [10, 20]})
+
+    def _fetch(self, *metrics):
+        (result,) = (
+            self.dataset.query.widget(f.Pandas(*metrics)).dimension(Rollup(self.dataset.fields.political_party)).fetch()
+        )
+        return result
+
+    def test_totals_are_computed_from_the_base_query(self):
+        with patch.object(self.dataset.database, "fetch_dataframes", return_value=[self.base_df]) as mock_fetch:
+            result = self._fetch(self.dataset.fields.votes, self.dataset.fields.voters)
+
+        mock_fetch.assert_called_once()
+        self.assertEqual(1, len(mock_fetch.call_args[0]))
+        self.assertListEqual(["3", "30"], list(result.loc["Totals"]))
+
+    def test_totals_are_queried_when_the_base_query_is_truncated(self):
+        self.dataset.database.max_result_set_size = 2
+        totals_df = pd.DataFrame({"$political_party": [RollupValue.CONSTANT], "$votes": [5], "$voters": [50]})
+
+        with patch.object(
+            self.dataset.database, "fetch_dataframes", side_effect=[[self.base_df], [totals_df]]
+        ) as mock_fetch:
+            result = self._fetch(self.dataset.fields.votes, self.dataset.fields.voters)
+
+        self.assertEqual(2, mock_fetch.call_count)
+        self.assertListEqual(["5", "50"], list(result.loc["Totals"]))
+
+    def test_totals_are_queried_for_metrics_that_can_not_be_aggregated_again(self):
+        base_df = pd.DataFrame({"$political_party": ["d", "r"], "$turnout": [0.1, 0.2]})
+        totals_df = pd.DataFrame({"$political_party": [RollupValue.CONSTANT], "$turnout": [0.15]})
+
+        with patch.object(self.dataset.database, "fetch_dataframes", return_value=[base_df, totals_df]) as mock_fetch:
+            result = self._fetch(self.dataset.fields.turnout)
+
+        mock_fetch.assert_called_once()
+        self.assertEqual(2, len(mock_fetch.call_args[0]))
+        self.assertListEqual(["0.15%"], list(result.loc["Totals"]))
+
+
+class QueryBuilderRollingOperationTests(TestCase):
+    def _fetch_dataframes(self, query, **kwargs):
+        # Returns a row for every day in the date range of the query, like the database would
+        start, stop = re.search(r"BETWEEN '([\d-]+)' AND '([\d-]+)'", query).groups()
+        timestamps = pd.date_range(start, stop)
+        return [pd.DataFrame({"$timestamp": timestamps, "$votes": range(len(timestamps))})]
+
+    def test_rolling_operation_returns_the_dates_of_the_filter(self):
+        widget = f.Widget(f.RollingMean(mock_dataset.fields.votes, 3, 3))
+        widget.transform = Mock(side_effect=lambda data_frame, *args: data_frame)
+        query = (
+            mock_dataset.query.widget(widget)
+            .dimension(f.day(mock_dataset.fields.timestamp))
+            .filter(mock_dataset.fields.timestamp.between(date(2018, 1, 1), date(2018, 1, 10)))
+        )
+
+        with patch.object(mock_dataset.database, "fetch_dataframes", side_effect=self._fetch_dataframes):
+            (data_frame,) = query.fetch()
+
+        self.assertListEqual(list(pd.date_range("2018-01-01", "2018-01-10")), sorted(data_frame.index))
+        self.assertEqual(2.0, data_frame["$rollingmean(votes,3)"][pd.Timestamp("2018-01-02")])
@@ -10,6 +10,7 @@ import pandas as pd
 from pandas.testing import assert_frame_equal
 from pypika import Order
 
+from fireant import Aggregation
 from fireant.queries.pagination import paginate
 from fireant.tests.dataset.mocks import (
     dimx2_date_bool_df,
@@ -290,3 +291,15 @@ class GroupPaginationTests(TestCase):
         )
         # This created expected dataframe should match the result
         assert_frame_equal(expected, result)
+
+    def test_group_pagination_with_order_on_metric_aggregates_according_to_its_aggregation(self):
+        index_values = [['2016-10-03', '2016-10-04'], ['General', 'City']]
+        # General has the larger sum of $seeds but City has the smaller minimum
+        data_values = [10, 3, 20, 30]
+        idx = pd.MultiIndex.from_product(index_values, names=['$created_time', '$category'])
+        df = pd.DataFrame(data_values, idx, ['$seeds'])
+
+        result = paginate(df, [mock_chart_widget], [(Mock(alias="seeds", aggregation=Aggregation.min), Order.asc)])
+
+        expected = df.sort_values(by=['$created_time', '$category'], ascending=[True, True])
+        assert_frame_equal(expected, result)
@@ -0,0 +1,558 @@
+import copy
+from datetime import datetime, timedelta
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+import pandas as pd
+from pypika import functions as fn
+
+import fireant as f
+from fireant import Aggregation, DayOverDay, Field, Rollup
+from fireant.cache import TTLCache
+from fireant.queries.result_cache import drop_metrics, find_metric_keys, reaggregate_interval
+from fireant.tests.dataset.mocks import mock_dataset, politicians_table, voters_table
+
+
+class QueryBuilderResultCacheTests(TestCase):
+    def setUp(self):
+        self.dataset = copy.deepcopy(mock_dataset)
+        self.dataset.result_cache = TTLCache(60)
+        self.result_df = pd.DataFrame({"$political_party": ["d", "r"], "$votes": [1, 2], "$wins": [3, 4]}).set_index(
+            "$political_party"
+        )
+
+        patcher = patch.object(self.dataset.database, "fetch_dataframes", side_effect=self._fetch_dataframes)
+        self.mock_fetch = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _fetch_dataframes(self, *queries, **kwargs):
+        return [self.result_df.reset_index() for _ in queries]
+
+    def _fetch(self, *metrics, query=None):
+        widget = f.Widget(*metrics)
+        widget.transform = Mock(side_effect=lambda data_frame, *args: data_frame)
+
+        query = query or self.dataset.query.dimension(self.dataset.fields.political_party)
+        (data_frame,) = query.widget(widget).fetch()
+        return data_frame
+
+    def test_query_for_a_subset_of_metrics_is_answered_from_the_cache(self):
+        self._fetch(self.dataset.fields.votes, self.dataset.fields.wins)
+        data_frame = self._fetch(self.dataset.fields.votes)
+
+        self.mock_fetch.assert_called_once()
+        self.assertListEqual(["$votes"], list(data_frame.columns))
+        self.assertListEqual([1, 2], sorted(data_frame["$votes"]))
+
+    def test_query_for_a_superset_of_metrics_is_executed(self):
+        self._fetch(self.dataset.fields.votes)
+        self._fetch(self.dataset.fields.votes, self.dataset.fields.wins)
+        self._fetch(self.dataset.fields.wins)
+
+        self.assertEqual(2, self.mock_fetch.call_count)
+
+    def test_cached_data_frame_is_not_changed_by_queries(self):
+        self._fetch(self.dataset.fields.votes, self.dataset.fields.wins)
+        data_frame = self._fetch(self.dataset.fields.votes)
+        data_frame["$votes"] = 0
+
+        self.assertListEqual([1, 2], sorted(self._fetch(self.dataset.fields.votes)["$votes"]))
+
+    def test_queries_with_different_filters_are_not_answered_from_the_cache(self):
+        self._fetch(self.dataset.fields.votes, self.dataset.fields.wins)
+        query = self.dataset.query.dimension(self.dataset.fields.political_party).filter(
+            self.dataset.fields.political_party.isin(["d"])
+        )
+        self._fetch(self.dataset.fields.votes, query=query)
+
+        self.assertEqual(2, self.mock_fetch.call_count)
+
+    def test_queries_with_different_joins_are_not_answered_from_the_cache(self):
+        # Joining the voter table for the voters metric changes the rows the votes are summed over
+        self._fetch(self.dataset.fields.votes, self.dataset.fields.voters)
+        self._fetch(self.dataset.fields.votes)
+
+        self.assertEqual(2, self.mock_fetch.call_count)
+
+    def test_truncated_result_sets_are_not_cached(self):
+        self.dataset.database.max_result_set_size = 2
+
+        self._fetch(self.dataset.fields.votes, self.dataset.fields.wins)
+        self._fetch(self.dataset.fields.votes)
+
+        self.assertEqual(2, self.mock_fetch.call_count)
+
+    def test_queries_limited_by_the_query_builder_are_not_cached(self):
+        query = self.dataset.query.dimension(self.dataset.fields.political_party).limit_query(10)
+
+        self._fetch(self.dataset.fields.votes, query=query)
+
+        self.assertEqual(0, len(self.dataset.result_cache))
+
+    def test_always_query_all_metrics_selects_metrics_which_do_not_need_joins(self):
+        self.dataset.always_query_all_metrics = True
+
+        data_frame = self._fetch(self.dataset.fields.votes)
+        self._fetch(self.dataset.fields.wins)
+
+        self.mock_fetch.assert_called_once()
+        (query,) = self.mock_fetch.call_args[0]
+        self.assertIn('"$wins"', query)
+        self.assertIn('"$wins_with_style"', query)
+        self.assertNotIn('"$voters"', query)
+        self.assertListEqual(["$votes"], list(data_frame.columns))
+
+
+class FindMetricKeysTests(TestCase):
+    def test_metrics_with_the_same_alias_and_a_different_definition_have_different_keys(self):
+        max_votes = Field("votes", definition=fn.Max(politicians_table.votes))
+
+        self.assertNotEqual(
+            find_metric_keys([], [mock_dataset.fields.votes], []), find_metric_keys([], [max_votes], [])
+        )
+
+    def test_fields_only_selected_for_ordering_are_included(self):
+        dimensions = [mock_dataset.fields.political_party]
+        orders = [(mock_dataset.fields.political_party, None), (mock_dataset.fields.wins, None)]
+
+        metric_keys = find_metric_keys(dimensions, [mock_dataset.fields.votes], orders)
+
+        self.assertSetEqual({"votes", "wins"}, {alias for alias, _ in metric_keys})
+
+
+class DropMetricsTests(TestCase):
+    def test_drops_the_columns_of_metrics_and_their_references(self):
+        reference = DayOverDay(mock_dataset.fields.timestamp, delta=True)
+        data_frame = pd.DataFrame(
+            [[1, 2, 3, 4, 5, 6]],
+            columns=["$votes", "$votes_dod", "$votes_dod_delta", "$wins", "$wins_dod", "$wins_dod_delta"],
+        )
+        metric_keys = find_metric_keys([], [mock_dataset.fields.wins], [])
+
+        result = drop_metrics(data_frame, metric_keys, [reference])
+
+        self.assertListEqual(["$votes", "$votes_dod", "$votes_dod_delta"], list(result.columns))
+
+
+class QueryBuilderReaggregationTests(TestCase):
+    def setUp(self):
+        self.dataset = copy.deepcopy(mock_dataset).extra_fields(
+            Field("max_votes", definition=fn.Max(politicians_table.votes)),
+            Field("avg_votes", definition=fn.Avg(politicians_table.votes)),
+        )
+        self.dataset.result_cache = TTLCache(60)
+        self.day_df = pd.DataFrame(
+            {
+                "$timestamp": pd.to_datetime(["2020-01-04", "2020-01-04", "2020-01-05", "2020-01-06"]),
+                "$political_party": ["d", "r", "d", "d"],
+                "$votes": [1, 2, 4, 8],
+                "$max_votes": [1, 2, 4, 8],
+                "$avg_votes": [1, 2, 4, 8],
+            }
+        )
+
+        patcher = patch.object(self.dataset.database, "fetch_dataframes", return_value=[self.day_df])
+        self.mock_fetch = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _fetch(self, timestamp, *metrics):
+        widget = f.Widget(*metrics)
+        widget.transform = Mock(side_effect=lambda data_frame, *args: data_frame)
+
+        query = self.dataset.query.dimension(timestamp, self.dataset.fields.political_party)
+        (data_frame,) = query.widget(widget).fetch()
+        return data_frame
+
+    def test_coarser_interval_is_aggregated_from_a_cached_finer_interval(self):
+        self._fetch(f.day(self.dataset.fields.timestamp), self.dataset.fields.votes, self.dataset.fields.max_votes)
+        data_frame = self._fetch(f.week(self.dataset.fields.timestamp), self.dataset.fields.votes)
+
+        self.mock_fetch.assert_called_once()
+        self.assertListEqual(["$votes"], list(data_frame.columns))
+        self.assertDictEqual(
+            {
+                (pd.Timestamp("2019-12-30"), "d"): 5,
+                (pd.Timestamp("2019-12-30"), "r"): 2,
+                (pd.Timestamp("2020-01-06"), "d"): 8,
+            },
+            data_frame["$votes"].to_dict(),
+        )
+
+    def test_metrics_are_aggregated_according_to_their_aggregation(self):
+        self._fetch(f.day(self.dataset.fields.timestamp), self.dataset.fields.votes, self.dataset.fields.max_votes)
+        data_frame = self._fetch(f.month(self.dataset.fields.timestamp), self.dataset.fields.max_votes)
+
+        self.mock_fetch.assert_called_once()
+        self.assertDictEqual(
+            {(pd.Timestamp("2020-01-01"), "d"): 8, (pd.Timestamp("2020-01-01"), "r"): 2},
+            data_frame["$max_votes"].to_dict(),
+        )
+
+    def test_metrics_which_can_not_be_aggregated_again_are_queried(self):
+        self._fetch(f.day(self.dataset.fields.timestamp), self.dataset.fields.avg_votes)
+        self._fetch(f.week(self.dataset.fields.timestamp), self.dataset.fields.avg_votes)
+
+        self.assertEqual(2, self.mock_fetch.call_count)
+
+    def test_intervals_which_do_not_nest_are_queried(self):
+        self._fetch(f.week(self.dataset.fields.timestamp), self.dataset.fields.votes)
+        self._fetch(f.month(self.dataset.fields.timestamp), self.dataset.fields.votes)
+
+        self.assertEqual(2, self.mock_fetch.call_count)
+
+    def test_totals_of_the_datetime_dimension_are_kept(self):
+        totals_df = pd.DataFrame(
+            {"$timestamp": ["_FIREANT_ROLLUP_VALUE_"], "$political_party": ["_FIREANT_ROLLUP_VALUE_"], "$votes": [15]}
+        )
+        self.mock_fetch.return_value = [self.day_df[["$timestamp", "$political_party", "$votes"]], totals_df]
+
+        self._fetch(Rollup(f.day(self.dataset.fields.timestamp)), self.dataset.fields.votes)
+        data_frame = self._fetch(Rollup(f.week(self.dataset.fields.timestamp)), self.dataset.fields.votes)
+
+        self.mock_fetch.assert_called_once()
+        self.assertEqual(15, data_frame["$votes"][(pd.Timestamp.max, "~~totals")])
+        self.assertEqual(5, data_frame["$votes"][(pd.Timestamp("2019-12-30"), "d")])
+
+
+class ReaggregateIntervalTests(TestCase):
+    def test_aggregated_result_set_is_sorted(self):
+        data_frame = pd.DataFrame(
+            {
+                "$timestamp": pd.to_datetime(["2020-01-04", "2020-01-05", "2020-01-06"]),
+                "$political_party": ["r", "d", "r"],
+                "$votes": [1, 2, 4],
+            }
+        ).set_index(["$timestamp", "$political_party"])
+
+        aggregated = reaggregate_interval(
+            data_frame, "$timestamp", "month", mock_dataset.database, {"$votes": Aggregation.sum}
+        )
+
+        self.assertListEqual(
+            [(pd.Timestamp("2020-01-01"), "d"), (pd.Timestamp("2020-01-01"), "r")], list(aggregated.index)
+        )
+        self.assertListEqual([2, 5], list(aggregated["$votes"]))
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class QueryBuilderIncrementalRefreshTests(TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.dataset = copy.deepcopy(mock_dataset).extra_fields(
+            Field("avg_votes", definition=fn.Avg(politicians_table.votes))
+        )
+        self.dataset.result_cache = TTLCache(3600, clock=self.clock)
+        self.dataset.incremental_refresh_ttl = 60
+
+        self.cached_df = pd.DataFrame(
+            {
+                "$timestamp": pd.to_datetime(["2020-01-04", "2020-01-05", "2020-01-06"]),
+                "$political_party": ["d", "d", "d"],
+                "$votes": [1, 2, 4],
+            }
+        )
+        self.fresh_df = pd.DataFrame(
+            {
+                "$timestamp": pd.to_datetime(["2020-01-06", "2020-01-07"]),
+                "$political_party": ["d", "d"],
+                "$votes": [5, 8],
+            }
+        )
+
+        patcher = patch.object(
+            self.dataset.database, "fetch_dataframes", side_effect=[[self.cached_df], [self.fresh_df]]
+        )
+        self.mock_fetch = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _query(self, *metrics, timestamp=None, stop=datetime(2020, 1, 31)):
+        widget = f.Widget(*(metrics or [self.dataset.fields.votes]))
+        widget.transform = Mock(side_effect=lambda data_frame, *args: data_frame)
+
+        return (
+            self.dataset.query.widget(widget)
+            .dimension(timestamp or f.day(self.dataset.fields.timestamp), self.dataset.fields.political_party)
+            .filter(self.dataset.fields.timestamp.between(datetime(2020, 1, 1), stop))
+        )
+
+    def _fetch_twice(self, query, seconds_between=60):
+        query.fetch()
+        self.clock.now += seconds_between
+        (data_frame,) = query.fetch()
+        return data_frame
+
+    def test_partitions_from_the_watermark_on_are_fetched_and_merged(self):
+        data_frame = self._fetch_twice(self._query())
+
+        self.assertEqual(2, self.mock_fetch.call_count)
+        (refresh_query,) = self.mock_fetch.call_args[0]
+        self.assertIn("BETWEEN '2020-01-06T00:00:00' AND '2020-01-31T00:00:00'", refresh_query)
+        self.assertDictEqual(
+            {
+                pd.Timestamp("2020-01-04"): 1,
+                pd.Timestamp("2020-01-05"): 2,
+                pd.Timestamp("2020-01-06"): 5,
+                pd.Timestamp("2020-01-07"): 8,
+            },
+            data_frame["$votes"].droplevel(1).to_dict(),
+        )
+
+    def test_refresh_window_moves_the_watermark_back(self):
+        self.dataset.incremental_refresh_window = timedelta(days=1)
+
+        self._fetch_twice(self._query())
+
+        (refresh_query,) = self.mock_fetch.call_args[0]
+        self.assertIn("BETWEEN '2020-01-05T00:00:00' AND '2020-01-31T00:00:00'", refresh_query)
+
+    def test_refreshed_result_set_is_cached_until_the_next_refresh(self):
+        query = self._query()
+        self._fetch_twice(query)
+        self.clock.now += 59
+        query.fetch()
+
+        self.assertEqual(2, self.mock_fetch.call_count)
+
+    def test_result_set_is_not_refreshed_before_the_refresh_ttl(self):
+        self._fetch_twice(self._query(), seconds_between=59)
+
+        self.mock_fetch.assert_called_once()
+
+    def test_result_set_is_fetched_completely_after_the_result_cache_ttl(self):
+        query = self._query()
+        query.fetch()
+        self.clock.now += 3000
+        query.fetch()
+        self.clock.now += 600
+        self.mock_fetch.side_effect = None
+        self.mock_fetch.return_value = [self.fresh_df]
+        query.fetch()
+
+        self.assertEqual(3, self.mock_fetch.call_count)
+        (query_sql,) = self.mock_fetch.call_args[0]
+        self.assertIn("BETWEEN '2020-01-01T00:00:00' AND '2020-01-31T00:00:00'", query_sql)
+
+    def test_range_filter_ending_before_the_watermark_is_not_refreshed(self):
+        self._fetch_twice(self._query(stop=datetime(2020, 1, 5)))
+
+        self.mock_fetch.assert_called_once()
+
+    def test_queries_without_a_range_filter_on_the_first_dimension_are_not_refreshed(self):
+        query = self.dataset.query.widget(f.Pandas(self.dataset.fields.votes)).dimension(
+            f.day(self.dataset.fields.timestamp)
+        )
+
+        self.assertIsNone(query.plan.incremental_refresh)
+
+    def test_queries_without_a_datetime_first_dimension_are_not_refreshed(self):
+        query = (
+            self.dataset.query.widget(f.Pandas(self.dataset.fields.votes))
+            .dimension(self.dataset.fields.political_party, f.day(self.dataset.fields.timestamp))
+            .filter(self.dataset.fields.timestamp.between(datetime(2020, 1, 1), datetime(2020, 1, 31)))
+        )
+
+        self.assertIsNone(query.plan.incremental_refresh)
+
+    def test_totals_of_the_datetime_dimension_need_metrics_which_can_be_aggregated_again(self):
+        timestamp = Rollup(f.day(self.dataset.fields.timestamp))
+
+        self.assertIsNotNone(self._query(timestamp=timestamp).plan.incremental_refresh)
+        self.assertIsNone(self._query(self.dataset.fields.avg_votes, timestamp=timestamp).plan.incremental_refresh)
+
+    def test_totals_of_the_datetime_dimension_are_recomputed(self):
+        totals_df = pd.DataFrame(
+            {"$timestamp": ["_FIREANT_ROLLUP_VALUE_"], "$political_party": ["_FIREANT_ROLLUP_VALUE_"], "$votes": [7]}
+        )
+        fresh_totals_df = totals_df.assign(**{"$votes": [13]})
+        self.mock_fetch.side_effect = [[self.cached_df, totals_df], [self.fresh_df, fresh_totals_df]]
+
+        data_frame = self._fetch_twice(self._query(timestamp=Rollup(f.day(self.dataset.fields.timestamp))))
+
+        self.assertEqual(1 + 2 + 5 + 8, data_frame["$votes"][(pd.Timestamp.max, "~~totals")])
+
+
+class QueryBuilderWatermarkTests(TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.dataset = copy.deepcopy(mock_dataset)
+        self.dataset.result_cache = TTLCache(3600, clock=self.clock)
+        self.dataset.watermark_cache = TTLCache(10, clock=self.clock)
+        self.dataset.update_columns = {
+            politicians_table: politicians_table.updated_at,
+            voters_table: voters_table.updated_at,
+        }
+        self.watermarks = {
+            '"politics"."politician"': pd.Timestamp("2020-01-01 10:00"),
+            '"politics"."voter"': pd.Timestamp("2020-01-01 09:00"),
+        }
+        self.result_df = pd.DataFrame({"$political_party": ["d", "r"], "$votes": [1, 2], "$voters": [3, 4]})
+
+        patcher = patch.object(self.dataset.database, "fetch_dataframes", side_effect=self._fetch_dataframes)
+        self.mock_fetch = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.probes, self.queries = [], []
+
+    def _fetch_dataframes(self, *queries, **kwargs):
+        results = []
+        for query in queries:
+            if '"$watermark"' in query:
+                self.probes.append(query)
+                table = query.split(" FROM ")[1]
+                results.append(pd.DataFrame({"$watermark": [self.watermarks[table]]}))
+            else:
+                self.queries.append(query)
+                results.append(self.result_df)
+        return results
+
+    def _fetch(self, *metrics):
+        widget = f.Widget(*(metrics or [self.dataset.fields.votes]))
+        widget.transform = Mock(side_effect=lambda data_frame, *args: data_frame)
+        self.dataset.query.dimension(self.dataset.fields.political_party).widget(widget).fetch()
+
+    def test_watermarks_of_the_tables_read_by_the_query_are_probed(self):
+        self._fetch(self.dataset.fields.votes, self.dataset.fields.voters)
+
+        self.assertListEqual(
+            [
+                'SELECT MAX("updated_at") "$watermark" FROM "politics"."politician"',
+                'SELECT MAX("updated_at") "$watermark" FROM "politics"."voter"',
+            ],
+            self.probes,
+        )
+
+    def test_result_set_is_answered_from_the_cache_while_the_watermarks_are_unchanged(self):
+        self._fetch()
+        self.clock.now += 10
+        self._fetch()
+
+        self.assertEqual(2, len(self.probes))
+        self.assertEqual(1, len(self.queries))
+
+    def test_watermarks_are_cached(self):
+        self._fetch()
+        self.clock.now += 9
+        self._fetch()
+
+        self.assertEqual(1, len(self.probes))
+
+    def test_new_data_in_a_table_read_by_the_query_invalidates_the_result_set(self):
+        self._fetch()
+        self.watermarks['"politics"."politician"'] = pd.Timestamp("2020-01-01 11:00")
+        self.clock.now += 10
+        self._fetch()
+
+        self.assertEqual(2, len(self.queries))
+
+    def test_new_data_in_other_tables_does_not_invalidate_the_result_set(self):
+        self._fetch()
+        self.watermarks['"politics"."voter"'] = pd.Timestamp("2020-01-01 11:00")
+        self.clock.now += 10
+        self._fetch()
+
+        self.assertEqual(1, len(self.queries))
+
+    def test_empty_tables_do_not_invalidate_the_result_set(self):
+        self.watermarks['"politics"."politician"'] = pd.NaT
+
+        self._fetch()
+        self.clock.now += 10
+        self._fetch()
+
+        self.assertEqual(1, len(self.queries))
+
+    def test_tables_without_an_update_column_are_not_probed(self):
+        self.dataset.update_columns = {}
+
+        self._fetch()
+        self._fetch()
+
+        self.assertListEqual([], self.probes)
+        self.assertEqual(1, len(self.queries))
+
+
+class QueryBuilderStaleWhileRevalidateTests(TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.dataset = copy.deepcopy(mock_dataset)
+        self.dataset.result_cache = TTLCache(60, clock=self.clock, stale_ttl=600)
+        self.result_df = pd.DataFrame({"$political_party": ["d", "r"], "$votes": [1, 2]})
+
+        patcher = patch.object(self.dataset.database, "fetch_dataframes", return_value=[self.result_df])
+        self.mock_fetch = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        # Refreshes are run by the tests, so that they can check what is returned while a refresh is pending
+        self.refreshes = []
+        executor = Mock(submit=Mock(side_effect=self.refreshes.append))
+        patcher = patch("fireant.queries.result_cache.get_shared_executor", return_value=executor)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self._run_refreshes)
+
+    def _run_refreshes(self):
+        while self.refreshes:
+            self.refreshes.pop(0)()
+
+    def _fetch(self, *filters):
+        widget = f.Widget(self.dataset.fields.votes)
+        widget.transform = Mock(side_effect=lambda data_frame, *args: data_frame)
+        self.dataset.query.dimension(self.dataset.fields.political_party).filter(*filters).widget(widget).fetch()
+
+    def test_expired_result_set_is_returned_and_refreshed_in_the_background(self):
+        self._fetch()
+        self.clock.now += 60
+        self._fetch()
+
+        self.mock_fetch.assert_called_once()
+        self.assertEqual(1, len(self.refreshes))
+
+        self._run_refreshes()
+        self._fetch()
+
+        self.assertEqual(2, self.mock_fetch.call_count)
+        self.assertListEqual([], self.refreshes)
+
+    def test_result_set_is_only_refreshed_once_at_a_time(self):
+        self._fetch()
+        self.clock.now += 60
+        self._fetch()
+        self._fetch()
+
+        self.assertEqual(1, len(self.refreshes))
+
+    def test_number_of_refreshes_at_once_is_capped(self):
+        party_filter = self.dataset.fields.political_party.isin(["d"])
+        self._fetch()
+        self._fetch(party_filter)
+        self.clock.now += 60
+
+        with patch("fireant.queries.result_cache.REVALIDATE_MAX_WORKERS", 1):
+            self._fetch()
+            self._fetch(party_filter)
+
+        # The expired result set is still returned when it is not refreshed
+        self.assertEqual(1, len(self.refreshes))
+        self.assertEqual(2, self.mock_fetch.call_count)
+
+    def test_result_set_expired_for_longer_than_the_stale_ttl_is_fetched(self):
+        self._fetch()
+        self.clock.now += 660
+        self._fetch()
+
+        self.assertEqual(2, self.mock_fetch.call_count)
+        self.assertListEqual([], self.refreshes)
+
+    def test_fresh_result_set_is_not_refreshed(self):
+        self._fetch()
+        self._fetch()
+
+        self.mock_fetch.assert_called_once()
+        self.assertListEqual([], self.refreshes)
@@ -0,0 +1,74 @@
+from itertools import combinations
+from unittest import TestCase
+
+from pypika import Tables, functions as fn
+
+import fireant as f
+from fireant import DataSet, DataType, Field, Join
+from fireant.queries.finders import (
+    CircularJoinsException,
+    MissingTableJoinException,
+    find_joins_for_tables,
+    find_required_tables_to_join,
+)
+from fireant.tests.database.mock_database import TestDatabase
+from fireant.tests.dataset.mocks import mock_dataset
+
+t0, t1, t2, t3 = Tables("test0", "test1", "test2", "test3")
+
+
+class DataSetSchemaTests(TestCase):
+    def test_joins_are_the_same_as_without_schema(self):
+        schema = mock_dataset.schema
+        tables = [join.table for join in mock_dataset.joins]
+
+        for size in range(1, len(tables) + 1):
+            for required_tables in combinations(tables, size):
+                with self.subTest(required_tables=required_tables):
+                    self.assertEqual(
+                        find_joins_for_tables(mock_dataset.joins, mock_dataset.table, list(required_tables)),
+                        schema.find_joins_for_tables(required_tables),
+                    )
+
+    def test_required_tables_are_the_same_as_without_schema(self):
+        elements = [
+            f.day(mock_dataset.fields.timestamp),
+            mock_dataset.fields["district-name"],
+            mock_dataset.fields.voters,
+            mock_dataset.fields.state.isin(["Texas"]),
+        ]
+
+        self.assertEqual(
+            find_required_tables_to_join(elements, mock_dataset.table),
+            mock_dataset.schema.find_required_tables_to_join(elements),
+        )
+
+    def test_schema_is_compiled_once(self):
+        self.assertIs(mock_dataset.schema, mock_dataset.schema)
+
+    def test_extra_fields_compile_new_schema(self):
+        district_name_length = Field(
+            "district-name-length", definition=fn.Length(mock_dataset.fields["district-name"].definition)
+        )
+        dataset = mock_dataset.extra_fields(district_name_length)
+
+        self.assertIsNot(mock_dataset.schema, dataset.schema)
+        self.assertIn(id(district_name_length), dataset.schema._field_tables)
+        joins = dataset.schema.find_joins_for_tables(dataset.schema.find_tables_for_element(district_name_length))
+        self.assertEqual(["district"], [join.table._table_name for join in joins])
+
+    def test_missing_and_circular_joins_raise_only_when_required(self):
+        dataset = DataSet(
+            table=t0,
+            database=TestDatabase(),
+            joins=[Join(t1, t1.id == t2.id), Join(t2, t2.id == t1.id)],
+            fields=[Field("metric", definition=t0.metric, data_type=DataType.number)],
+        )
+
+        self.assertEqual([], dataset.schema.find_joins_for_tables([]))
+
+        with self.assertRaises(CircularJoinsException):
+            dataset.schema.find_joins_for_tables([t1])
+
+        with self.assertRaises(MissingTableJoinException):
+            dataset.schema.find_joins_for_tables([t3])
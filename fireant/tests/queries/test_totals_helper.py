@@ -0,0 +1,119 @@
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+import pandas.testing
+
+from fireant import Aggregation, DayOverDay, Rollup
+from fireant.dataset.modifiers import OmitFromRollup, RollupValue
+from fireant.queries.totals_helper import (
+    find_totals_aggregations,
+    make_totals_data_frames,
+)
+from fireant.tests.dataset.mocks import mock_dataset
+
+
+class FindTotalsAggregationsTests(TestCase):
+    dimensions = [mock_dataset.fields.timestamp, Rollup(mock_dataset.fields.political_party)]
+
+    def test_aggregations_of_additive_metrics(self):
+        aggregations = find_totals_aggregations(
+            self.dimensions, [mock_dataset.fields.votes, mock_dataset.fields.voters], [], [], []
+        )
+
+        self.assertDictEqual({"$votes": Aggregation.sum, "$voters": Aggregation.count}, aggregations)
+
+    def test_none_when_a_metric_is_not_additive(self):
+        aggregations = find_totals_aggregations(
+            self.dimensions, [mock_dataset.fields.votes, mock_dataset.fields.turnout], [], [], []
+        )
+
+        self.assertIsNone(aggregations)
+
+    def test_none_when_an_order_is_not_additive(self):
+        orders = [(mock_dataset.fields.turnout, None)]
+
+        self.assertIsNone(find_totals_aggregations(self.dimensions, [mock_dataset.fields.votes], [], [], orders))
+
+    def test_orders_on_dimensions_are_ignored(self):
+        orders = [(mock_dataset.fields.political_party, None)]
+
+        aggregations = find_totals_aggregations(self.dimensions, [mock_dataset.fields.votes], [], [], orders)
+
+        self.assertDictEqual({"$votes": Aggregation.sum}, aggregations)
+
+    def test_none_with_references(self):
+        references = [DayOverDay(mock_dataset.fields.timestamp)]
+
+        self.assertIsNone(find_totals_aggregations(self.dimensions, [mock_dataset.fields.votes], [], references, []))
+
+    def test_none_with_filters_omitted_from_totals(self):
+        filters = [OmitFromRollup(mock_dataset.fields.political_party == "d")]
+
+        self.assertIsNone(find_totals_aggregations(self.dimensions, [mock_dataset.fields.votes], filters, [], []))
+
+    def test_none_with_filters_on_metrics(self):
+        filters = [mock_dataset.fields.votes > 10]
+
+        self.assertIsNone(find_totals_aggregations(self.dimensions, [mock_dataset.fields.votes], filters, [], []))
+
+    def test_filters_on_dimensions_are_allowed(self):
+        filters = [mock_dataset.fields.political_party == "d"]
+
+        aggregations = find_totals_aggregations(self.dimensions, [mock_dataset.fields.votes], filters, [], [])
+
+        self.assertDictEqual({"$votes": Aggregation.sum}, aggregations)
+
+
+class MakeTotalsDataFramesTests(TestCase):
+    aggregations = {
+        "$votes": Aggregation.sum,
+        "$voters": Aggregation.count,
+        "$min-votes": Aggregation.min,
+        "$max-votes": Aggregation.max,
+    }
+    data_frame = pd.DataFrame(
+        {
+            "$timestamp": pd.to_datetime(["2020-01-01", "2020-01-01", "2020-01-02", "2020-01-02"]),
+            "$political_party": ["d", "r", "d", None],
+            "$votes": [1.0, 2.0, np.nan, 4.0],
+            "$voters": [10, 20, 30, 40],
+            "$min-votes": [1, 2, 3, 4],
+            "$max-votes": [1, 2, 3, 4],
+        }
+    )
+
+    def test_totals_of_the_last_dimension(self):
+        dimensions = [mock_dataset.fields.timestamp, Rollup(mock_dataset.fields.political_party)]
+
+        (totals_df,) = make_totals_data_frames(self.data_frame, dimensions, [], self.aggregations)
+
+        expected = pd.DataFrame(
+            {
+                "$timestamp": pd.to_datetime(["2020-01-01", "2020-01-02"]),
+                "$political_party": [RollupValue.CONSTANT] * 2,
+                "$votes": [3.0, 4.0],
+                "$voters": [30, 70],
+                "$min-votes": [1, 3],
+                "$max-votes": [2, 4],
+            }
+        )
+        pandas.testing.assert_frame_equal(expected, totals_df)
+
+    def test_totals_of_every_dimension_in_the_order_of_the_totals_queries(self):
+        dimensions = [Rollup(mock_dataset.fields.timestamp), Rollup(mock_dataset.fields.political_party)]
+
+        party_totals_df, totals_df = make_totals_data_frames(self.data_frame, dimensions, [], self.aggregations)
+
+        self.assertListEqual([RollupValue.CONSTANT] * 2, list(party_totals_df["$political_party"]))
+        self.assertListEqual(list(self.data_frame.columns), list(totals_df.columns))
+        self.assertListEqual([RollupValue.CONSTANT, RollupValue.CONSTANT, 7.0, 100, 1, 4], list(totals_df.iloc[0]))
+
+    def test_sum_of_only_null_values_is_null(self):
+        dimensions = [Rollup(mock_dataset.fields.timestamp)]
+        data_frame = self.data_frame[self.data_frame["$votes"].isnull()].drop(columns="$political_party")
+
+        (totals_df,) = make_totals_data_frames(data_frame, dimensions, [], self.aggregations)
+
+        self.assertTrue(pd.isnull(totals_df["$votes"][0]))
+        self.assertEqual(30, totals_df["$voters"][0])
@@ -0,0 +1,119 @@
+import copy
+import pickle
+from unittest import TestCase
+from unittest.mock import Mock
+
+from fireant.cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class TTLCacheTests(TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = TTLCache(10, clock=self.clock)
+
+    def test_get_returns_default_for_missing_key(self):
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(1, self.cache.get("a", 1))
+
+    def test_get_returns_value_before_ttl(self):
+        self.cache.set("a", 1)
+        self.clock.now = 9
+
+        self.assertEqual(1, self.cache.get("a"))
+        self.assertIn("a", self.cache)
+
+    def test_value_expires_after_ttl(self):
+        self.cache.set("a", 1)
+        self.clock.now = 10
+
+        self.assertIsNone(self.cache.get("a"))
+        self.assertNotIn("a", self.cache)
+
+    def test_get_or_set_only_calls_func_on_miss(self):
+        func = Mock(return_value=1)
+
+        self.assertEqual(1, self.cache.get_or_set("a", func))
+        self.assertEqual(1, self.cache.get_or_set("a", func))
+        func.assert_called_once()
+
+        self.clock.now = 10
+        self.cache.get_or_set("a", func)
+        self.assertEqual(2, func.call_count)
+
+    def test_replace_keeps_the_expiry(self):
+        self.cache.set("a", 1)
+        self.clock.now = 5
+        self.cache.replace("a", 2)
+
+        self.assertEqual(2, self.cache.get("a"))
+        self.clock.now = 10
+        self.assertNotIn("a", self.cache)
+
+    def test_replace_does_not_store_missing_values(self):
+        self.cache.replace("a", 1)
+
+        self.assertNotIn("a", self.cache)
+
+    def test_get_stale_returns_expired_values_before_the_stale_ttl(self):
+        cache = TTLCache(10, clock=self.clock, stale_ttl=5)
+        cache.set("a", 1)
+
+        self.clock.now = 5
+        self.assertEqual(1, cache.get_stale("a"))
+        self.clock.now = 14
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(1, cache.get_stale("a"))
+        self.clock.now = 15
+        self.assertIsNone(cache.get_stale("a"))
+        self.assertEqual(0, len(cache))
+
+    def test_get_stale_without_stale_ttl_returns_only_values_before_the_ttl(self):
+        self.cache.set("a", 1)
+        self.clock.now = 10
+
+        self.assertEqual(2, self.cache.get_stale("a", 2))
+
+    def test_least_recently_used_value_is_evicted_when_full(self):
+        cache = TTLCache(10, max_size=2, clock=self.clock)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertIn("c", cache)
+
+    def test_invalidate_and_clear(self):
+        self.cache.set("a", 1)
+        self.cache.set("b", 2)
+
+        self.cache.invalidate("a")
+        self.assertNotIn("a", self.cache)
+        self.assertIn("b", self.cache)
+
+        self.cache.clear()
+        self.assertEqual(0, len(self.cache))
+
+    def test_copies_share_the_cache(self):
+        self.assertIs(self.cache, copy.copy(self.cache))
+        self.assertIs(self.cache, copy.deepcopy({"cache": self.cache})["cache"])
+
+    def test_pickle_keeps_settings_but_not_values(self):
+        cache = TTLCache(10, max_size=5, stale_ttl=3)
+        cache.set("a", 1)
+
+        unpickled = pickle.loads(pickle.dumps(cache))
+
+        self.assertEqual(10, unpickled.ttl)
+        self.assertEqual(5, unpickled.max_size)
+        self.assertEqual(3, unpickled.stale_ttl)
+        self.assertNotIn("a", unpickled)
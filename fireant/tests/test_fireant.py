@@ -1,23 +1,26 @@
-from unittest import TestCase
+import subprocess
+import sys
+from unittest import TestCase, skipIf
 
 import fireant
+from fireant.dataset.klass import DataSet
 
 
 class APITests(TestCase):
     def test_package_exports_databases(self):
         with self.subTest("base class"):
-            self.assertIn("Database", vars(fireant))
+            self.assertIn("Database", dir(fireant))
 
         for db in ("MySQL", "Vertica", "Redshift", "PostgreSQL", "MSSQL", "Snowflake"):
             with self.subTest(db):
-                self.assertIn(db + "Database", vars(fireant))
+                self.assertIn(db + "Database", dir(fireant))
 
     def test_package_exports_dataset(self):
-        self.assertIn("DataSet", vars(fireant))
+        self.assertIn("DataSet", dir(fireant))
 
         for element in ("Join", "Field", "DataType"):
             with self.subTest(element):
-                self.assertIn(element, vars(fireant))
+                self.assertIn(element, dir(fireant))
 
     def test_package_exports_intervals(self):
         for element in (
@@ -30,26 +33,63 @@ class APITests(TestCase):
             "NumericInterval",
         ):
             with self.subTest(element):
-                self.assertIn(element, vars(fireant))
+                self.assertIn(element, dir(fireant))
 
     def test_package_exports_references(self):
         for element in ("DayOverDay", "WeekOverWeek"):
             with self.subTest(element):
-                self.assertIn(element, vars(fireant))
+                self.assertIn(element, dir(fireant))
 
     def test_package_exports_modifiers(self):
         for element in ("Rollup", "OmitFromRollup", "ResultSet"):
             with self.subTest(element):
-                self.assertIn(element, vars(fireant))
+                self.assertIn(element, dir(fireant))
 
     def test_package_exports_operations(self):
-        self.assertIn("Operation", vars(fireant))
+        self.assertIn("Operation", dir(fireant))
 
         for element in ("CumSum", "CumMean", "CumProd", "RollingMean", "Share"):
             with self.subTest(element):
-                self.assertIn(element, vars(fireant))
+                self.assertIn(element, dir(fireant))
 
     def test_package_exports_exceptions(self):
         for element in ("DataSetException", "DataSetFilterException"):
             with self.subTest(element):
-                self.assertIn(element, vars(fireant))
+                self.assertIn(element, dir(fireant))
+
+
+def _modules_imported_by(statement):
+    # Run in a new interpreter, since the modules are already imported by the tests
+    script = "import sys; {}; print(' '.join(sys.modules))".format(statement)
+    return set(subprocess.check_output([sys.executable, "-c", script], universal_newlines=True).split())
+
+
+class LazyImportTests(TestCase):
+    @skipIf(sys.version_info < (3, 7), "The attributes are imported eagerly before Python 3.7")
+    def test_importing_fireant_does_not_import_heavy_dependencies(self):
+        modules = _modules_imported_by("import fireant")
+
+        for module in ("pandas", "numpy", "cryptography", "fireant.widgets", "fireant.database.base"):
+            with self.subTest(module):
+                self.assertNotIn(module, modules)
+
+    @skipIf(sys.version_info < (3, 7), "The attributes are imported eagerly before Python 3.7")
+    def test_importing_databases_does_not_import_heavy_dependencies(self):
+        modules = _modules_imported_by("from fireant import MySQLDatabase, SnowflakeDatabase")
+
+        for module in ("pandas", "numpy", "cryptography", "fireant.widgets", "fireant.database.vertica"):
+            with self.subTest(module):
+                self.assertNotIn(module, modules)
+
+    def test_attributes_are_imported_on_access(self):
+        self.assertIs(DataSet, fireant.DataSet)
+
+    def test_submodules_are_imported_on_access(self):
+        self.assertIs(fireant.formats, sys.modules["fireant.formats"])
+
+    def test_unknown_attribute_raises_attribute_error(self):
+        with self.assertRaises(AttributeError):
+            fireant.unknown
+
+        with self.assertRaises(AttributeError):
+            fireant.database.UnknownDatabase
@@ -5,6 +5,7 @@ from datetime import (
 from unittest import TestCase
 
 import numpy as np
+import pandas as pd
 
 from fireant import (
     DataType,
@@ -257,3 +258,52 @@ class FormatDisplayValueStyleTests(TestCase):
         with self.subTest('when precision'):
             field = Field("number", None, data_type=DataType.number, suffix="%", precision=2)
             self.assertEqual("0.0739", formats.display_value(7.38652, field, use_raw_value=True))
+
+
+class DisplayValueFormatterTests(TestCase):
+    def assert_matches_display_value(self, values, field, **kwargs):
+        series = pd.Series(values, index=list("abcdefgh")[: len(values)])
+        result = formats.display_value_formatter(field, **kwargs)(series)
+
+        expected = [formats.display_value(value, field, **kwargs) for value in series.astype(object)]
+        self.assertListEqual(expected, list(result))
+        self.assertListEqual(list(series.index), list(result.index))
+
+    def test_numbers_match_display_value(self):
+        field = Field("number", None, data_type=DataType.number, prefix="$", thousands=",", precision=2)
+        self.assert_matches_display_value([1.234, -1000000.0, np.nan, np.inf, 0.0], field, nan_value="")
+
+    def test_integers_match_display_value(self):
+        self.assert_matches_display_value([1, 126500, NUMBER_TOTALS], number_field)
+
+    def test_raw_percentages_match_display_value(self):
+        field = Field("number", None, data_type=DataType.number, suffix="%", precision=2)
+        self.assert_matches_display_value([7.38652, 87.123123131], field, use_raw_value=True)
+
+    def test_raw_percentages_without_precision_match_display_value(self):
+        field = Field("number", None, data_type=DataType.number, suffix="%")
+        self.assert_matches_display_value([87.123123131, 50, np.nan], field, use_raw_value=True)
+
+    def test_integer_percentages_match_display_value(self):
+        field = Field("number", None, data_type=DataType.number, prefix="~", suffix="%", thousands=",")
+        self.assert_matches_display_value([5, 12345, NUMBER_TOTALS], field)
+        self.assert_matches_display_value([5, 12345, NUMBER_TOTALS], field, use_raw_value=True)
+
+    def test_numbers_in_object_column_match_display_value(self):
+        field = Field("number", None, data_type=DataType.number, precision=1)
+        self.assert_matches_display_value([1.25, None, "n/a", NUMBER_TOTALS], field, null_value="")
+
+    def test_empty_number_column(self):
+        result = formats.display_value_formatter(number_field)(pd.Series([], dtype=float))
+
+        self.assertListEqual([], list(result))
+
+    def test_dates_match_display_value(self):
+        values = [datetime(2019, 1, 1), DATE_TOTALS, pd.NaT]
+        self.assert_matches_display_value(values, month(date_field))
+
+    def test_text_and_none_match_display_value(self):
+        self.assert_matches_display_value(["abc", None, TEXT_TOTALS], text_field, null_value="")
+
+    def test_booleans_match_display_value(self):
+        self.assert_matches_display_value([True, False], boolean_field)
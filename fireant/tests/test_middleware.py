@@ -1,4 +1,5 @@
 import signal
+import threading
 from unittest import TestCase
 from unittest.mock import (
     MagicMock,
@@ -64,6 +65,21 @@ class TestConnectionMiddleware(TestCase):
             ]
         )
 
+    @patch("fireant.middleware.decorators.signal.signal")
+    def test_cancelable_connection_does_not_attach_signal_handlers_outside_main_thread(self, mock_attach_signal):
+        mock_database_object = MagicMock()
+
+        def use_connection():
+            with CancelableConnection(mock_database_object):
+                pass
+
+        thread = threading.Thread(target=use_connection)
+        thread.start()
+        thread.join()
+
+        mock_database_object.connect.return_value.__exit__.assert_called_once()
+        mock_attach_signal.assert_not_called()
+
     @patch("fireant.middleware.decorators.signal.signal")
     def test_cancelable_connection_transforms_keyboard_intterupt_in_cancelled_query(self, mock_attach_signal):
         mock_connection = MagicMock()
@@ -0,0 +1,134 @@
+import io
+import os
+import tempfile
+from unittest import TestCase, skipIf
+from unittest.mock import patch
+
+import numpy as np
+
+from fireant import Arrow, Rollup
+from fireant.exceptions import DataSetException
+from fireant.tests.dataset.mocks import (
+    ElectionOverElection,
+    dimx0_metricx2_df,
+    dimx2_date_str_df,
+    dimx2_date_str_ref_df,
+    dimx2_date_str_totals_df,
+    mock_dataset,
+)
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover
+    pyarrow = None
+
+
+class ArrowTableDataFrameTests(TestCase):
+    maxDiff = None
+
+    def test_dimensions_become_columns_with_native_dtypes(self):
+        dimensions = [mock_dataset.fields.timestamp, mock_dataset.fields.political_party]
+        result = Arrow(mock_dataset.fields.votes, mock_dataset.fields.wins).make_table_data_frame(
+            dimx2_date_str_df, dimensions, []
+        )
+
+        self.assertListEqual(["Timestamp", "Party", "Votes", "Wins"], list(result.columns))
+        self.assertEqual(np.dtype("<M8[ns]"), result["Timestamp"].dtype)
+        self.assertEqual("category", result["Party"].dtype)
+        self.assertEqual(np.dtype("int64"), result["Votes"].dtype)
+        self.assertEqual(len(dimx2_date_str_df), len(result))
+
+    def test_totals_are_flag_columns_with_null_dimension_values(self):
+        dimensions = [mock_dataset.fields.timestamp, Rollup(mock_dataset.fields.political_party)]
+        result = Arrow(mock_dataset.fields.votes).make_table_data_frame(dimx2_date_str_totals_df, dimensions, [])
+
+        self.assertListEqual(["Timestamp", "Party", "Party Totals", "Votes"], list(result.columns))
+        self.assertEqual(np.dtype(bool), result["Party Totals"].dtype)
+        self.assertTrue(result.loc[result["Party Totals"], "Party"].isnull().all())
+        self.assertFalse(result.loc[~result["Party Totals"], "Party"].isnull().any())
+        self.assertNotIn("~~totals", list(result["Party"].cat.categories))
+
+    def test_hidden_dimension_is_not_a_column(self):
+        dimensions = [mock_dataset.fields.timestamp, mock_dataset.fields.political_party]
+        result = Arrow(mock_dataset.fields.votes, hide=[mock_dataset.fields.political_party]).make_table_data_frame(
+            dimx2_date_str_df, dimensions, []
+        )
+
+        self.assertListEqual(["Timestamp", "Votes"], list(result.columns))
+
+    def test_references_are_columns(self):
+        dimensions = [mock_dataset.fields.timestamp, mock_dataset.fields.political_party]
+        references = [ElectionOverElection(mock_dataset.fields.timestamp)]
+        result = Arrow(mock_dataset.fields.votes).make_table_data_frame(dimx2_date_str_ref_df, dimensions, references)
+
+        self.assertListEqual(["Timestamp", "Party", "Votes", "Votes EoE"], list(result.columns))
+
+    def test_pivoted_dimension_values_become_columns(self):
+        dimensions = [mock_dataset.fields.timestamp, mock_dataset.fields.political_party]
+        result = Arrow(
+            mock_dataset.fields.votes, mock_dataset.fields.wins, pivot=[mock_dataset.fields.political_party]
+        ).make_table_data_frame(dimx2_date_str_df, dimensions, [])
+
+        self.assertListEqual(
+            [
+                "Timestamp",
+                "Votes, Democrat",
+                "Votes, Independent",
+                "Votes, Republican",
+                "Wins, Democrat",
+                "Wins, Independent",
+                "Wins, Republican",
+            ],
+            list(result.columns),
+        )
+
+    def test_no_dimensions(self):
+        result = Arrow(mock_dataset.fields.votes).make_table_data_frame(dimx0_metricx2_df, [], [])
+
+        self.assertListEqual(["Votes"], list(result.columns))
+        self.assertEqual(1, len(result))
+
+    def test_unsupported_file_format_raises_exception(self):
+        with self.assertRaises(DataSetException):
+            Arrow(mock_dataset.fields.votes, file_format="xlsx")
+
+    def test_missing_pyarrow_raises_exception(self):
+        with patch.dict("sys.modules", {"pyarrow": None}):
+            with self.assertRaises(DataSetException):
+                Arrow(mock_dataset.fields.votes).transform(dimx0_metricx2_df, [], [])
+
+
+@skipIf(pyarrow is None, "pyarrow is not installed")
+class ArrowTransformTests(TestCase):
+    dimensions = [mock_dataset.fields.timestamp, Rollup(mock_dataset.fields.political_party)]
+
+    def test_parquet_bytes(self):
+        result = Arrow(mock_dataset.fields.votes).transform(dimx2_date_str_totals_df, self.dimensions, [])
+
+        table = pyarrow.parquet.read_table(io.BytesIO(result))
+        self.assertListEqual(["Timestamp", "Party", "Party Totals", "Votes"], table.column_names)
+        self.assertTrue(pyarrow.types.is_dictionary(table.schema.field("Party").type))
+        self.assertTrue(pyarrow.types.is_boolean(table.schema.field("Party Totals").type))
+        self.assertTrue(pyarrow.types.is_int64(table.schema.field("Votes").type))
+        self.assertEqual(len(dimx2_date_str_totals_df), table.num_rows)
+
+    def test_ipc_bytes(self):
+        result = Arrow(mock_dataset.fields.votes, file_format="ipc").transform(
+            dimx2_date_str_totals_df, self.dimensions, []
+        )
+
+        table = pyarrow.ipc.open_file(pyarrow.BufferReader(result)).read_all()
+        self.assertListEqual(["Timestamp", "Party", "Party Totals", "Votes"], table.column_names)
+        self.assertTrue(pyarrow.types.is_timestamp(table.schema.field("Timestamp").type))
+
+    def test_write_to_path(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "export.parquet")
+            result = Arrow(mock_dataset.fields.votes, path=path).transform(
+                dimx2_date_str_totals_df, self.dimensions, []
+            )
+
+            self.assertEqual(path, result)
+            self.assertEqual(len(dimx2_date_str_totals_df), pyarrow.parquet.read_table(path).num_rows)
@@ -1,4 +1,5 @@
 from _csv import QUOTE_MINIMAL
+from io import StringIO
 from unittest import TestCase
 
 import pandas as pd
@@ -196,3 +197,60 @@ class CSVWidgetTests(TestCase):
         expected = expected.applymap(format_float_raw)
 
         self.assertEqual(expected.to_csv(**csv_options), result)
+
+
+class CSVWidgetWriteChunksTests(TestCase):
+    maxDiff = None
+
+    def write_chunks(self, widget, data_frame, dimensions, n_chunks):
+        result_set = data_frame.reset_index() if dimensions else data_frame
+        chunk_size = -(-len(result_set) // n_chunks)
+        chunks = [result_set[i : i + chunk_size] for i in range(0, len(result_set), chunk_size)]
+
+        file = StringIO()
+        widget.write_chunks(chunks, dimensions, file)
+        return file.getvalue()
+
+    def test_chunks_match_transform_with_dimx2(self):
+        dimensions = [mock_dataset.fields.timestamp, mock_dataset.fields.political_party]
+        widget = CSV(mock_dataset.fields.votes, mock_dataset.fields.wins)
+
+        result = self.write_chunks(widget, dimx2_date_str_df, dimensions, n_chunks=3)
+
+        self.assertEqual(widget.transform(dimx2_date_str_df, dimensions, []), result)
+
+    def test_chunks_match_transform_with_dimx1(self):
+        dimensions = [mock_dataset.fields.political_party]
+        widget = CSV(mock_dataset.fields.votes)
+
+        result = self.write_chunks(widget, dimx1_str_df, dimensions, n_chunks=2)
+
+        self.assertEqual(widget.transform(dimx1_str_df, dimensions, []), result)
+
+    def test_chunks_match_transform_with_no_dimensions(self):
+        widget = CSV(mock_dataset.fields.votes, mock_dataset.fields.wins)
+
+        result = self.write_chunks(widget, dimx0_metricx2_df, [], n_chunks=1)
+
+        self.assertEqual(widget.transform(dimx0_metricx2_df, [], []), result)
+
+    def test_chunks_match_transform_with_hidden_dimension(self):
+        dimensions = [mock_dataset.fields.timestamp, mock_dataset.fields.political_party]
+        widget = CSV(mock_dataset.fields.wins, hide=[mock_dataset.fields.political_party])
+
+        result = self.write_chunks(widget, dimx2_date_str_df, dimensions, n_chunks=4)
+
+        self.assertEqual(widget.transform(dimx2_date_str_df, dimensions, []), result)
+
+    def test_header_is_written_once(self):
+        dimensions = [mock_dataset.fields.timestamp, mock_dataset.fields.political_party]
+
+        result = self.write_chunks(CSV(mock_dataset.fields.wins), dimx2_date_str_df, dimensions, n_chunks=5)
+
+        self.assertEqual(1, result.count("Timestamp,Party,Wins"))
+
+    def test_pivot_transpose_and_sort_are_not_streamable(self):
+        self.assertTrue(CSV(mock_dataset.fields.wins).is_streamable)
+        self.assertFalse(CSV(mock_dataset.fields.wins, pivot=[mock_dataset.fields.political_party]).is_streamable)
+        self.assertFalse(CSV(mock_dataset.fields.wins, transpose=True).is_streamable)
+        self.assertFalse(CSV(mock_dataset.fields.wins, sort=[0]).is_streamable)
@@ -30,6 +30,7 @@ from fireant.tests.dataset.mocks import (
     mock_dataset,
     year,
 )
+from fireant.utils import alias_selector as f
 from fireant.widgets.highcharts import (
     DEFAULT_COLORS,
     HighCharts,
@@ -3558,6 +3559,82 @@ class HighChartsPieChartTransformerTests(TestCase):
         )
 
 
+class HighChartsCompactTransformerTests(TestCase):
+    maxDiff = None
+
+    def test_compact_category_data_rendered_as_arrays(self):
+        result = (
+            HighCharts("Votes", compact=True)
+            .axis(HighCharts.BarSeries(mock_dataset.fields.votes))
+            .transform(dimx1_str_df, [mock_dataset.fields.political_party], [])
+        )
+
+        self.assertEqual(
+            [[0, 54551568], [1, 1076384], [2, 56046384]],
+            result["series"][0]["data"],
+        )
+
+    def test_compact_timeseries_data_unchanged(self):
+        result = (
+            HighCharts("Wins", compact=True)
+            .axis(HighCharts.LineSeries(mock_dataset.fields.wins_with_style))
+            .transform(dimx1_date_df, [mock_dataset.fields.timestamp], [])
+        )
+
+        self.assertEqual(
+            [
+                (820454400000, 2),
+                (946684800000, 2),
+                (1072915200000, 2),
+                (1199145600000, 2),
+                (1325376000000, 2),
+                (1451606400000, 2),
+            ],
+            result["series"][0]["data"],
+        )
+
+    def test_compact_pie_data_rendered_as_arrays_with_keys(self):
+        result = (
+            HighCharts("Votes", compact=True)
+            .axis(HighCharts.PieSeries(mock_dataset.fields.votes))
+            .transform(dimx1_str_df, [mock_dataset.fields.political_party], [])
+        )
+
+        self.assertEqual(["name", "y"], result["series"][0]["keys"])
+        self.assertEqual(
+            [["Democrat", 54551568], ["Independent", 1076384], ["Republican", 56046384]],
+            result["series"][0]["data"],
+        )
+
+    def test_compact_values_are_rounded_to_metric_precision(self):
+        df = pd.DataFrame(
+            {f("turnout"): [1.23456, 2.34567]},
+            index=pd.Index(["d", "r"], name=f("political_party")),
+        )
+
+        result = (
+            HighCharts("Turnout", compact=True)
+            .axis(HighCharts.BarSeries(mock_dataset.fields.turnout))
+            .transform(df, [mock_dataset.fields.political_party], [])
+        )
+
+        self.assertEqual([[0, 1.23], [1, 2.35]], result["series"][0]["data"])
+
+    def test_values_are_not_rounded_by_default(self):
+        df = pd.DataFrame(
+            {f("turnout"): [1.23456, 2.34567]},
+            index=pd.Index(["d", "r"], name=f("political_party")),
+        )
+
+        result = (
+            HighCharts("Turnout")
+            .axis(HighCharts.BarSeries(mock_dataset.fields.turnout))
+            .transform(df, [mock_dataset.fields.political_party], [])
+        )
+
+        self.assertEqual([{"x": 0, "y": 1.23456}, {"x": 1, "y": 2.34567}], result["series"][0]["data"])
+
+
 class HighChartsLineChartAnnotationTransformerTests(TestCase):
     maxDiff = None
 
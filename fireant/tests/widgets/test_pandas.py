@@ -25,7 +25,7 @@ from fireant.tests.dataset.mocks import (
     test_database,
 )
 from fireant.utils import alias_selector as f
-from fireant.widgets.pandas import Pandas
+from fireant.widgets.pandas import HARD_MAX_COLUMNS, Pandas
 
 
 def format_float(x, is_raw=False):
@@ -176,6 +176,35 @@ class PandasTransformerTests(TestCase):
 
         pandas.testing.assert_frame_equal(expected, result)
 
+    def test_pivoted_dimx2_date_str_over_max_columns_keeps_first_pivot_values(self):
+        result = Pandas(mock_dataset.fields.wins, pivot=[mock_dataset.fields.political_party], max_columns=2).transform(
+            dimx2_date_str_df, [mock_dataset.fields.timestamp, mock_dataset.fields.political_party], []
+        )
+
+        expected = dimx2_date_str_df.copy()[[f('wins')]]
+        expected = expected.unstack(level=[1])
+        expected = expected[[(f('wins'), 'Democrat'), (f('wins'), 'Independent')]]
+        expected.index.names = ['Timestamp']
+        expected.columns = ['Democrat', 'Independent']
+        expected.columns.names = ['Party']
+        expected = expected.applymap(format_float)
+
+        pandas.testing.assert_frame_equal(expected, result)
+        self.assertEqual(1, result.attrs["dropped_columns"])
+
+    def test_pivoted_dimx2_date_str_within_max_columns_drops_nothing(self):
+        result = Pandas(mock_dataset.fields.wins, pivot=[mock_dataset.fields.political_party], max_columns=3).transform(
+            dimx2_date_str_df, [mock_dataset.fields.timestamp, mock_dataset.fields.political_party], []
+        )
+
+        self.assertEqual(['Democrat', 'Independent', 'Republican'], list(result.columns))
+        self.assertEqual(0, result.attrs["dropped_columns"])
+
+    def test_max_columns_capped_at_hard_max(self):
+        widget = Pandas(mock_dataset.fields.wins, max_columns=1000)
+
+        self.assertEqual(HARD_MAX_COLUMNS, widget.max_columns)
+
     def test_hidden_dimx2_date_str(self):
         dimensions = [mock_dataset.fields.timestamp, mock_dataset.fields.political_party]
         result = Pandas(mock_dataset.fields.wins, hide=[mock_dataset.fields.political_party]).transform(
@@ -1234,6 +1234,32 @@ class ReactTableTransformerTests(TestCase):
             result,
         )
 
+    def test_pivot_second_dimension_over_max_columns_drops_pivot_values(self):
+        dimensions = [
+            day(mock_dataset.fields.timestamp),
+            mock_dataset.fields.political_party,
+        ]
+        result = ReactTable(
+            mock_dataset.fields.wins, pivot=[mock_dataset.fields.political_party], max_columns=2
+        ).transform(dimx2_date_str_df, dimensions, [])
+
+        self.assertEqual(
+            [
+                {"Header": "Timestamp", "accessor": "$timestamp"},
+                {"Header": "Democrat", "accessor": "$wins.Democrat"},
+                {"Header": "Independent", "accessor": "$wins.Independent"},
+            ],
+            result["columns"],
+        )
+        self.assertEqual(1, result["dropped_columns"])
+        self.assertEqual(
+            {
+                "Democrat": {"display": "2", "raw": 2.0},
+                "Independent": {"display": "0", "raw": 0.0},
+            },
+            result["data"][0]["$wins"],
+        )
+
     def test_metricx2_pivot_dim2(self):
         dimensions = [
             day(mock_dataset.fields.timestamp),
@@ -1,5 +1,11 @@
 from unittest import TestCase
 
+import numpy as np
+import pandas as pd
+
+from fireant import CSV, HighCharts, Pandas, ReactTable, Rollup
+from fireant.tests.dataset.mocks import dimx2_date_str_df, dimx2_date_str_totals_df, mock_dataset
+from fireant.utils import alias_selector as f
 from fireant.widgets.base import (
     TransformableWidget,
     Widget,
@@ -23,3 +29,59 @@ class BaseWidgetTests(TestCase):
     def test_transformable_widget_has_transform_function(self):
         self.assertTrue(hasattr(TransformableWidget, 'transform'))
         self.assertTrue(callable(TransformableWidget.transform))
+
+
+class ProjectDataFrameTests(TestCase):
+    def setUp(self):
+        self.data_frame = dimx2_date_str_df.copy()
+        self.index_names = list(self.data_frame.index.names)
+
+    def test_projection_with_columns_only_contains_those_columns(self):
+        result = TransformableWidget.project_data_frame(self.data_frame, [f("votes")])
+
+        self.assertListEqual([f("votes")], list(result.columns))
+        self.assertFalse(np.shares_memory(result[f("votes")].values, self.data_frame[f("votes")].values))
+
+    def test_projection_without_columns_shares_values(self):
+        result = TransformableWidget.project_data_frame(self.data_frame)
+
+        self.assertListEqual(list(self.data_frame.columns), list(result.columns))
+        self.assertTrue(np.shares_memory(result[f("votes")].values, self.data_frame[f("votes")].values))
+
+    def test_renaming_projection_index_and_columns_does_not_change_data_frame(self):
+        for columns in (None, [f("votes")]):
+            with self.subTest(columns=columns):
+                result = TransformableWidget.project_data_frame(self.data_frame, columns)
+                result.index.names = ["a", "b"]
+                result.columns.name = "Metrics"
+
+                self.assertListEqual(self.index_names, list(self.data_frame.index.names))
+                self.assertIsNone(self.data_frame.columns.name)
+
+
+class WidgetsDoNotModifyResultSetTests(TestCase):
+    dimensions = [mock_dataset.fields.timestamp, Rollup(mock_dataset.fields.political_party)]
+
+    def assert_result_set_unchanged(self, widget):
+        data_frame = dimx2_date_str_totals_df.copy()
+        data_frame.columns.name = None
+
+        widget.transform(data_frame, self.dimensions, [])
+
+        pd.testing.assert_frame_equal(dimx2_date_str_totals_df, data_frame)
+        self.assertListEqual(list(dimx2_date_str_totals_df.index.names), list(data_frame.index.names))
+        self.assertIsNone(data_frame.columns.name)
+
+    def test_pandas(self):
+        self.assert_result_set_unchanged(Pandas(mock_dataset.fields.votes, pivot=[mock_dataset.fields.political_party]))
+
+    def test_csv(self):
+        self.assert_result_set_unchanged(CSV(mock_dataset.fields.votes, mock_dataset.fields.wins))
+
+    def test_reacttable(self):
+        self.assert_result_set_unchanged(ReactTable(mock_dataset.fields.votes, hide=[mock_dataset.fields.timestamp]))
+
+    def test_highcharts(self):
+        self.assert_result_set_unchanged(
+            HighCharts().axis(HighCharts.LineSeries(mock_dataset.fields.votes, mock_dataset.fields.wins))
+        )
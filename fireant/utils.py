@@ -3,7 +3,7 @@ import csv
 import inspect
 import tempfile
 from collections import OrderedDict
-from functools import partial, wraps
+from functools import lru_cache, partial, wraps
 from types import GeneratorType
 
 
@@ -23,6 +23,10 @@ def immutable(func):
         self_copy = self if mutate else copy.deepcopy(self)
         result = func(self_copy, *args, **kwargs)
 
+        if mutate and hasattr(self_copy, "_clear_memoized"):
+            # Anything memoized from the state of the instance before it was mutated is stale now
+            self_copy._clear_memoized()
+
         # Return self if the inner function returns None.  This way the inner function can return something
         # different (for example when creating joins, a different builder is returned).
         if result is None:
@@ -151,8 +155,13 @@ def getdeepattr(d, keys, default_value=None):
     return d_level
 
 
+@lru_cache(maxsize=None)
+def _getfullargspec(f):
+    return inspect.getfullargspec(f)
+
+
 def apply_kwargs(f, *args, **kwargs):
-    argspec = inspect.getfullargspec(f)
+    argspec = _getfullargspec(f)
     allowed = set(argspec.args[-len(argspec.defaults or ()) :])
     return f(*args, **{key: kwarg for key, kwarg in kwargs.items() if argspec.varkw or key in allowed})
 
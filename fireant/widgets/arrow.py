@@ -0,0 +1,165 @@
+from typing import Iterable
+
+import pandas as pd
+
+from fireant.dataset.fields import DataType, Field
+from fireant.dataset.modifiers import Rollup
+from fireant.dataset.totals import totals_mask
+from fireant.exceptions import DataSetException
+from fireant.formats import TOTALS_LABEL
+from fireant.utils import alias_selector
+from .pandas import Pandas
+
+PARQUET = "parquet"
+IPC = "ipc"
+
+FILE_FORMATS = (PARQUET, IPC)
+
+
+class Arrow(Pandas):
+    """
+    Exports the result set as an Apache Parquet or Arrow IPC file, keeping the native types of the values. Metrics,
+    references, hidden and pivoted dimensions are selected the same way as in the `Pandas` widget.
+
+    Dimensions become regular columns. Text dimensions are dictionary-encoded. Instead of totals markers, the rows
+    containing totals have a null value in the dimension column and a boolean "<dimension label> Totals" flag column
+    for each dimension with a rollup.
+    """
+
+    def __init__(
+        self,
+        metric: Field,
+        *metrics: Iterable[Field],
+        file_format=PARQUET,
+        path=None,
+        pivot=(),
+        hide=(),
+        sort=None,
+        ascending=None,
+        max_columns=None,
+    ):
+        """
+        :param file_format:
+            Either "parquet" or "ipc" (Arrow IPC file format).
+        :param path:
+            (Optional) A file path to write the file to. If not provided, the file is returned as bytes.
+        """
+        if file_format not in FILE_FORMATS:
+            raise DataSetException(
+                "Unsupported file format {}, must be one of {}.".format(file_format, ", ".join(FILE_FORMATS))
+            )
+
+        super(Arrow, self).__init__(
+            metric,
+            *metrics,
+            pivot=pivot,
+            hide=hide,
+            sort=sort,
+            ascending=ascending,
+            max_columns=max_columns,
+        )
+        self.file_format = file_format
+        self.path = path
+
+    def transform(
+        self,
+        data_frame,
+        dimensions,
+        references,
+        annotation_frame=None,
+        use_raw_values=None,
+    ):
+        """
+        :return:
+            The file contents as bytes, or the path of the file if the widget has a path.
+        """
+        pa = _import_pyarrow()
+
+        table_df = self.make_table_data_frame(data_frame, dimensions, references)
+        table = pa.Table.from_pandas(table_df, preserve_index=False)
+
+        if self.path is not None:
+            self._write_table(pa, table, self.path)
+            return self.path
+
+        sink = pa.BufferOutputStream()
+        self._write_table(pa, table, sink)
+        return sink.getvalue().to_pybytes()
+
+    def _write_table(self, pa, table, where):
+        if self.file_format == PARQUET:
+            import pyarrow.parquet
+
+            pyarrow.parquet.write_table(table, where)
+            return
+
+        with pa.ipc.new_file(where, table.schema) as writer:
+            writer.write_table(table)
+
+    def make_table_data_frame(self, data_frame, dimensions, references):
+        """
+        Builds a flat data frame with a column per dimension, totals flag and metric that can be converted to an
+        arrow table.
+
+        :param data_frame:
+            The result set data frame
+        :param dimensions:
+            A list of dimensions that are being rendered.
+        :param references:
+            A list of references that are being rendered.
+        :return:
+            A data frame with a default index and string column names.
+        """
+        dimension_map = {alias_selector(dimension.alias): dimension for dimension in dimensions}
+        metric_map = self._make_metric_map(references)
+        field_map = self._make_field_map(dimension_map, metric_map)
+
+        result_df, _ = self.pivot_result_set(data_frame, dimensions, metric_map)
+
+        index_columns, totals_columns = {}, {}
+        row_index = result_df.index
+        row_totals_mask = totals_mask(row_index)
+        for i, name in enumerate(row_index.names):
+            if name is None:
+                # No dimensions, the index is just the row number
+                continue
+
+            values = row_index.get_level_values(i)
+            dimension = dimension_map.get(name)
+            label = field_map[name].label if name in field_map else name
+
+            if dimension is None:
+                # Metrics are in the rows of transposed data frames
+                index_columns[label] = values.map(lambda value: field_map[value].label if value in field_map else value)
+                continue
+
+            is_totals = row_totals_mask[:, i]
+            if isinstance(dimension, Rollup):
+                totals_columns["{} {}".format(label, TOTALS_LABEL)] = is_totals
+            values = values.where(~is_totals)
+
+            index_columns[label] = pd.Categorical(values) if dimension.data_type == DataType.text else values
+
+        metric_columns = self._build_index(result_df.columns, field_map)
+        # Columns are selected by position since pivoted column labels are tuples
+        metrics_df = pd.DataFrame({i: column.values for i, (_, column) in enumerate(result_df.items())})
+        metrics_df.columns = [
+            ", ".join(str(value) for value in column) if isinstance(column, tuple) else str(column)
+            for column in metric_columns
+        ]
+
+        index_df = pd.DataFrame({**index_columns, **totals_columns}, index=metrics_df.index)
+        return pd.concat([index_df, metrics_df], axis=1)
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise DataSetException(
+            "Optional dependency pyarrow missing. Please install fireant[arrow] to use the Arrow widget."
+        )
+
+    import pyarrow.ipc
+
+    return pyarrow
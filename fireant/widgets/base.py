@@ -59,6 +59,29 @@ class TransformableWidget(Widget):
     # should be applied to the number of series rather than the number of data points.
     group_pagination = False
 
+    @staticmethod
+    def project_data_frame(data_frame, columns=None):
+        """
+        Returns a data frame for a widget to transform from the result set data frame, which is shared between all of
+        the widgets of a query and must not be modified.
+
+        When `columns` are given, only those columns are copied. Otherwise the data frame is shallow copied: the values
+        are shared with the result set and must be treated as read-only, while the index and columns can be replaced or
+        renamed freely.
+
+        :param data_frame:
+            The result set data frame.
+        :param columns:
+            (Optional) A list of the columns that the widget uses.
+        :return:
+            A new data frame.
+        """
+        result_df = data_frame[list(columns)] if columns is not None else data_frame.copy(deep=False)
+        # Index objects are shared between the data frames otherwise, and their names are set in place
+        result_df.index = result_df.index.copy()
+        result_df.columns = result_df.columns.copy()
+        return result_df
+
     @staticmethod
     def hide_data_frame_indexes(data_frame, dimensions_to_hide):
         data_frame_indexes = (
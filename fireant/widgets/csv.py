@@ -1,7 +1,11 @@
 from _csv import QUOTE_MINIMAL
 from typing import Iterable
 
+import pandas as pd
+
+from fireant import formats
 from fireant.dataset.fields import Field
+from fireant.utils import alias_selector
 from .pandas import Pandas
 
 
@@ -22,3 +26,60 @@ class CSV(Pandas):
         # Unset the column level names because they're a bit confusing in a csv file
         result_df.columns.names = [None] * len(result_df.columns.names)
         return result_df.to_csv(na_rep="", quoting=QUOTE_MINIMAL)
+
+    @property
+    def is_streamable(self):
+        """
+        Whether the widget can be written one chunk of the result set at a time with `write_chunks`. Pivoting,
+        transposing and sorting all require the whole result set.
+        """
+        return not (self.pivot or self.transpose or self.sort)
+
+    def write_chunks(self, data_frames, dimensions, file):
+        """
+        Writes result set chunks to a file object in CSV format, one chunk at a time. This produces the same output as
+        `transform` for streamable widgets, but only one chunk is held in memory at a time and it is formatted in
+        place instead of being copied through the pivot and formatting stages.
+
+        :param data_frames:
+            An iterable of data frames containing consecutive rows of the result set. Unlike with `transform`, the
+            dimensions are columns and not the index of the data frames.
+        :param dimensions:
+            A list of dimensions that are being rendered.
+        :param file:
+            A writable text file object.
+        """
+        hide_aliases = {dimension.alias for dimension in self.hide} | {
+            dimension.alias for dimension in dimensions if dimension.fetch_only
+        }
+        index_keys = [
+            alias_selector(dimension.alias) for dimension in dimensions if dimension.alias not in hide_aliases
+        ]
+
+        dimension_map = {alias_selector(dimension.alias): dimension for dimension in dimensions}
+        metric_map = self._make_metric_map([])
+        field_map = self._make_field_map(dimension_map, metric_map)
+
+        # Compile the formatters once and reuse them for every chunk
+        column_formatters = {
+            key: formats.display_value_formatter(item, nan_value="", null_value="", use_raw_value=True)
+            for key, item in metric_map.items()
+        }
+
+        n_rows_written = 0
+        for i, chunk in enumerate(data_frames):
+            result_df = pd.DataFrame(
+                {key: format_column(chunk[key]) for key, format_column in column_formatters.items()},
+                columns=list(column_formatters),
+            ).fillna(value=formats.BLANK_VALUE)
+
+            if len(index_keys) > 1:
+                result_df.index = pd.MultiIndex.from_frame(chunk[index_keys])
+            elif index_keys:
+                result_df.index = pd.Index(chunk[index_keys[0]], name=index_keys[0])
+            else:
+                result_df.index = pd.RangeIndex(n_rows_written, n_rows_written + len(chunk))
+
+            result_df = self.transform_df_schema(result_df, field_map)
+            result_df.to_csv(file, header=i == 0, na_rep="", quoting=QUOTE_MINIMAL)
+            n_rows_written += len(chunk)
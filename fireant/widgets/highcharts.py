@@ -1,4 +1,6 @@
 import itertools
+from collections import defaultdict
+
 import pandas as pd
 
 from datetime import timedelta
@@ -71,13 +73,21 @@ class HighCharts(ChartWidget, TransformableWidget):
         x_axis_visible=True,
         tooltip_visible=True,
         split_dimension=None,
+        compact=False,
     ):
+        """
+        :param compact:
+            When True, series points are rendered as arrays (`[x, y]` for category series and `[name, y]` with
+            `keys` for pie series) instead of objects, and values are rounded to the precision of their metric. This
+            greatly reduces the size of the payload. HighCharts supports both formats.
+        """
         super(HighCharts, self).__init__()
         self.title = title
         self.colors = colors or DEFAULT_COLORS
         self.x_axis_visible = x_axis_visible
         self.tooltip_visible = tooltip_visible
         self.split_dimension = split_dimension or None
+        self.compact = compact
 
     def __repr__(self):
         return ".".join(["HighCharts()"] + [repr(axis) for axis in self.items])
@@ -101,33 +111,24 @@ class HighCharts(ChartWidget, TransformableWidget):
         :return:
             A dict or a list of dicts meant to be dumped as JSON.
         """
-        result_df = data_frame.copy()
+        result_df = self.project_data_frame(data_frame)
 
         hide_dimensions = {dimension for dimension in dimensions if dimension.fetch_only}
         self.hide_data_frame_indexes(result_df, hide_dimensions)
 
         dimension_map = {alias_selector(dimension.alias): dimension for dimension in dimensions}
 
-        render_group = []
-        split_dimension = self.split_dimension
-
-        if split_dimension and split_dimension.data_type != DataType.date:
-            split_dimension_alias = alias_selector(split_dimension.alias)
+        is_timeseries = dimensions and dimensions[0].data_type == DataType.date
 
-            # Categories method cannot be reused here, given the totals label wouldn't be correctly
-            # mapped to the totals value in the split dimension column.
-            values, _ = self._values_and_dimension(result_df, dimension_map, split_dimension_alias)
+        # Timestamp.max is used as a marker for rolled up dimensions (totals). Filter out the totals value for the
+        # dimension used for the x-axis. This is done once up front so that split charts do not need to repeat it.
+        if is_timeseries and len(result_df) > 0:
+            result_df = self._remove_date_totals(result_df)
 
-            for value in values:
-                render_group.append(
-                    [
-                        result_df.xs(value, level=split_dimension_alias, drop_level=False),
-                        formats.display_value(value, split_dimension) or value,
-                    ]
-                )
+        render_group = self._split_data_frame(result_df)
 
         if not render_group:
-            render_group = [(result_df, None)]
+            render_group = [(result_df, None, self._group_by_series(result_df))]
 
         num_charts = len(render_group)
 
@@ -139,12 +140,59 @@ class HighCharts(ChartWidget, TransformableWidget):
                 annotation_frame=annotation_frame,
                 titleSuffix=titleSuffix,
                 num_charts=num_charts,
+                series_data_frames=series_data_frames,
+                dimension_map=dimension_map,
             )
-            for chart_df, titleSuffix in render_group
+            for chart_df, titleSuffix, series_data_frames in render_group
         ]
 
         return charts[0] if num_charts == 1 else charts
 
+    def _split_data_frame(self, data_frame):
+        """
+        Partitions the data frame into one data frame per value of the split dimension. The partitioning is done with a
+        single group by over the data frame. The series groups are also computed once over the whole data frame and
+        then distributed to the chart they belong to.
+
+        :param data_frame:
+            The data frame containing the data.
+        :return:
+            A list of tuples containing the data frame, the title suffix and the series groups for each chart. The list
+            is empty if the chart is not split.
+        """
+        split_dimension = self.split_dimension
+
+        if not split_dimension or split_dimension.data_type == DataType.date:
+            return []
+
+        split_dimension_alias = alias_selector(split_dimension.alias)
+        index_names = list(data_frame.index.names)
+        if split_dimension_alias not in index_names:
+            return []
+
+        # The series are grouped by all index levels after the 0th. If the split dimension is one of them, each series
+        # group belongs to exactly one chart so the groups can be shared instead of re-grouping every chart.
+        series_level_names = index_names[1:] if isinstance(data_frame.index, pd.MultiIndex) else []
+        series_by_split_value = None
+        if split_dimension_alias in series_level_names:
+            split_level_position = series_level_names.index(split_dimension_alias)
+            series_by_split_value = defaultdict(list)
+
+            for dimension_values, group_df in self._group_by_series(data_frame):
+                split_value = utils.wrap_list(dimension_values)[split_level_position]
+                series_by_split_value[split_value].append((dimension_values, group_df))
+
+        render_group = []
+        for value, chart_df in data_frame.groupby(level=split_dimension_alias, sort=True):
+            series_data_frames = (
+                series_by_split_value[value]
+                if series_by_split_value is not None
+                else list(self._group_by_series(chart_df))
+            )
+            render_group.append((chart_df, formats.display_value(value, split_dimension) or value, series_data_frames))
+
+        return render_group
+
     def _render_individual_chart(
         self,
         data_frame,
@@ -153,24 +201,28 @@ class HighCharts(ChartWidget, TransformableWidget):
         annotation_frame=None,
         titleSuffix="",
         num_charts=1,
+        series_data_frames=None,
+        dimension_map=None,
     ):
         result_df = data_frame
 
-        dimension_map = {alias_selector(dimension.alias): dimension for dimension in dimensions}
+        if dimension_map is None:
+            dimension_map = {alias_selector(dimension.alias): dimension for dimension in dimensions}
 
         colors = itertools.cycle(self.colors)
 
         is_timeseries = dimensions and dimensions[0].data_type == DataType.date
 
-        # Timestamp.max is used as a marker for rolled up dimensions (totals). Filter out the totals value for the
-        # dimension used for the x-axis
-        if is_timeseries and len(data_frame) > 0:
-            result_df = self._remove_date_totals(result_df)
+        if series_data_frames is None:
+            # Timestamp.max is used as a marker for rolled up dimensions (totals). Filter out the totals value for the
+            # dimension used for the x-axis
+            if is_timeseries and len(data_frame) > 0:
+                result_df = self._remove_date_totals(result_df)
 
-        # Group the results by index levels after the 0th, one for each series
-        # This will result in a series for every combination of dimension values and each series will contain a data set
-        # across the 0th dimension (used for the x-axis)
-        series_data_frames = self._group_by_series(result_df)
+            # Group the results by index levels after the 0th, one for each series
+            # This will result in a series for every combination of dimension values and each series will contain a
+            # data set across the 0th dimension (used for the x-axis)
+            series_data_frames = self._group_by_series(result_df)
 
         total_num_series = sum([len(axis) for axis in self.items])
 
@@ -420,9 +472,9 @@ class HighCharts(ChartWidget, TransformableWidget):
                 "type": series.type,
                 "name": "{} ({})".format(metric_label, dimension_label) if dimension_label else metric_label,
                 "data": (
-                    self._render_timeseries_data(series_df, field_alias, series.metric)
+                    self._render_timeseries_data(series_df, field_alias, series.metric, self.compact)
                     if is_timeseries
-                    else self._render_category_data(series_df, field_alias, series.metric)
+                    else self._render_category_data(series_df, field_alias, series.metric, self.compact)
                 ),
                 "tooltip": self._render_tooltip(series.metric, reference),
                 "yAxis": (
@@ -448,7 +500,23 @@ class HighCharts(ChartWidget, TransformableWidget):
         return results
 
     @staticmethod
-    def _render_category_data(group_df, field_alias, metric):
+    def _render_point_value(value, metric, compact=False):
+        """
+        Converts a metric value into the value of a chart point. In compact mode, floats are rounded to the precision
+        of the metric so that no superfluous digits are sent.
+        """
+        value = formats.raw_value(value, metric)
+
+        if not compact or metric.precision is None or not isinstance(value, float):
+            return value
+
+        if metric.precision == 0:
+            return int(round(value))
+
+        return round(value, metric.precision)
+
+    @staticmethod
+    def _render_category_data(group_df, field_alias, metric, compact=False):
         categories = (
             list(group_df.index.levels[0]) if isinstance(group_df.index, pd.MultiIndex) else list(group_df.index)
         )
@@ -460,12 +528,14 @@ class HighCharts(ChartWidget, TransformableWidget):
                 # ignore nans in index
                 continue
 
-            series.append({"x": categories.index(label), "y": formats.raw_value(y, metric)})
+            x = categories.index(label)
+            y = HighCharts._render_point_value(y, metric, compact)
+            series.append([x, y] if compact else {"x": x, "y": y})
 
         return series
 
     @staticmethod
-    def _render_timeseries_data(group_df, metric_alias, metric):
+    def _render_timeseries_data(group_df, metric_alias, metric, compact=False):
         series = []
         for dimension_values, y in group_df[metric_alias].iteritems():
             first_dimension_value = utils.wrap_list(dimension_values)[0]
@@ -481,7 +551,7 @@ class HighCharts(ChartWidget, TransformableWidget):
             series.append(
                 (
                     formats.date_as_millis(first_dimension_value),
-                    formats.raw_value(y, metric),
+                    HighCharts._render_point_value(y, metric, compact),
                 )
             )
         return series
@@ -505,9 +575,11 @@ class HighCharts(ChartWidget, TransformableWidget):
             dimension_values = utils.wrap_list(dimension_values)
             name = self._format_dimension_values(dimension_fields, dimension_values)
 
-            data.append({"name": name or metric.label, "y": formats.raw_value(y, metric)})
+            name = name or metric.label
+            y = self._render_point_value(y, metric, self.compact)
+            data.append([name, y] if self.compact else {"name": name, "y": y})
 
-        return {
+        pie_series = {
             "name": reference_label(metric, reference),
             "type": "pie",
             "data": data,
@@ -520,6 +592,11 @@ class HighCharts(ChartWidget, TransformableWidget):
             },
         }
 
+        if self.compact:
+            pie_series["keys"] = ["name", "y"]
+
+        return pie_series
+
     def _render_annotation(self, annotation_df, x_axis):
         """
         Group data in the annotation data frame and calculate their positions on the x-axis of the main chart.
@@ -535,7 +612,8 @@ class HighCharts(ChartWidget, TransformableWidget):
             return []
 
         annotation_alias = annotation_df.columns[0]
-        annotation_df[annotation_alias] = annotation_df[annotation_alias].astype(str)
+        # The annotation frame is shared with the other widgets, so it is converted into a new frame
+        annotation_df = annotation_df.astype({annotation_alias: str})
 
         # Group the annotation frame by concatenating the strings in the annotation column for each index value
         grouped_annotation_df = self._group_annotation_df(annotation_df, annotation_alias).to_frame()
@@ -562,12 +640,8 @@ class HighCharts(ChartWidget, TransformableWidget):
 
     @staticmethod
     def _group_annotation_df(annotation_df, annotation_field_name):
-        def concatenate_row_values(df):
-            df.fillna("None", inplace=True)
-            return ", ".join(df)
-
-        return annotation_df.groupby(annotation_df.index.names)[annotation_field_name].apply(
-            lambda x: concatenate_row_values(x)
+        return (
+            annotation_df[annotation_field_name].fillna("None").groupby(level=annotation_df.index.names).agg(", ".join)
         )
 
     @staticmethod
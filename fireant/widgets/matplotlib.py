@@ -29,7 +29,7 @@ class Matplotlib(ChartWidget, TransformableWidget):
     def transform(self, data_frame, dimensions, references, annotation_frame=None):
         import matplotlib.pyplot as plt
 
-        result_df = data_frame.copy()
+        result_df = self.project_data_frame(data_frame)
 
         hide_dimensions = {dimension for dimension in dimensions if dimension.fetch_only}
         self.hide_data_frame_indexes(result_df, hide_dimensions)
@@ -1,5 +1,4 @@
 from collections import OrderedDict
-from functools import partial
 from typing import Iterable, Union
 
 import pandas as pd
@@ -8,7 +7,7 @@ from fireant import formats
 from fireant.dataset.fields import DataType, Field
 from fireant.utils import alias_selector, wrap_list
 from .base import ReferenceItem, TransformableWidget
-from fireant.dataset.totals import DATE_TOTALS, NUMBER_TOTALS, TEXT_TOTALS
+from fireant.dataset.totals import DATE_TOTALS, NUMBER_TOTALS, TEXT_TOTALS, is_totals
 from fireant.formats import TOTALS_LABEL, TOTALS_VALUE
 from fireant.reference_helpers import reference_alias
 
@@ -63,11 +62,20 @@ class Pandas(TransformableWidget):
         :param use_raw_values:
             Don't add prefix or postfix to values.
         """
-        result_df = data_frame.copy()
-
         dimension_map = {alias_selector(dimension.alias): dimension for dimension in dimensions}
-        dimension_aliases = dimension_map.keys()
-        metric_map = OrderedDict(
+        metric_map = self._make_metric_map(references)
+        field_map = self._make_field_map(dimension_map, metric_map)
+
+        result_df, dropped_columns = self.pivot_result_set(data_frame, dimensions, metric_map)
+        result_df = self.add_formatting(dimensions, list(metric_map.values()), result_df, use_raw_values).fillna(
+            value=formats.BLANK_VALUE
+        )
+        result_df = self.transform_df_schema(result_df, field_map)
+        result_df.attrs["dropped_columns"] = dropped_columns
+        return result_df
+
+    def _make_metric_map(self, references) -> OrderedDict:
+        return OrderedDict(
             [
                 (
                     alias_selector(reference_alias(item, ref)),
@@ -77,26 +85,27 @@ class Pandas(TransformableWidget):
                 for ref in [None] + references
             ]
         )
-        metric_aliases = metric_map.keys()
 
-        field_map = {
-            **metric_map,
-            **dimension_map,
-            # Add an extra item to map the totals markers to it's label
-            NUMBER_TOTALS: TotalsItem,
-            TEXT_TOTALS: TotalsItem,
-            DATE_TOTALS: TotalsItem,
-            TOTALS_LABEL: TotalsItem,
-            alias_selector(METRICS_DIMENSION_ALIAS): Field(
-                METRICS_DIMENSION_ALIAS, None, data_type=DataType.text, label=""
-            ),
-        }
+    def pivot_result_set(self, data_frame, dimensions, metric_map):
+        """
+        Selects the metric columns of the widget from the result set, hides dimensions and pivots/transposes the data
+        frame. Values are not formatted.
 
+        :param data_frame:
+            The result set data frame
+        :param dimensions:
+            A list of dimensions that are being rendered.
+        :param metric_map:
+            An ordered dict of metric (and reference metric) aliases to metric items to select.
+        :return:
+            Tuple(The pivoted data frame, the number of columns that were dropped to respect `max_columns`)
+        """
+        result_df = self.project_data_frame(data_frame, metric_map.keys())
+
+        dimension_aliases = [alias_selector(dimension.alias) for dimension in dimensions]
         if isinstance(result_df.index, pd.MultiIndex):
             result_df = result_df.reorder_levels(dimension_aliases)
 
-        result_df = result_df[metric_aliases]
-
         hide_dimensions = set(self.hide) | {dimension for dimension in dimensions if dimension.fetch_only}
         self.hide_data_frame_indexes(result_df, hide_dimensions)
         hide_aliases = {dimension.alias for dimension in hide_dimensions}
@@ -111,11 +120,24 @@ class Pandas(TransformableWidget):
         pivot_dimensions = [
             alias_selector(dimension.alias) for dimension in self.pivot if dimension.alias not in hide_aliases
         ]
+        result_df, dropped_columns = self.prune_pivot_values(result_df, pivot_dimensions)
         result_df, _, _ = self.pivot_data_frame(result_df, pivot_dimensions, self.transpose)
-        result_df = self.add_formatting(dimensions, list(metric_map.values()), result_df, use_raw_values).fillna(
-            value=formats.BLANK_VALUE
-        )
-        return self.transform_df_schema(result_df, field_map)
+        return result_df, dropped_columns
+
+    @staticmethod
+    def _make_field_map(dimension_map: dict, metric_map: dict) -> dict:
+        return {
+            **metric_map,
+            **dimension_map,
+            # Add an extra item to map the totals markers to it's label
+            NUMBER_TOTALS: TotalsItem,
+            TEXT_TOTALS: TotalsItem,
+            DATE_TOTALS: TotalsItem,
+            TOTALS_LABEL: TotalsItem,
+            alias_selector(METRICS_DIMENSION_ALIAS): Field(
+                METRICS_DIMENSION_ALIAS, None, data_type=DataType.text, label=""
+            ),
+        }
 
     def transform_df_schema(self, data_frame: pd.DataFrame, field_map: dict) -> pd.DataFrame:
         data_frame.index.names = self._transform_index_values(data_frame.index.names, field_map)
@@ -126,13 +148,21 @@ class Pandas(TransformableWidget):
 
     @staticmethod
     def _build_index(idx: Union[pd.Index, pd.MultiIndex], field_map: dict) -> Union[pd.Index, pd.MultiIndex]:
-        if isinstance(idx, pd.MultiIndex):
-            return pd.MultiIndex.from_tuples(
-                [Pandas._transform_index_values(level, field_map) for level in idx.tolist()], names=idx.names
-            )
+        def relabel(item):
+            return field_map[item].label if item in field_map else item
+
+        if not isinstance(idx, pd.MultiIndex):
+            return idx.map(relabel).rename(idx.name)
 
-        new_idx = Pandas._transform_index_values(idx.tolist(), field_map)
-        return pd.Index(new_idx, name=idx.name)
+        # Relabel the unique values of each level instead of every row of the index
+        levels = [level.map(relabel) for level in idx.levels]
+        if all(level.is_unique for level in levels):
+            return idx.set_levels(levels)
+
+        # Relabeling merged some values of a level (ie. a totals marker and the totals label), which levels can't hold
+        return pd.MultiIndex.from_arrays(
+            [idx.get_level_values(i).map(relabel) for i in range(idx.nlevels)], names=idx.names
+        )
 
     @staticmethod
     def _transform_index_values(idx: list, field_map: dict) -> list:
@@ -149,6 +179,43 @@ class Pandas(TransformableWidget):
 
         return True
 
+    def prune_pivot_values(self, data_frame, pivot_dimensions):
+        """
+        Limits the number of distinct values of the pivoted dimensions to `max_columns` before the data frame is
+        pivoted, so that a high cardinality pivot dimension does not create an unbounded number of columns. Values are
+        kept in order of first appearance, which follows the orders of the query since the data frame is sorted before
+        it is passed to widgets. Totals are always kept.
+
+        :param data_frame:
+            The result set data frame
+        :param pivot_dimensions:
+            A list of index aliases for `data_frame` of levels to shift
+        :return:
+            Tuple(The pruned data frame, the number of columns that were dropped)
+        """
+        if not pivot_dimensions or data_frame.empty:
+            return data_frame, 0
+
+        index = data_frame.index
+        if isinstance(index, pd.MultiIndex):
+            other_levels = [name for name in index.names if name not in pivot_dimensions]
+            pivot_index = index.droplevel(other_levels) if other_levels else index
+        else:
+            pivot_index = index
+
+        is_totals_row = is_totals(pivot_index)
+
+        pivot_values = pivot_index[~is_totals_row]
+        unique_pivot_values = pivot_values.unique()
+        if len(unique_pivot_values) <= self.max_columns:
+            return data_frame, 0
+
+        kept_values = unique_pivot_values[: self.max_columns]
+        is_kept = is_totals_row | pivot_index.isin(kept_values)
+        n_dropped_values = len(unique_pivot_values) - len(kept_values)
+
+        return data_frame[is_kept], n_dropped_values * len(data_frame.columns)
+
     def pivot_data_frame(self, data_frame, pivot_dimensions, transpose):
         """
         Pivot and transpose the data frame. Dimensions including in the `pivot` arg will be unshifted to columns. If
@@ -196,10 +263,17 @@ class Pandas(TransformableWidget):
             # If there are no sort arguments or the data frame is a single row, then no need to sort
             return data_frame
 
-        # reset the index so all columns can be sorted together
         index_names = data_frame.index.names
-        unsorted = data_frame.reset_index()
-        column_names = list(unsorted.columns)
+        sort_by_index_names = self._can_sort_by_index_names(data_frame)
+
+        if sort_by_index_names:
+            # Index levels can be referred to by name, so the data frame is sorted without rebuilding its index
+            unsorted = data_frame
+            column_names = list(index_names) + list(data_frame.columns)
+        else:
+            # reset the index so all columns can be sorted together
+            unsorted = data_frame.reset_index()
+            column_names = list(unsorted.columns)
 
         ascending = self.ascending if self.ascending is not None else True
 
@@ -214,7 +288,9 @@ class Pandas(TransformableWidget):
         if isinstance(ascending, list) and len(ascending) != len(sort_columns):
             ascending = ascending[0] if len(ascending) > 0 else None
 
-        sorted = unsorted.sort_values(sort_columns, ascending=ascending).set_index(index_names)
+        sorted = unsorted.sort_values(sort_columns, ascending=ascending)
+        if not sort_by_index_names:
+            sorted = sorted.set_index(index_names)
 
         # Maintain the single metric name
         if hasattr(data_frame, "name"):
@@ -222,38 +298,44 @@ class Pandas(TransformableWidget):
 
         return sorted
 
+    @staticmethod
+    def _can_sort_by_index_names(data_frame):
+        index_names = data_frame.index.names
+        if isinstance(data_frame.columns, pd.MultiIndex) or len(set(index_names)) != len(index_names):
+            return False
+
+        return all(name is not None and name not in data_frame.columns for name in index_names)
+
     def add_formatting(self, dimensions, items, pivot_df, use_raw_values):
         format_df = pivot_df.copy()
 
         def _get_field_display(item):
-            return partial(
-                formats.display_value,
-                field=item,
+            return formats.display_value_formatter(
+                item,
                 nan_value="",
                 null_value="",
                 use_raw_value=use_raw_values,
             )
 
+        def _apply(values, field_display):
+            # Formatters are compiled per column, so data frames are formatted column by column
+            return field_display(values) if isinstance(values, pd.Series) else values.apply(field_display)
+
         if self.transpose or not self.transpose and len(dimensions) == len(self.pivot) > 0:
             for item in items:
                 field_display = _get_field_display(item)
                 alias = alias_selector(items[0].alias)
-                format_df.loc[alias] = format_df.loc[alias].apply(field_display)
+                format_df.loc[alias] = _apply(format_df.loc[alias], field_display)
 
             return format_df
 
         if self.pivot and len(items) == 1:
             field_display = _get_field_display(items[0])
-            format_df = format_df.applymap(field_display)
-            return format_df
+            return format_df.apply(field_display)
 
         for item in items:
             key = alias_selector(item.alias)
             field_display = _get_field_display(item)
-            format_df[key] = (
-                format_df[key].apply(field_display)
-                if isinstance(format_df[key], pd.Series)
-                else format_df[key].applymap(field_display)
-            )
+            format_df[key] = _apply(format_df[key], field_display)
 
         return format_df
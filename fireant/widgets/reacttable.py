@@ -331,8 +331,8 @@ class ReactTable(Pandas):
         :param dimensions:
         :return:
         """
-        data_frame = data_frame.copy()
-        data_frame.columns.name = F_METRICS_DIMENSION_ALIAS
+        data_frame = data_frame.copy(deep=False)
+        data_frame.columns = data_frame.columns.rename(F_METRICS_DIMENSION_ALIAS)
         return data_frame
 
     @staticmethod
@@ -675,8 +675,6 @@ class ReactTable(Pandas):
             An dict containing attributes `columns` and `data` which align with the props in ReactTable with the same
             names.
         """
-        result_df = data_frame.copy()
-
         dimension_map = {alias_selector(dimension.alias): dimension for dimension in dimensions}
 
         metric_map = OrderedDict(
@@ -716,7 +714,8 @@ class ReactTable(Pandas):
             if alias_selector(dimension.alias) not in hide_aliases
         ]
 
-        result_df = self.format_data_frame(result_df[metric_aliases])
+        result_df = self.format_data_frame(self.project_data_frame(data_frame, metric_aliases))
+        result_df, dropped_columns = self.prune_pivot_values(result_df, pivot_dimensions)
         result_df, is_pivoted, is_transposed = self.pivot_data_frame(result_df, pivot_dimensions, self.transpose)
         dimension_columns = self.transform_index_column_headers(result_df, field_map, hide_aliases)
         metric_columns = self.transform_data_column_headers(result_df, field_map)
@@ -730,4 +729,9 @@ class ReactTable(Pandas):
             is_pivoted=is_pivoted,
         )
 
-        return {"columns": dimension_columns + metric_columns, "data": data}
+        result = {"columns": dimension_columns + metric_columns, "data": data}
+
+        if dropped_columns:
+            result["dropped_columns"] = dropped_columns
+
+        return result